@@ -5,15 +5,1653 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib import animation
+from matplotlib.axes import Axes
+from matplotlib.collections import Collection, LineCollection, PolyCollection
+from matplotlib.colors import to_rgb, to_rgba_array
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch, Rectangle
+from matplotlib.text import Text
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, IdentityTransform
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
 import sympy as sp
-from scipy import integrate
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
+from scipy import integrate, optimize
+from scipy.spatial import cKDTree
 import colorsys
 import random
 from datetime import datetime
 import json
 import os
+import time
+import hashlib
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import argparse
+import ast
+import io
+import multiprocessing
+import select
+import socket
+import struct
+import sys
+
+
+def broadcast_result(values, shape):
+    """Coerce a lambdified result (possibly a scalar) to a float array of the given shape"""
+    values = np.asarray(values, dtype=float)
+    if values.shape != tuple(shape):
+        values = np.broadcast_to(values, shape).copy()
+    return values
+
+
+def chunked_evaluate(func, args, shape, executor=None, target=1 << 16, outputs=None, dtype=float):
+    """Evaluate func(*args) into a preallocated float array, chunk by chunk along the first axis
+    
+    args must broadcast to shape. Those spanning the first axis are sliced per
+    chunk; the rest (scalars, or the x row of an open grid) are passed whole.
+    Chunks hold about target elements so temporaries stay cache-sized, and run
+    on executor when one is given, since NumPy ufuncs release the GIL. A fused
+    func returning several arrays gives outputs, and the result gets a leading
+    axis of that length.
+    """
+    out = np.empty(tuple(shape) if outputs is None else (outputs,) + tuple(shape), dtype=dtype)
+    if out.size == 0:
+        return out
+    size = int(np.prod(shape))
+    rows = max(target // max(size // shape[0], 1), 1)
+    starts = range(0, shape[0], rows)
+    
+    def run(start):
+        part = slice(start, start + rows)
+        values = func(*[a[part] if np.ndim(a) and np.shape(a)[0] == shape[0] else a
+                        for a in args])
+        if outputs is None:
+            out[part] = values
+        else:
+            for target_rows, value in zip(out, values):
+                target_rows[part] = value
+                
+                
+    if executor is None or len(starts) < 2:
+        for start in starts:
+            run(start)
+    else:
+        for future in [executor.submit(run, start) for start in starts]:
+            future.result()
+    return out
+    
+
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+
+def precision_hot_rows(values, axis, count, floor):
+    """Rows around the largest relative second differences, where reduced precision turns into noise
+    
+    Cancellation is usually confined to a narrow band (e.g. 1 - cos(x) near
+    0) that evenly spaced probes step over, but the rounding noise it leaves
+    makes the samples there jump. Returns each of the count roughest rows
+    with its neighbours; non-finite values count as roughest.
+    """
+    n = values.shape[axis]
+    if n < 3 or count < 1:
+        return np.empty(0, dtype=int)
+    with np.errstate(all='ignore'):
+        middle = np.abs(np.take(values, np.arange(1, n - 1), axis=axis))
+        scale = np.max(middle, where=np.isfinite(middle), initial=0.0)
+        rough = np.abs(np.diff(values, 2, axis=axis)) / np.maximum(middle, floor * scale + np.finfo(values.dtype).tiny)
+        other = tuple(a for a in range(values.ndim) if a != axis)
+        score = np.nan_to_num(np.max(rough, axis=other) if other else rough, nan=np.inf)
+    count = min(count, len(score))
+    centers = np.argpartition(score, -count)[-count:] + 1
+    return np.clip((centers[:, None] + np.arange(-1, 2)).ravel(), 0, n - 1)
+    
+
+def precision_evaluate(func, args, shape, dtype, executor=None, outputs=None, probes=65, tolerance=1e-3, floor=0.1):
+    """Evaluate like chunked_evaluate in the given float dtype, falling back to float64 when it is not enough
+    
+    args are the exact float64 sample grids. In reduced precision they are
+    rounded and evaluated in that dtype, then probes evenly spaced rows plus
+    the neighbourhoods of the roughest rows (see precision_hot_rows) are
+    re-evaluated in float64. If any probed sample is off by more than
+    tolerance relative to its reference value (catastrophic cancellation, a
+    grid too fine for the dtype) or overflows where float64 did not,
+    everything is redone in float64. Values under floor times the largest
+    reference are held to that level instead, so zero crossings do not
+    count as relative error. Returns (values, fell_back).
+    """
+    if np.dtype(dtype) == np.float64:
+        return chunked_evaluate(func, args, shape, executor, outputs=outputs), False
+        
+    spans = [bool(np.ndim(a)) and np.shape(a)[0] == shape[0] for a in args]
+    rounded = [np.asarray(a, dtype=dtype) if np.ndim(a) else a for a in args]
+    values = chunked_evaluate(func, rounded, shape, executor, outputs=outputs, dtype=dtype)
+    
+    rows = np.unique(np.concatenate([
+        np.linspace(0, shape[0] - 1, min(shape[0], probes)).astype(int),
+        precision_hot_rows(values, 0 if outputs is None else 1, probes // 4, floor),
+    ]))
+    reference = chunked_evaluate(func, [a[rows] if span else a for a, span in zip(args, spans)],
+                                 (len(rows),) + tuple(shape[1:]), outputs=outputs)
+    probed = values[:, rows] if outputs is not None else values[rows]
+    finite = np.isfinite(reference)
+    with np.errstate(all='ignore'):
+        scale = np.max(np.abs(reference[finite]), initial=0.0)
+        allowed = tolerance * np.maximum(np.abs(reference[finite]), max(floor * scale, np.finfo(dtype).tiny))
+        error = np.abs(probed[finite] - reference[finite])
+    if np.all(error <= allowed):
+        return values, False
+    return chunked_evaluate(func, args, shape, executor, outputs=outputs), True
+    
+
+COORDINATE_SYSTEMS = {
+    "Polar": ['theta'],
+    "Cylindrical": ['theta', 'z'],
+    "Spherical": ['theta', 'phi'],
+}
+
+
+def coordinate_transform(system, r, theta, other=None):
+    """Map radii sampled over theta (and z or phi) to Cartesian coordinates in one vectorized step
+    
+    theta and other may be open grids (a column and a row); only r has the
+    full shape, so each trig factor is computed once per grid line. The
+    grids are cast to r's dtype so float32 radii stay float32.
+    """
+    theta = np.asarray(theta, dtype=r.dtype)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    if system == "Polar":
+        return r * cos_t, r * sin_t
+    other = np.asarray(other, dtype=r.dtype)
+    if system == "Cylindrical":
+        return r * cos_t, r * sin_t, np.broadcast_to(other, r.shape)
+    sin_p = np.sin(other)
+    return r * sin_p * cos_t, r * sin_p * sin_t, r * np.cos(other)
+    
+
+def compile_fused(exprs, symbols):
+    """Lambdify several expressions into one callable that shares their common subexpressions
+    
+    Returns (func, stats): func(*args) returns one value per expression, and
+    stats counts the operations before and after common-subexpression
+    elimination and the number of shared terms.
+    """
+    exprs = [sp.sympify(expr) for expr in exprs]
+    replacements, reduced = sp.cse(exprs)
+    stats = {
+        "outputs": len(exprs),
+        "before": sum(sp.count_ops(expr) for expr in exprs),
+        "after": sum(sp.count_ops(value) for _, value in replacements) + sum(sp.count_ops(expr) for expr in reduced),
+        "shared": len(replacements),
+    }
+    func = sp.lambdify(symbols, exprs, modules=['numpy'], cse=lambda _: (replacements, reduced))
+    return func, stats
+    
+
+def fused_report(stats):
+    """Describe what common-subexpression elimination saved in a fused compile"""
+    saved = stats["before"] - stats["after"]
+    text = f"Fused compile: {stats['outputs']} outputs, {stats['shared']} shared terms\n"
+    text += f"Operations: {stats['before']} → {stats['after']} ({saved} saved)\n"
+    return text
+    
+
+def expression_hash(equation):
+    """Hash the canonical SymPy form of an equation so cached samples can be validated"""
+    return hashlib.sha256(sp.srepr(sp.sympify(equation)).encode('utf-8')).hexdigest()[:16]
+
+
+def expression_syntax_ok(text):
+    """Cheap check that text parses as a single expression before handing it to SymPy"""
+    if not text.strip():
+        return False
+    try:
+        compile(text.replace('^', '**'), '<equation>', 'eval')
+    except (SyntaxError, ValueError):
+        return False
+    return True
+    
+
+def sign_change_brackets(Y):
+    """Return (row, column) pairs where each row of Y changes sign between samples"""
+    Y = np.atleast_2d(Y)
+    finite = np.isfinite(Y)
+    signs = np.sign(Y)
+    mask = (signs[:, :-1] * signs[:, 1:] < 0) & finite[:, :-1] & finite[:, 1:]
+    return np.nonzero(mask)
+
+
+def central_difference(func, order):
+    """Wrap a vectorized function as its first or second central-difference derivative"""
+    if order == 1:
+        def derivative(x):
+            h = 6e-6 * (1 + np.abs(x))
+            return (func(x + h) - func(x - h)) / (2 * h)
+    else:
+        def derivative(x):
+            h = 1e-4 * (1 + np.abs(x))
+            return (func(x + h) - 2 * func(x) + func(x - h)) / (h * h)
+    return derivative
+
+
+def evaluate_grouped(funcs, idx, xs):
+    """Evaluate funcs[idx[i]](xs[i]) for every i, one vectorized call per function"""
+    out = np.empty(len(xs), dtype=float)
+    if len(xs) == 0:
+        return out
+    order = np.argsort(idx, kind='stable')
+    keys, starts = np.unique(np.asarray(idx)[order], return_index=True)
+    stops = np.append(starts[1:], len(order))
+    for key, lo, hi in zip(keys, starts, stops):
+        sel = order[lo:hi]
+        with np.errstate(all='ignore'):
+            out[sel] = broadcast_result(funcs[key](xs[sel]), (hi - lo,))
+    return out
+
+
+def polish_brackets(funcs, left, right, a, b, xtol=1e-12, maxiter=60):
+    """Refine brackets of funcs[left] - funcs[right] to roots in one vectorized batch
+    
+    A negative entry in right means the bracket is for funcs[left] alone.
+    All brackets advance together with the Illinois variant of regula falsi;
+    the few that have not converged afterwards are finished with brentq.
+    Returns (bracket_index, root) for brackets whose residual is genuinely
+    small, so sign changes caused by poles are discarded.
+    """
+    left = np.asarray(left, dtype=int)
+    right = np.asarray(right, dtype=int)
+    a = np.asarray(a, dtype=float).copy()
+    b = np.asarray(b, dtype=float).copy()
+    
+    def g(sel, xs):
+        values = evaluate_grouped(funcs, left[sel], xs)
+        has_right = right[sel] >= 0
+        if has_right.any():
+            values[has_right] -= evaluate_grouped(funcs, right[sel][has_right], xs[has_right])
+        return values
+        
+    everything = np.arange(len(a))
+    fa = g(everything, a)
+    fb = g(everything, b)
+    valid = np.isfinite(fa) & np.isfinite(fb) & (np.sign(fa) * np.sign(fb) < 0)
+    scale = np.maximum(1.0, np.maximum(np.abs(fa), np.abs(fb)))
+    
+    roots = np.full(len(a), np.nan)
+    zero_a = np.isfinite(fa) & (fa == 0)
+    roots[zero_a] = a[zero_a]
+    active = everything[valid & ~zero_a]
+    
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        A, B, FA, FB = a[active], b[active], fa[active], fb[active]
+        with np.errstate(all='ignore'):
+            c = B - FB * (B - A) / (FB - FA)
+        outside = ~np.isfinite(c) | (c <= np.minimum(A, B)) | (c >= np.maximum(A, B))
+        c[outside] = 0.5 * (A + B)[outside]
+        fc = g(active, c)
+        
+        # Keep the root bracketed; halve the stale end (Illinois step)
+        flip = np.sign(fc) * np.sign(FB) < 0
+        a[active] = np.where(flip, B, A)
+        fa[active] = np.where(flip, FB, 0.5 * FA)
+        b[active] = c
+        fb[active] = fc
+        
+        width = np.abs(b[active] - a[active])
+        done = (fc == 0) | (width <= xtol * (1 + np.abs(c))) | ~np.isfinite(fc)
+        roots[active[done]] = c[done]
+        active = active[~done]
+        
+    # Finish any stubborn brackets one at a time
+    for i in active:
+        sel = np.array([i])
+        try:
+            roots[i] = optimize.brentq(lambda t: g(sel, np.array([t]))[0], a[i], b[i],
+                                       xtol=xtol)
+        except (ValueError, RuntimeError):
+            pass
+            
+    found = everything[np.isfinite(roots)]
+    residual = np.abs(g(found, roots[found]))
+    genuine = residual <= 1e-6 * scale[found]
+    return found[genuine], roots[found][genuine]
+
+
+def curve_spectrum(x, y):
+    """Return frequencies (cycles per unit x) and the one-sided amplitude spectrum of a sampled curve
+    
+    The mean is removed and a Hann window applied, with amplitudes rescaled
+    so a pure sinusoid of amplitude A peaks near A. Non-finite samples count
+    as zero.
+    """
+    y = np.where(np.isfinite(y), y, 0.0)
+    y = y - y.mean()
+    window = np.hanning(len(y))
+    amplitude = 2 * np.abs(np.fft.rfft(y * window)) / window.sum()
+    return np.fft.rfftfreq(len(y), d=(x[-1] - x[0]) / (len(x) - 1)), amplitude
+    
+
+def fourier_partial_sums(func, x0, x1, x, terms, samples=4096):
+    """Return every Fourier partial sum of func (periodic on [x0, x1)) at x, one row per term count
+    
+    Coefficients come from one rfft of func sampled over a period; row k of
+    the result is the sum of the first k harmonics (row 0 is the mean). All
+    rows come from a single cumulative sum over the coefficient x basis
+    matrix, so stepping through them is a lookup.
+    """
+    period = x1 - x0
+    samples = max(samples, 2 * terms + 2)
+    grid = x0 + period * np.arange(samples) / samples
+    with np.errstate(all='ignore'):
+        values = np.asarray(func(grid), dtype=float) * np.ones(samples)
+    values = np.where(np.isfinite(values), values, 0.0)
+    coeffs = np.fft.rfft(values)[:terms + 1] / samples
+    
+    phase = (2 * np.pi / period) * np.outer(np.arange(terms + 1), x - x0)
+    basis = 2 * (coeffs.real[:, np.newaxis] * np.cos(phase) - coeffs.imag[:, np.newaxis] * np.sin(phase))
+    basis[0] = coeffs[0].real
+    return np.cumsum(basis, axis=0)
+    
+
+def taylor_series_coefficients(expr, symbol, a, order):
+    """Return the Taylor coefficients of a SymPy expression about a, up to the given order
+    
+    The expression tree is evaluated in truncated power-series arithmetic
+    with the standard recurrences for products, powers, exp, log and the
+    trigonometric and hyperbolic functions, which stays O(order**2) per node
+    where repeated symbolic differentiation grows without bound. Expressions
+    using other functions fall back to sp.series.
+    """
+    n = order + 1
+    
+    def constant(value):
+        series = np.zeros(n)
+        series[0] = value
+        return series
+        
+    def mul(u, v):
+        return np.convolve(u, v)[:n]
+        
+    def integrate_derivative(w0, derivative):
+        # w' = derivative  =>  w_k = derivative_{k-1} / k
+        w = np.empty(n)
+        w[0] = w0
+        w[1:] = derivative[:n - 1] / np.arange(1, n)
+        return w
+        
+    def derivative_of(u):
+        du = np.zeros(n)
+        du[:n - 1] = u[1:] * np.arange(1, n)
+        return du
+        
+    def power(u, p):
+        if u[0] == 0:
+            if float(p).is_integer() and p >= 0:
+                w = constant(1.0)
+                for _ in range(int(p)):
+                    w = mul(w, u)
+                return w
+            raise ValueError("series of a non-integer power about a zero of its base")
+        w = np.zeros(n)
+        w[0] = u[0] ** p
+        for k in range(1, n):
+            j = np.arange(1, k + 1)
+            w[k] = np.dot((p * j - (k - j)) * u[1:k + 1], w[k - 1::-1][:k]) / (k * u[0])
+        return w
+        
+    def exp(u):
+        w = np.zeros(n)
+        w[0] = np.exp(u[0])
+        for k in range(1, n):
+            j = np.arange(1, k + 1)
+            w[k] = np.dot(j * u[1:k + 1], w[k - 1::-1][:k]) / k
+        return w
+        
+    def log(u):
+        if u[0] <= 0:
+            raise ValueError("logarithm of a non-positive value")
+        w = np.zeros(n)
+        w[0] = np.log(u[0])
+        for k in range(1, n):
+            j = np.arange(1, k)
+            w[k] = (u[k] - np.dot(j * w[1:k], u[k - 1:0:-1]) / k) / u[0]
+        return w
+        
+    def sin_cos(u, sign):
+        # sign -1 gives (sin, cos); +1 gives (sinh, cosh)
+        s, c = np.zeros(n), np.zeros(n)
+        s[0], c[0] = (np.sin(u[0]), np.cos(u[0])) if sign < 0 else (np.sinh(u[0]), np.cosh(u[0]))
+        for k in range(1, n):
+            j = np.arange(1, k + 1) * u[1:k + 1]
+            s[k] = np.dot(j, c[k - 1::-1][:k]) / k
+            c[k] = sign * np.dot(j, s[k - 1::-1][:k]) / k
+        return s, c
+        
+    def walk(node):
+        if not node.has(symbol):
+            return constant(float(node))
+        if node == symbol:
+            series = constant(a)
+            if n > 1:
+                series[1] = 1.0
+            return series
+        if node.is_Add:
+            return sum(walk(arg) for arg in node.args)
+        if node.is_Mul:
+            result = constant(1.0)
+            for arg in node.args:
+                result = mul(result, walk(arg))
+            return result
+        if node.is_Pow:
+            base, exponent = node.args
+            if not exponent.has(symbol):
+                return power(walk(base), float(exponent))
+            return exp(mul(walk(exponent), log(walk(base))))
+        if len(node.args) != 1:
+            raise NotImplementedError(node.func)
+            
+        u = walk(node.args[0])
+        if node.func == sp.exp:
+            return exp(u)
+        if node.func == sp.log:
+            return log(u)
+        if node.func in (sp.sin, sp.cos, sp.tan):
+            s, c = sin_cos(u, -1)
+            return {sp.sin: s, sp.cos: c}.get(node.func) if node.func != sp.tan else mul(s, power(c, -1))
+        if node.func in (sp.sinh, sp.cosh, sp.tanh):
+            s, c = sin_cos(u, 1)
+            return {sp.sinh: s, sp.cosh: c}.get(node.func) if node.func != sp.tanh else mul(s, power(c, -1))
+        if node.func == sp.atan:
+            return integrate_derivative(np.arctan(u[0]), mul(derivative_of(u), power(constant(1.0) + mul(u, u), -1)))
+        if node.func in (sp.asin, sp.acos):
+            slope = mul(derivative_of(u), power(constant(1.0) - mul(u, u), -0.5))
+            if node.func == sp.asin:
+                return integrate_derivative(np.arcsin(u[0]), slope)
+            return integrate_derivative(np.arccos(u[0]), -slope)
+        raise NotImplementedError(node.func)
+        
+    try:
+        return walk(expr)
+    except NotImplementedError:
+        h = sp.Dummy('h')
+        series = sp.series(expr.subs(symbol, a + h), h, 0, n).removeO()
+        return np.array([float(series.coeff(h, k)) for k in range(n)])
+        
+
+def taylor_partial_sums(coeffs, dx):
+    """Return every partial sum of a Taylor polynomial at offsets dx, one row per order
+    
+    The powers of dx form a Vandermonde matrix built by a running product, so
+    all orders come from one multiply and one cumulative sum.
+    """
+    dx = np.asarray(dx, dtype=float)
+    powers = np.empty((len(coeffs), dx.size))
+    powers[0] = 1.0
+    if len(coeffs) > 1:
+        np.cumprod(np.broadcast_to(dx.ravel(), (len(coeffs) - 1, dx.size)), axis=0, out=powers[1:])
+    return np.cumsum(np.asarray(coeffs)[:, np.newaxis] * powers, axis=0)
+    
+
+RIEMANN_RULES = ["left", "right", "midpoint", "trapezoid", "simpson"]
+
+
+def riemann_samples(func, a, b, n):
+    """Sample func at the n+1 subinterval ends and the n midpoints with one call"""
+    grid = np.linspace(a, b, 2 * n + 1)
+    with np.errstate(all='ignore'):
+        values = broadcast_result(func(grid), grid.shape)
+    return grid[::2], values[::2], values[1::2]
+    
+
+def riemann_rules(ends, mids, a, b):
+    """Return every rule's estimate of the integral from shared end and midpoint samples"""
+    h = (b - a) / len(mids)
+    left = h * ends[:-1].sum()
+    right = h * ends[1:].sum()
+    midpoint = h * mids.sum()
+    trapezoid = (left + right) / 2
+    return {"left": left, "right": right, "midpoint": midpoint,
+            "trapezoid": trapezoid, "simpson": (2 * midpoint + trapezoid) / 3}
+            
+
+def riemann_shapes(rule, x, ends, mids, limit=2000):
+    """Return polygons for a rule's rectangles, trapezoids or Simpson parabolas
+    
+    Up to limit subintervals each becomes its own polygon; beyond that they
+    are narrower than a pixel, so their union is returned as one outline.
+    """
+    n = len(mids)
+    if rule in ("left", "right", "midpoint"):
+        height = {"left": ends[:-1], "right": ends[1:], "midpoint": mids}[rule]
+        top = np.stack([np.column_stack([x[:-1], height]), np.column_stack([x[1:], height])], axis=1)
+    elif rule == "trapezoid":
+        top = np.stack([np.column_stack([x[:-1], ends[:-1]]), np.column_stack([x[1:], ends[1:]])], axis=1)
+    else:
+        # Parabola through both ends and the midpoint of each subinterval
+        s = np.linspace(0, 1, 9 if n <= limit else 3)
+        weights = np.column_stack([2 * (s - 0.5) * (s - 1), -4 * s * (s - 1), 2 * s * (s - 0.5)])
+        heights = np.column_stack([ends[:-1], mids, ends[1:]]) @ weights.T
+        xs = x[:-1, np.newaxis] + np.outer(np.diff(x), s)
+        top = np.stack([xs, heights], axis=-1)
+        
+    if n <= limit:
+        base_left = np.column_stack([x[:-1], np.zeros(n)])[:, np.newaxis]
+        base_right = np.column_stack([x[1:], np.zeros(n)])[:, np.newaxis]
+        return np.concatenate([base_left, top, base_right], axis=1)
+    outline = np.concatenate([[[x[0], 0.0]], top.reshape(-1, 2), [[x[-1], 0.0]]])
+    return [outline]
+    
+
+DASHBOARD_LAYOUTS = {
+    "2x2": ["f", "f'", "surface", "parametric"],
+    "3x3": ["f", "f'", "f''", "integral", "phase", "spectrum", "histogram", "surface", "parametric"],
+}
+
+
+THEME_COLORS = {
+    True: {"figure": '#1a1a2e', "axes": '#16213e', "foreground": 'white'},
+    False: {"figure": 'white', "axes": 'white', "foreground": 'black'},
+}
+
+# gid of artists drawn in color scheme colors, the only ones a scheme change recolors
+SCHEME_GID = "scheme"
+# gid of derivative lines, recolored to the derivative shade of the new scheme
+DERIVATIVE_GID = "scheme-derivative"
+# gid of artists drawn in theme colors, the only ones a theme toggle recolors
+THEME_GID = "theme"
+
+# Colors swapped on THEME_GID artists when changing theme; the style sheets' grid colors are included
+THEME_SWAPS = {
+    True: {'black': 'white', 'white': '#16213e', '#b0b0b0': 'white'},
+    False: {'white': 'black', 'black': 'white', '#16213e': 'white', '#1a1a2e': 'white'},
+}
+
+
+def tag_theme_artists(figure):
+    """Tag the decorations each axes owns (title, axis labels, ticks, grid, spines, legend) with THEME_GID"""
+    for ax in figure.findobj(Axes):
+        owned = [ax.title, *ax.spines.values()]
+        for axis in (ax.xaxis, ax.yaxis, getattr(ax, 'zaxis', None)):
+            if axis is not None:
+                owned += axis.findobj()
+        legend = ax.get_legend()
+        if legend is not None:
+            owned += [legend.get_frame(), legend.get_title(), *legend.get_texts()]
+        for artist in owned:
+            artist.set_gid(THEME_GID)
+            
+
+def derivative_color(color):
+    """Color of a curve's derivative line: its scheme color shifted towards red"""
+    r, g, b = to_rgb(color)
+    return (min(1, r*1.3), min(1, g*0.7), min(1, b*0.7))
+    
+
+def restyle_figure(figure, mapping, gid=None):
+    """Recolor a figure's existing artists in place
+    
+    Colors are matched on RGB only and replaced with their mapping value,
+    keeping each artist's alpha. Colormapped collections keep their colors.
+    With gid, only artists tagged with it are touched, so e.g. a red
+    tangent line survives a scheme whose first color is also red. Nothing
+    is re-evaluated, so the cost depends on the number of artists rather
+    than on how many points they hold.
+    """
+    old = np.array([to_rgb(color) for color in mapping])
+    new = np.array([to_rgb(color) for color in mapping.values()])
+    
+    def swap(colors):
+        rgba = to_rgba_array(colors).copy()
+        if not len(rgba):
+            return None
+        match = np.all(np.abs(rgba[:, np.newaxis, :3] - old[np.newaxis]) < 1e-3, axis=2)
+        hit = match.any(axis=1) & (rgba[:, 3] > 0)
+        if not hit.any():
+            return None
+        rgba[hit, :3] = new[match[hit].argmax(axis=1)]
+        return rgba
+        
+    def restyle_patch(patch):
+        face, edge = swap(patch.get_facecolor()), swap(patch.get_edgecolor())
+        if face is not None:
+            patch.set_facecolor(face[0])
+        if edge is not None:
+            patch.set_edgecolor(edge[0])
+            
+    for artist in figure.findobj():
+        if gid is not None and artist.get_gid() != gid:
+            continue
+        if isinstance(artist, Line2D):
+            for get, set_ in ((artist.get_color, artist.set_color),
+                              (artist.get_markerfacecolor, artist.set_markerfacecolor),
+                              (artist.get_markeredgecolor, artist.set_markeredgecolor)):
+                color = swap(get())
+                if color is not None:
+                    set_(color[0])
+        elif isinstance(artist, Text):
+            color = swap(artist.get_color())
+            if color is not None:
+                artist.set_color(color[0])
+            if artist.get_bbox_patch() is not None:
+                restyle_patch(artist.get_bbox_patch())
+        elif isinstance(artist, Patch):
+            restyle_patch(artist)
+        elif isinstance(artist, Collection) and artist.get_array() is None:
+            face, edge = swap(artist.get_facecolor()), swap(artist.get_edgecolor())
+            if face is not None:
+                artist.set_facecolor(face)
+            if edge is not None:
+                artist.set_edgecolor(edge)
+                
+
+def minmax_decimate(values, buckets):
+    """Reduce a long series to per-bucket min/max pairs for display
+    
+    Returns (positions, values) with positions as sample indices, keeping
+    each bucket's minimum and maximum in their original order so spikes
+    survive the reduction.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(n, dtype=float), values
+        
+    k = n // buckets
+    blocks = values[:buckets * k].reshape(buckets, k)
+    with np.errstate(all='ignore'):
+        safe = np.where(np.isnan(blocks), np.inf, blocks)
+        lo = np.argmin(safe, axis=1)
+        safe = np.where(np.isnan(blocks), -np.inf, blocks)
+        hi = np.argmax(safe, axis=1)
+    first = np.minimum(lo, hi)
+    second = np.maximum(lo, hi)
+    base = np.arange(buckets) * k
+    positions = np.column_stack((base + first, base + second)).ravel()
+    return positions.astype(float), values[positions]
+
+
+class PixelEnvelope:
+    """Per-pixel-column min, max and mean of a sampled curve, accumulated chunk by chunk"""
+    
+    def __init__(self, x0, x1, n, columns):
+        self.x0, self.x1, self.n, self.columns = x0, x1, n, columns
+        self.step = (x1 - x0) / max(n - 1, 1)
+        self.lo = np.full(columns, np.nan)
+        self.hi = np.full(columns, np.nan)
+        self.total = np.zeros(columns)
+        self.count = np.zeros(columns, dtype=np.int64)
+        self.done = 0
+        self.lock = threading.Lock()
+        
+    def samples(self, start, stop):
+        """Return the x values of samples start..stop-1 without building the full range"""
+        return self.x0 + self.step * np.arange(start, stop, dtype=float)
+        
+    def add(self, start, y):
+        """Fold the values of samples start..start+len(y)-1 into their columns"""
+        cols = np.arange(start, start + len(y), dtype=np.int64) * self.columns // self.n
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(cols)) + 1))
+        used = cols[starts]
+        finite = np.isfinite(y)
+        y = np.where(finite, y, np.nan)
+        lo = np.fmin.reduceat(y, starts)
+        hi = np.fmax.reduceat(y, starts)
+        total = np.add.reduceat(np.where(finite, y, 0.0), starts)
+        count = np.add.reduceat(finite.astype(np.int64), starts)
+        with self.lock:
+            self.lo[used] = np.fmin(self.lo[used], lo)
+            self.hi[used] = np.fmax(self.hi[used], hi)
+            self.total[used] += total
+            self.count[used] += count
+            self.done += len(y)
+            
+    def envelope(self):
+        """Return column centres, minima, maxima and means of everything folded in so far"""
+        with self.lock:
+            lo, hi = self.lo.copy(), self.hi.copy()
+            with np.errstate(all='ignore'):
+                mean = np.where(self.count > 0, self.total / np.maximum(self.count, 1), np.nan)
+        centres = self.x0 + (self.x1 - self.x0) * (np.arange(self.columns) + 0.5) / self.columns
+        return centres, lo, hi, mean
+        
+
+def stream_envelope(func, envelope, chunk=1 << 20, executor=None, spill=None, cancel=None):
+    """Evaluate func over the envelope's whole range, a few chunks in memory at a time
+    
+    Chunks are mapped across executor in batches of its worker count, and
+    optionally written into spill (e.g. a memory-mapped .npy) on the way.
+    Stops early once cancel is set.
+    """
+    def work(start):
+        stop = min(start + chunk, envelope.n)
+        x = envelope.samples(start, stop)
+        y = chunked_evaluate(func, [x], x.shape)
+        if spill is not None:
+            spill[start:stop] = y
+        envelope.add(start, y)
+        
+    batch = (os.cpu_count() or 1) if executor is not None else 1
+    starts = range(0, envelope.n, chunk)
+    for i in range(0, len(starts), batch):
+        if cancel is not None and cancel.is_set():
+            return
+        if executor is None:
+            work(starts[i])
+        else:
+            list(executor.map(work, starts[i:i + batch]))
+            
+
+def domain_coloring_rgb(W, saturation=0.9):
+    """Color complex values by argument (hue) and log-modulus contours (brightness)
+    
+    The HSV to RGB step is done branch-free on whole float32 arrays: with
+    the hue h in sixths of a turn on [-3, 3], each channel is a clipped
+    triangle wave of h. Returns an RGB uint8 image of W's shape.
+    """
+    re = np.ascontiguousarray(np.real(W), dtype=np.float32)
+    im = np.ascontiguousarray(np.imag(W), dtype=np.float32)
+    
+    with np.errstate(all='ignore'):
+        hue = np.arctan2(im, re)
+        hue *= np.float32(3 / np.pi)
+        
+        # Brightness steps at every doubling of |f|
+        level = re * re
+        level += im * im
+        np.log2(level, out=level)
+        level *= 0.5
+        bad = ~np.isfinite(level)
+        has_bad = bad.any()
+        if has_bad:
+            level[bad] = 0
+        value = level - np.floor(level)
+        value *= 0.3
+        value += 0.7
+        chroma = value * np.float32(saturation)
+        base = value - chroma
+        
+        rgb = np.empty(np.shape(W) + (3,), dtype=np.uint8)
+        a = np.empty_like(hue)
+        b = np.empty_like(hue)
+        for channel, (p, q) in enumerate(((0, None), (2, -4), (-2, 4))):
+            np.subtract(hue, p, out=a)
+            np.abs(a, out=a)
+            np.subtract(2, a, out=a)
+            if q is not None:
+                np.subtract(hue, q, out=b)
+                np.abs(b, out=b)
+                np.subtract(2, b, out=b)
+                np.maximum(a, b, out=a)
+            np.clip(a, 0, 1, out=a)
+            a *= chroma
+            a += base
+            a *= 255
+            rgb[..., channel] = a
+            
+    # Poles show white, zeros black and undefined points grey
+    if has_bad:
+        mag = np.abs(np.asarray(W)[bad])
+        rgb[bad] = np.where(np.isinf(mag), 255, np.where(mag == 0, 0, 128))[:, np.newaxis]
+    return rgb
+
+
+def integrate_trajectories(rhs, seeds, span, bounds, samples=300):
+    """Integrate every initial condition of a planar system in one batched solve_ivp call
+    
+    rhs(x, y) takes arrays and returns (dx/dt, dy/dt). All trajectories share
+    one state vector, so each solver step is a single vectorized RHS call.
+    Trajectories freeze once they leave a margin around bounds, and samples
+    outside bounds are NaN so each row draws as a broken polyline. Returns
+    an array of shape (len(seeds), 2*samples - 1, 2) running from -span to +span.
+    """
+    seeds = np.asarray(seeds, dtype=float).reshape(-1, 2)
+    n = len(seeds)
+    x0, x1, y0, y1 = bounds
+    mx, my = (x1 - x0) * 0.5, (y1 - y0) * 0.5
+    
+    def batched(t, state):
+        x, y = state[:n], state[n:]
+        with np.errstate(all='ignore'):
+            u, v = rhs(x, y)
+            u = broadcast_result(u, x.shape)
+            v = broadcast_result(v, x.shape)
+        live = ((x > x0 - mx) & (x < x1 + mx) & (y > y0 - my) & (y < y1 + my)
+                & np.isfinite(u) & np.isfinite(v))
+        return np.concatenate([np.where(live, u, 0.0), np.where(live, v, 0.0)])
+        
+    halves = []
+    for direction in (-1, 1):
+        t_eval = np.linspace(0, direction * span, samples)
+        sol = integrate.solve_ivp(batched, (0, direction * span), seeds.T.ravel(),
+                                  t_eval=t_eval, rtol=1e-5, atol=1e-8)
+        states = sol.y
+        if states.shape[1] < samples:
+            # Solver gave up early: hold the last state for the remaining samples
+            last = states[:, -1:] if states.shape[1] else seeds.T.reshape(-1, 1)
+            states = np.hstack([states, np.repeat(last, samples - states.shape[1], axis=1)])
+        halves.append(states)
+        
+    states = np.hstack([halves[0][:, ::-1], halves[1][:, 1:]])
+    paths = np.stack([states[:n], states[n:]], axis=-1)
+    outside = ((paths[..., 0] < x0) | (paths[..., 0] > x1) |
+               (paths[..., 1] < y0) | (paths[..., 1] > y1))
+    paths[outside] = np.nan
+    return paths
+
+
+DATA_DTYPES = {"float64": "<f8", "float32": "<f4", "int32": "<i4", "int16": "<i2"}
+TEXT_DATA = (".csv", ".tsv", ".txt", ".dat")
+
+
+def csv_separator(line):
+    """Guess the field separator of a line of delimited numbers; None means runs of whitespace"""
+    for sep in (b'\t', b';', b','):
+        if sep in line:
+            return sep
+    return None
+    
+
+def csv_fields(line, sep):
+    """Split one line into fields, keeping empty ones when there is a separator"""
+    line = line.strip(b'\r\n')
+    return line.split(sep) if sep is not None else line.split()
+    
+
+def parse_csv_lines(text, sep, columns, first_row=0):
+    """Parse complete lines of delimited numbers into a (rows, columns) float array, empty fields as NaN
+    
+    Field counts are checked for every line at once from the separator
+    positions, so a short row raises ValueError instead of shifting later
+    values into the wrong columns. first_row numbers rows in the message.
+    """
+    text = text.replace(b'\r', b'')
+    if not text.endswith(b'\n'):
+        text += b'\n'
+    buf = np.frombuffer(text, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    filled = ends > starts
+    
+    if sep is not None:
+        fields = np.add.reduceat(buf == ord(sep), starts, dtype=np.int64) + 1
+        bad = np.flatnonzero(filled & (fields != columns))
+        if len(bad):
+            row = first_row + int(np.count_nonzero(filled[:bad[0]])) + 1
+            raise ValueError(f"row {row:,} has {fields[bad[0]]} fields, expected {columns}")
+            
+        # Empty fields become NaN: between separators, and at the start or end of a line
+        text = b'\n' + text
+        for _ in range(2):
+            text = text.replace(sep + sep, sep + b'nan' + sep)
+        text = text.replace(b'\n' + sep, b'\nnan' + sep).replace(sep + b'\n', sep + b'nan\n')
+        text = text.replace(sep, b' ')
+        
+    rows = int(np.count_nonzero(filled))
+    try:
+        values = np.fromstring(text.decode('ascii', 'ignore'), sep=' ')
+    except ValueError:
+        values = np.empty(0)
+    if len(values) != rows * columns:
+        raise ValueError(f"rows {first_row + 1:,} to {first_row + rows:,} hold a value that is not a number, "
+                         f"or a row without {columns} fields")
+    return values.reshape(rows, columns)
+    
+
+def convert_csv(path, target, chunk=1 << 24):
+    """Parse a numeric CSV into raw little-endian float64 rows in target; return (rows, columns)
+    
+    The file is read a chunk at a time, cut at the last newline, and each
+    chunk parsed with a few vectorized calls, so memory use stays at a few
+    chunks however long the file is. Leading lines that are not all
+    numbers (a header) are skipped, and empty fields are stored as NaN.
+    """
+    columns = None
+    sep = None
+    pending = b''
+    rows = 0
+    with open(path, 'rb') as f, open(target, 'wb') as out:
+        while True:
+            block = f.read(chunk)
+            data = pending + block
+            cut = data.rfind(b'\n') if block else len(data) - 1
+            if cut < 0 and block:
+                pending = data
+                continue
+            head, pending = data[:cut + 1], data[cut + 1:]
+            
+            if columns is None:
+                skip = 0
+                for line in head.splitlines(keepends=True):
+                    line_sep = csv_separator(line)
+                    fields = csv_fields(line, line_sep)
+                    try:
+                        numbers = [float(field) for field in fields if field.strip()]
+                    except ValueError:
+                        numbers = []
+                    if numbers:
+                        columns, sep = len(fields), line_sep
+                        break
+                    skip += len(line)
+                head = head[skip:]
+                
+            if head and columns is not None:
+                values = parse_csv_lines(head, sep, columns, rows)
+                out.write(values.astype('<f8', copy=False).tobytes())
+                rows += len(values)
+            if not block:
+                break
+                
+    if columns is None:
+        raise ValueError("no numeric rows found")
+    return rows, columns
+    
+
+def open_dataset(path, dtype="float64", columns=1, folder=None):
+    """Open a CSV, .npy or raw binary file as a read-only memory-mapped (rows, columns) table
+    
+    .npy files and raw binaries are mapped directly; text files are parsed
+    once into a float64 binary in folder, keyed by path, size and
+    modification time, so importing them again is instant.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        table = np.load(path, mmap_mode='r')
+        if table.ndim == 1:
+            table = table.reshape(-1, 1)
+        elif table.ndim != 2:
+            raise ValueError(f".npy arrays must be 1D or 2D, not {table.ndim}D")
+        return table
+        
+    if ext in TEXT_DATA:
+        info = os.stat(path)
+        tag = hashlib.sha256(f"{os.path.abspath(path)}:{info.st_size}:{info.st_mtime_ns}".encode('utf-8')).hexdigest()[:16]
+        folder = folder or os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        target = os.path.join(folder, f"data_{tag}.f64")
+        shape_path = target + ".json"
+        if os.path.exists(shape_path) and os.path.exists(target):
+            with open(shape_path) as f:
+                rows, columns = json.load(f)
+            try:
+                os.utime(target, None)
+            except OSError:
+                pass
+        else:
+            rows, columns = convert_csv(path, target)
+            with open(shape_path, 'w') as f:
+                json.dump([rows, columns], f)
+        if rows == 0:
+            raise ValueError("no numeric rows found")
+        return np.memmap(target, dtype='<f8', mode='r', shape=(rows, columns))
+        
+    item = np.dtype(DATA_DTYPES[dtype])
+    rows = os.path.getsize(path) // (item.itemsize * columns)
+    if rows == 0:
+        raise ValueError("file is smaller than one row")
+    return np.memmap(path, dtype=item, mode='r', shape=(rows, columns))
+    
+
+def scan_column(values, chunk=1 << 22):
+    """Return (finite min, finite max, ascending) of a possibly memory-mapped column, a chunk at a time"""
+    lo, hi, ascending, last = np.inf, -np.inf, True, -np.inf
+    for start in range(0, len(values), chunk):
+        block = np.asarray(values[start:start + chunk], dtype=float)
+        finite = block[np.isfinite(block)]
+        if len(finite):
+            lo, hi = min(lo, finite.min()), max(hi, finite.max())
+        if ascending:
+            ascending = block[0] >= last and bool(np.all(block[1:] >= block[:-1]))
+            last = block[-1]
+    return lo, hi, ascending
+    
+
+def decimate_rows(values, start, stop, buckets, chunk=1 << 22):
+    """Return sorted row indices in start..stop keeping each bucket's min and max, reading a chunk at a time"""
+    n = stop - start
+    if n <= 2 * buckets:
+        return np.arange(start, stop)
+    k = n // buckets
+    per = max(chunk // k, 1)
+    parts = []
+    for b in range(0, buckets, per):
+        count = min(per, buckets - b)
+        first = start + b * k
+        positions, _ = minmax_decimate(np.asarray(values[first:first + count * k], dtype=float), count)
+        parts.append(positions.astype(np.int64) + first)
+    return np.concatenate(parts)
+    
+
+FIT_LOSSES = ["linear", "soft_l1", "huber", "cauchy", "arctan"]
+
+# Starting worker processes costs more than a few dozen subsample fits, so add one per this many starts
+FIT_STARTS_PER_WORKER = 64
+
+
+def compile_fit(equation):
+    """Compile a fit model and its derivative in every parameter into one fused callable
+    
+    Every free symbol other than x is a parameter, taken in name order.
+    Returns (params, func, stats) where func(x, *values) returns the model
+    followed by its partial derivatives, sharing common subexpressions.
+    """
+    expr = sp.sympify(equation)
+    params = sorted((s for s in expr.free_symbols if s.name != 'x'), key=lambda s: s.name)
+    if not params:
+        raise ValueError("the model has no parameters; use names other than x, e.g. a*sin(b*x + c)")
+    func, stats = compile_fused([expr] + [sp.diff(expr, p) for p in params], [sp.Symbol('x')] + params)
+    return params, func, stats
+    
+
+class FitProblem:
+    """Residuals and analytic Jacobian of a compiled fit model on fixed data
+    
+    Both come from one fused, chunked evaluation per parameter vector, so
+    the Jacobian that least_squares asks for right after the residuals at
+    the same point costs nothing extra.
+    """
+    
+    def __init__(self, func, x, y):
+        self.func, self.x, self.y = func, x, y
+        self.point = None
+        self.values = None
+        
+    def evaluate(self, p):
+        """Model and derivatives at p, as a (1 + parameters, samples) array"""
+        if self.point is None or not np.array_equal(p, self.point):
+            self.values = chunked_evaluate(self.func, [self.x, *p], self.x.shape, outputs=len(p) + 1)
+            self.point = np.array(p, dtype=float)
+        return self.values
+        
+    def residuals(self, p):
+        return self.evaluate(p)[0] - self.y
+        
+    def jacobian(self, p):
+        return self.evaluate(p)[1:].T
+        
+
+_fit_problem = None
+
+
+def start_fit_worker(equation, x, y):
+    """Compile the model once in this process and keep the data for every start it runs"""
+    global _fit_problem
+    _, func, _ = compile_fit(equation)
+    _fit_problem = FitProblem(func, x, y)
+    
+
+def fit_from(p0, loss="linear"):
+    """Run one least-squares fit from p0; return (parameters, cost, evaluations) or None if it failed"""
+    try:
+        with np.errstate(all='ignore'):
+            result = optimize.least_squares(_fit_problem.residuals, p0, jac=_fit_problem.jacobian,
+                                            loss=loss, x_scale='jac')
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    if not np.isfinite(result.cost):
+        return None
+    return result.x, result.cost, result.nfev
+    
+
+def fit_starts(p0, count, seed=0):
+    """Initial guesses for a multi-start fit: p0, then copies rescaled log-uniformly over 0.1-10x with random signs"""
+    p0 = np.asarray(p0, dtype=float)
+    rng = np.random.default_rng(seed)
+    base = np.where(p0 == 0, 1.0, p0)
+    scale = 10 ** rng.uniform(-1, 1, (count - 1, len(p0))) * rng.choice([-1, 1], (count - 1, len(p0)))
+    return np.vstack([p0, base * scale])
+    
+
+def multistart_fit(equation, x, y, starts, loss="linear", workers=1, coarse=20000, rtol=1e-4):
+    """Fit from every start, across a process pool when workers > 1; return (best fit, reached, completed)
+    
+    Starts are fitted to an evenly strided subsample of at most coarse
+    points, where a start that wanders for a hundred iterations costs
+    milliseconds, and only the best is then refined on the full data. Each
+    worker compiles the model and receives the subsample once, through the
+    pool initializer, rather than with every start. reached counts the
+    starts whose cost came within rtol of the best, completed those that
+    finished at all (many stop in a local minimum).
+    """
+    step = max(-(-len(x) // coarse), 1)
+    xs, ys = np.ascontiguousarray(x[::step]), np.ascontiguousarray(y[::step])
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=start_fit_worker,
+                                 initargs=(equation, xs, ys)) as pool:
+            fits = list(pool.map(fit_from, starts, [loss] * len(starts)))
+    else:
+        start_fit_worker(equation, xs, ys)
+        fits = [fit_from(p0, loss) for p0 in starts]
+    fits = [fit for fit in fits if fit is not None]
+    if not fits:
+        raise ValueError("no start converged; try other start values")
+    best = min(fits, key=lambda fit: fit[1])
+    reached = sum(bool(fit[1] <= best[1] * (1 + rtol) + 1e-300) for fit in fits)
+    
+    if step > 1:
+        start_fit_worker(equation, x, y)
+        best = fit_from(best[0], loss) or best
+    return best, reached, len(fits)
+    
+
+def grid_triangles(rows, cols):
+    """Index buffer for a rows x cols vertex grid, two triangles per cell, built without Python loops"""
+    index = np.arange(rows * cols, dtype=np.uint32).reshape(rows, cols)
+    a, b = index[:-1, :-1], index[:-1, 1:]
+    c, d = index[1:, :-1], index[1:, 1:]
+    return np.stack([a, b, d, a, d, c], axis=-1).reshape(-1, 3)
+    
+
+def curvature_lines(P, axis, keep):
+    """Choose keep grid lines along one axis of a (3, rows, cols) vertex grid, denser where it bends
+    
+    Each line is weighted by the mean length of the surface's second
+    difference across it, plus a floor so flat stretches are still sampled,
+    and lines are picked at even steps of the cumulative weight. The first
+    and last lines are always kept, so the outline is preserved.
+    """
+    n = P.shape[axis + 1]
+    if keep >= n or n < 3:
+        return np.arange(n)
+    with np.errstate(all='ignore'):
+        bend = np.linalg.norm(np.diff(P, 2, axis=axis + 1), axis=0)
+    bend = np.where(np.isfinite(bend), bend, 0.0).mean(axis=1 - axis)
+    weight = np.concatenate(([0.0], bend, [0.0]))
+    weight += weight.mean() + 1e-12
+    cdf = np.cumsum(weight)
+    cdf = (cdf - cdf[0]) / (cdf[-1] - cdf[0])
+    picks = np.searchsorted(cdf, np.linspace(0, 1, keep))
+    return np.unique(np.concatenate(([0], np.clip(picks, 0, n - 1), [n - 1])))
+    
+
+def mesh_buffers(X, Y, Z, keep=1.0):
+    """Return float32 vertices and uint32 triangles for a grid surface
+    
+    keep below 1 decimates the grid by curvature to about that fraction of
+    the triangles. Triangles touching a non-finite vertex are dropped and
+    those vertices zeroed, since every format needs finite coordinates.
+    """
+    P = np.stack([np.asarray(a, dtype=np.float32) for a in np.broadcast_arrays(X, Y, Z)])
+    if keep < 1:
+        rows = curvature_lines(P, 0, max(int(P.shape[1] * np.sqrt(keep)), 2))
+        cols = curvature_lines(P, 1, max(int(P.shape[2] * np.sqrt(keep)), 2))
+        P = P[:, rows][:, :, cols]
+    _, rows, cols = P.shape
+    vertices = np.ascontiguousarray(P.reshape(3, -1).T)
+    triangles = grid_triangles(rows, cols)
+    finite = np.isfinite(vertices).all(axis=1)
+    if not finite.all():
+        triangles = triangles[finite[triangles].all(axis=1)]
+        vertices[~finite] = 0.0
+    return vertices, triangles
+    
+
+STL_TRIANGLE = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+PLY_FACE = np.dtype([('count', 'u1'), ('indices', '<i4', 3)])
+
+
+def write_stl(f, vertices, triangles, chunk=1 << 20):
+    """Stream a binary STL, computing facet normals one chunk of triangles at a time"""
+    f.write(b"Mathematics Visualiser surface".ljust(80, b" "))
+    f.write(struct.pack('<I', len(triangles)))
+    for start in range(0, len(triangles), chunk):
+        corners = vertices[triangles[start:start + chunk]]
+        normal = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        length = np.linalg.norm(normal, axis=1, keepdims=True)
+        record = np.zeros(len(corners), dtype=STL_TRIANGLE)
+        record['normal'] = np.divide(normal, length, out=np.zeros_like(normal), where=length > 0)
+        record['vertices'] = corners
+        f.write(record.tobytes())
+        
+
+def write_obj(f, vertices, triangles, chunk=1 << 18):
+    """Stream a Wavefront OBJ, formatting each chunk of vertices and faces in one call"""
+    f.write(b"# Mathematics Visualiser surface\n")
+    for start in range(0, len(vertices), chunk):
+        block = vertices[start:start + chunk]
+        f.write((("v %.7g %.7g %.7g\n" * len(block)) % tuple(block.ravel().tolist())).encode('ascii'))
+    for start in range(0, len(triangles), chunk):
+        block = triangles[start:start + chunk].astype(np.int64) + 1
+        f.write((("f %d %d %d\n" * len(block)) % tuple(block.ravel().tolist())).encode('ascii'))
+        
+
+def write_ply(f, vertices, triangles, chunk=1 << 20):
+    """Stream a binary little-endian PLY"""
+    header = ("ply\nformat binary_little_endian 1.0\ncomment Mathematics Visualiser surface\n"
+              f"element vertex {len(vertices)}\nproperty float x\nproperty float y\nproperty float z\n"
+              f"element face {len(triangles)}\nproperty list uchar int vertex_indices\nend_header\n")
+    f.write(header.encode('ascii'))
+    for start in range(0, len(vertices), chunk):
+        f.write(vertices[start:start + chunk].astype('<f4', copy=False).tobytes())
+    for start in range(0, len(triangles), chunk):
+        block = triangles[start:start + chunk]
+        record = np.empty(len(block), dtype=PLY_FACE)
+        record['count'] = 3
+        record['indices'] = block
+        f.write(record.tobytes())
+        
+
+def write_glb(f, vertices, triangles, chunk=1 << 20):
+    """Stream a binary glTF 2.0 (.glb) with one indexed triangle mesh
+    
+    Both buffer views hold 4-byte components, so only the JSON chunk needs
+    padding, and every length is known before the first byte is written.
+    """
+    positions, indices = vertices.size * 4, triangles.size * 4
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Mathematics Visualiser"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1, "mode": 4}]}],
+        "buffers": [{"byteLength": positions + indices}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": positions, "target": 34962},
+            {"buffer": 0, "byteOffset": positions, "byteLength": indices, "target": 34963},
+        ],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(vertices), "type": "VEC3",
+             "min": vertices.min(axis=0).tolist(), "max": vertices.max(axis=0).tolist()},
+            {"bufferView": 1, "componentType": 5125, "count": triangles.size, "type": "SCALAR"},
+        ],
+    }
+    text = json.dumps(gltf).encode('utf-8')
+    text += b" " * (-len(text) % 4)
+    f.write(struct.pack('<III', 0x46546C67, 2, 12 + 8 + len(text) + 8 + positions + indices))
+    f.write(struct.pack('<II', len(text), 0x4E4F534A))
+    f.write(text)
+    f.write(struct.pack('<II', positions + indices, 0x004E4942))
+    for start in range(0, len(vertices), chunk):
+        f.write(vertices[start:start + chunk].astype('<f4', copy=False).tobytes())
+    for start in range(0, len(triangles), chunk):
+        f.write(triangles[start:start + chunk].astype('<u4', copy=False).tobytes())
+        
+
+MESH_WRITERS = {".stl": write_stl, ".obj": write_obj, ".ply": write_ply, ".glb": write_glb}
+
+
+def write_mesh(path, X, Y, Z, keep=1.0):
+    """Write a grid surface as STL, OBJ, PLY or binary glTF, chosen by extension; return (vertex count, triangle count)"""
+    writer = MESH_WRITERS.get(os.path.splitext(path)[1].lower())
+    if writer is None:
+        raise ValueError("mesh files must end in .stl, .obj, .ply or .glb")
+    vertices, triangles = mesh_buffers(X, Y, Z, keep)
+    if not len(triangles):
+        raise ValueError("the surface has no finite triangles")
+    with open(path, 'wb') as f:
+        writer(f, vertices, triangles)
+    return len(vertices), len(triangles)
+    
+
+class RingBuffer:
+    """Fixed-size NumPy ring buffer written by a producer thread"""
+    
+    def __init__(self, capacity, dtype=float):
+        self.capacity = int(capacity)
+        self.data = np.full(self.capacity, np.nan, dtype=dtype)
+        self.head = 0
+        self.count = 0
+        self.lock = threading.Lock()
+        
+    def extend(self, values):
+        """Append a block of samples, overwriting the oldest ones"""
+        values = np.asarray(values, dtype=self.data.dtype).ravel()
+        n = len(values)
+        if n == 0:
+            return
+            
+        with self.lock:
+            if n >= self.capacity:
+                self.data[:] = values[-self.capacity:]
+                self.head = 0
+            else:
+                end = self.head + n
+                if end <= self.capacity:
+                    self.data[self.head:end] = values
+                else:
+                    split = self.capacity - self.head
+                    self.data[self.head:] = values[:split]
+                    self.data[:n - split] = values[split:]
+                self.head = end % self.capacity
+            self.count += n
+            
+    def snapshot(self):
+        """Return (samples oldest first, total samples ever received)"""
+        with self.lock:
+            ordered = np.concatenate((self.data[self.head:], self.data[:self.head]))
+            count = self.count
+        return ordered, count
+
+
+class StreamReader(threading.Thread):
+    """Background thread parsing samples from a socket, pipe or tailed file
+    
+    Text sources carry numbers separated by whitespace or commas; the
+    float32 format is raw little-endian values. Each read is parsed in one
+    vectorized call and pushed into the ring buffer.
+    """
+    
+    def __init__(self, buffer, source, target, fmt='text'):
+        super().__init__(daemon=True)
+        self.buffer = buffer
+        self.source = source
+        self.target = target
+        self.fmt = fmt
+        self.error = None
+        self.handle = None
+        self.stop_event = threading.Event()
+        
+    def stop(self):
+        """Ask the thread to finish and close its source, waking a read that is waiting for data"""
+        self.stop_event.set()
+        handle = self.handle
+        if handle is not None:
+            try:
+                handle.close()
+            except OSError:
+                pass
+                
+    def open_reader(self):
+        """Return a function that reads the next chunk of bytes (None means no data yet)"""
+        if self.source == 'socket':
+            host, port = self.target.rsplit(':', 1)
+            sock = socket.create_connection((host or 'localhost', int(port)), timeout=5)
+            sock.settimeout(0.2)
+            self.handle = sock
+            
+            def read():
+                try:
+                    return sock.recv(1 << 16)
+                except socket.timeout:
+                    return None
+            return read
+            
+        if self.source == 'pipe':
+            # Non-blocking with a select timeout, so a FIFO without a writer cannot hold the thread
+            stdin = self.target in ('', '-')
+            fd = sys.stdin.fileno() if stdin else os.open(self.target, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+            self.handle = os.fdopen(fd, 'rb', buffering=0, closefd=not stdin)
+            
+            def read():
+                if os.name != 'nt' and not select.select([fd], [], [], 0.2)[0]:
+                    return None
+                try:
+                    chunk = os.read(fd, 1 << 16)
+                except BlockingIOError:
+                    return None
+                if not chunk and not stdin:
+                    # A named pipe reads empty until a writer connects, or after one leaves
+                    time.sleep(0.05)
+                    return None
+                return chunk
+            return read
+            
+        # Tail a growing file from its current end
+        f = open(self.target, 'rb')
+        f.seek(0, os.SEEK_END)
+        self.handle = f
+        
+        def read():
+            chunk = f.read(1 << 16)
+            if not chunk:
+                time.sleep(0.01)
+                return None
+            return chunk
+        return read
+        
+    def parse(self, data):
+        """Split bytes into parsed samples and an incomplete tail"""
+        if self.fmt == 'float32':
+            usable = len(data) - len(data) % 4
+            return np.frombuffer(data[:usable], dtype='<f4'), data[usable:]
+            
+        cut = max(data.rfind(sep) for sep in (b'\n', b' ', b',', b'\t', b'\r'))
+        head, tail = data[:cut + 1], data[cut + 1:]
+        text = head.replace(b',', b' ').decode('ascii', 'ignore')
+        return np.fromstring(text, sep=' '), tail
+        
+    def run(self):
+        try:
+            read = self.open_reader()
+            pending = b''
+            while not self.stop_event.is_set():
+                chunk = read()
+                if chunk is None:
+                    continue
+                if chunk == b'' and self.source != 'file':
+                    break
+                values, pending = self.parse(pending + chunk)
+                self.buffer.extend(values)
+        except Exception as e:
+            if not self.stop_event.is_set():
+                self.error = str(e)
+        finally:
+            if self.handle is not None:
+                try:
+                    self.handle.close()
+                except OSError:
+                    pass
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of evaluated sample arrays
+    
+    Entries are plain .npy files named by the SHA-256 of the canonical
+    expression, variables, ranges, resolution and backend. Writes go to a
+    temporary file and are renamed into place, so several processes can
+    share one directory. Hits refresh the file time, and the least recently
+    used entries are evicted once the directory exceeds max_bytes. CSV
+    imports converted by open_dataset live in the data subfolder and count
+    towards the same budget.
+    """
+    
+    def __init__(self, directory, max_bytes=512 * 1024**2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        
+    def key(self, exprs, variables, ranges, resolution, backend=None):
+        """Build the cache key for one evaluation"""
+        payload = json.dumps({
+            'exprs': [sp.srepr(sp.sympify(e)) for e in exprs],
+            'variables': list(variables),
+            'ranges': [[float(v) for v in r] for r in ranges],
+            'resolution': resolution,
+            'backend': backend or f"numpy {np.__version__}"
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        
+    def path(self, key):
+        """Return the file that holds an entry"""
+        return os.path.join(self.directory, key + ".npy")
+        
+    def load(self, key):
+        """Return the cached array (memory-mapped) or None on a miss"""
+        path = self.path(key)
+        try:
+            array = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        # Refresh the entry for LRU eviction; a read-only cache still serves the hit
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return array
+        
+    def store(self, key, array):
+        """Write an array atomically and evict old entries if over budget"""
+        tmp = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            np.save(tmp, np.ascontiguousarray(array))
+            os.replace(tmp + ".npy", self.path(key))
+            self.stores += 1
+        finally:
+            if os.path.exists(tmp + ".npy"):
+                os.remove(tmp + ".npy")
+        self.evict()
+        
+    def data_directory(self):
+        """Folder holding CSV imports converted to binary"""
+        return os.path.join(self.directory, "data")
+        
+    def entries(self):
+        """List (mtime, size, path) for every cached array and converted import, oldest first"""
+        found = []
+        for folder, suffix in ((self.directory, ".npy"), (self.data_directory(), ".f64")):
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                if entry.name.endswith(suffix) and not entry.name.startswith("."):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, st.st_size, entry.path))
+        return sorted(found)
+        
+    def remove(self, path):
+        """Delete one entry, with the shape file of a converted import; return whether it went"""
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        if path.endswith(".f64") and os.path.exists(path + ".json"):
+            os.remove(path + ".json")
+        return True
+        
+    def evict(self):
+        """Delete least recently used entries until the cache fits"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self.remove(path):
+                self.evictions += 1
+            total -= size
+            
+    def clear(self):
+        """Remove every cached array and converted import"""
+        for _, _, path in self.entries():
+            self.remove(path)
+                
+    def report(self):
+        """Summarize cache usage"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups if lookups else 0.0
+        text = f"Directory: {self.directory}\n"
+        text += f"Entries: {len(entries)}\n"
+        text += f"Size: {total / 1024**2:.1f} / {self.max_bytes / 1024**2:.0f} MB\n"
+        text += f"─" * 30 + "\n"
+        text += f"Hits: {self.hits}\n"
+        text += f"Misses: {self.misses}\n"
+        text += f"Hit ratio: {ratio:.1%}\n"
+        text += f"Stores: {self.stores}\n"
+        text += f"Evictions: {self.evictions}\n"
+        return text
+
+
+class RenderScheduler:
+    """Coalesce redraw requests into at most one render per Tk idle cycle
+    
+    Callers mark the canvas dirty with a full redraw or a blit callback; the
+    requests are flushed together from an idle callback, and a pending full
+    redraw absorbs the queued blits except overlay ones, which are painted
+    on top of it. Frames are spaced by the frame budget or by the cost of
+    the previous frame, whichever is longer, so bursts of events never
+    stack up renders.
+    """
+    
+    def __init__(self, root, canvas, budget=1 / 60):
+        self.root = root
+        self.canvas = canvas
+        self.budget = budget
+        self.full = False
+        self.blits = {}
+        self.overlays = {}
+        self.job = None
+        self.last_frame = 0.0
+        self.last_cost = 0.0
+        self.frame_times = deque(maxlen=200)
+        self.requests = 0
+        self.full_frames = 0
+        self.blit_frames = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.over_budget = 0
+        
+    def request(self, blit=None, key=None, overlay=False):
+        """Queue a full redraw, or a blit callback that replaces any queued under the same key"""
+        self.requests += 1
+        if self.job is not None:
+            self.coalesced += 1
+        if blit is None:
+            self.full = True
+        else:
+            (self.overlays if overlay else self.blits)[blit if key is None else key] = blit
+            
+        if self.job is None:
+            wait = self.last_frame + max(self.budget, self.last_cost) - time.perf_counter()
+            if wait > 0:
+                self.job = self.root.after(int(wait * 1000) + 1, self.flush)
+            else:
+                self.job = self.root.after_idle(self.flush)
+                
+    def flush(self):
+        """Render everything requested since the last frame"""
+        self.job = None
+        start = time.perf_counter()
+        if self.full:
+            self.full = False
+            self.dropped += len(self.blits)
+            self.blits.clear()
+            self.canvas.draw()
+            self.full_frames += 1
+        else:
+            self.blit_frames += 1
+            
+        callbacks = list(self.blits.values()) + list(self.overlays.values())
+        self.blits.clear()
+        self.overlays.clear()
+        for callback in callbacks:
+            callback()
+            
+        self.last_frame = time.perf_counter()
+        self.last_cost = self.last_frame - start
+        self.frame_times.append(self.last_cost)
+        if self.last_cost > self.budget:
+            self.over_budget += 1
+            
+    def report(self):
+        """Summarize scheduling and frame times"""
+        times = np.array(self.frame_times) * 1000
+        text = f"Frame budget: {self.budget*1000:.0f} ms\n"
+        text += f"Requests: {self.requests}\n"
+        text += f"Full frames: {self.full_frames}\n"
+        text += f"Blit frames: {self.blit_frames}\n"
+        text += f"Coalesced: {self.coalesced}\n"
+        text += f"Dropped blits: {self.dropped}\n"
+        text += f"─" * 30 + "\n"
+        if times.size:
+            text += f"Frame time: mean {times.mean():.1f} ms, max {times.max():.1f} ms\n"
+        text += f"Over budget: {self.over_budget}\n"
+        return text
+
 
 class SuperMathGUI:
     def __init__(self, root):
@@ -33,6 +1671,104 @@ class SuperMathGUI:
         self.plot_history = []
         self.current_functions = []
         
+        # Compiled expressions and analysis markers
+        self.compiled_cache = {}
+        self.fused_stats = None
+        self.precision_stats = None
+        self.precision_rates = {}
+        self.precision_fallbacks = 0
+        self.disk_cache = None
+        self.feature_artists = []
+        
+        # Last evaluated surface and parametric samples
+        self.current_surface = None
+        self.current_mesh = None
+        self.surface_colorbar = None
+        self.parametric_data = None
+        self.polar_data = None
+        
+        # Dashboard panels, each with its own axes, artists and input signature
+        self.dashboard_panels = []
+        self.dirty_panels = []
+        
+        # Hover snapping state
+        self.hover_index = None
+        self.hover_tree = None
+        self.hover_artists = []
+        self.hover_background = None
+        self.hover_snap = None
+        self.click_marker_line = None
+        self.pending_click_artists = []
+        
+        # Streaming state
+        self.stream_buffer = None
+        self.stream_reader = None
+        self.stream_line = None
+        self.stream_job = None
+        self.stream_rate = (0, 0.0, 0.0)
+        
+        # Domain coloring state
+        self.complex_func = None
+        self.complex_image = None
+        self.complex_artist = None
+        self.complex_job = None
+        self.complex_generation = 0
+        
+        # Evaluation thread pool, created on first use
+        self.eval_pool = None
+        
+        # Imported datasets and the background import
+        self.datasets = []
+        self.data_thread = None
+        self.data_job = None
+        self.data_result = None
+        self.data_callbacks = None
+        self.data_zoom_job = None
+        
+        # Curve fitting state
+        self.fit_thread = None
+        self.fit_job = None
+        self.fit_result = None
+        self.residual_window = None
+        self.residual_fig = None
+        self.residual_canvas = None
+        
+        # Out-of-core envelope state
+        self.envelope = None
+        self.envelope_thread = None
+        self.envelope_cancel = None
+        self.envelope_job = None
+        self.envelope_error = None
+        self.envelope_started = 0.0
+        self.envelope_artists = []
+        
+        # Riemann sum view and convergence data per (equation, bounds)
+        self.riemann = None
+        self.riemann_job = None
+        self.riemann_cache = {}
+        
+        # Taylor coefficients per (equation, center), kept at the highest order computed
+        self.taylor_cache = {}
+        
+        # Spectrum window, created on first use
+        self.spectrum_window = None
+        self.spectrum_fig = None
+        self.spectrum_canvas = None
+        
+        # Live preview state
+        self.preview_job = None
+        self.preview_generation = 0
+        self.preview_artist = None
+        
+        # 3D parametric state
+        self.param3d_artists = None
+        self.param3d_job = None
+        
+        # Differential equation state
+        self.ode_rhs = None
+        self.ode_lines = None
+        self.ode_seeds = []
+        
         # Color schemes
         self.color_schemes = {
             "Neon Dreams": ['#FF006E', '#FB5607', '#FFBE0B', '#8338EC', '#3A86FF'],
@@ -106,6 +1842,12 @@ class SuperMathGUI:
         self.y_min = tk.DoubleVar(value=-10)
         self.y_max = tk.DoubleVar(value=10)
         self.num_points = tk.IntVar(value=1000)
+        self.live_preview = tk.BooleanVar(value=False)
+        self.fourier_terms = tk.IntVar(value=500)
+        self.show_taylor = tk.BooleanVar(value=False)
+        self.taylor_order = tk.IntVar(value=8)
+        self.riemann_rule = tk.StringVar(value="midpoint")
+        self.riemann_log_n = tk.DoubleVar(value=1)
         
         self.show_grid = tk.BooleanVar(value=True)
         self.show_legend = tk.BooleanVar(value=True)
@@ -117,11 +1859,90 @@ class SuperMathGUI:
         self.show_tangent = tk.BooleanVar(value=False)
         self.show_area = tk.BooleanVar(value=False)
         
+        # Curve analysis variables
+        self.mark_roots = tk.BooleanVar(value=True)
+        self.mark_extrema = tk.BooleanVar(value=True)
+        self.mark_inflections = tk.BooleanVar(value=False)
+        self.mark_intersections = tk.BooleanVar(value=True)
+        
+        # Curve fitting variables
+        self.fit_model = tk.StringVar(value="a*sin(b*x + c)")
+        self.fit_start = tk.StringVar(value="")
+        self.fit_starts = tk.IntVar(value=32)
+        self.fit_loss = tk.StringVar(value="linear")
+        self.fit_max_points = tk.IntVar(value=1000000)
+        
         self.plot_style = tk.StringVar(value="line")
         self.line_width = tk.DoubleVar(value=2.0)
         self.marker_size = tk.DoubleVar(value=5.0)
         self.grid_alpha = tk.DoubleVar(value=0.3)
         
+        # Disk cache variables
+        self.use_disk_cache = tk.BooleanVar(value=os.environ.get('MATHS_DISK_CACHE') == '1')
+        self.cache_dir = tk.StringVar(value=os.environ.get(
+            'MATHS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'maths_visualiser')))
+        self.cache_size_mb = tk.IntVar(value=512)
+        
+        # Out-of-core evaluation variables
+        self.out_of_core_points = tk.IntVar(value=5000000)
+        self.spill_samples = tk.BooleanVar(value=False)
+        self.precision = tk.StringVar(value="float64")
+        
+        # Data import variables
+        self.data_dtype = tk.StringVar(value="float64")
+        self.data_columns = tk.IntVar(value=2)
+        self.data_x_column = tk.IntVar(value=0)
+        self.data_y_column = tk.IntVar(value=1)
+        
+        # Rendering variables
+        self.frame_budget_ms = tk.IntVar(value=16)
+        
+        # Export variables
+        self.rasterize_export = tk.BooleanVar(value=True)
+        self.export_dpi = tk.IntVar(value=200)
+        self.mesh_detail = tk.IntVar(value=100)
+        
+        # Streaming variables
+        self.stream_source = tk.StringVar(value="socket")
+        self.stream_target = tk.StringVar(value="localhost:9999")
+        self.stream_format = tk.StringVar(value="text")
+        self.stream_capacity = tk.IntVar(value=100000)
+        self.stream_interval = tk.IntVar(value=33)
+        
+        # Complex plane variables
+        self.complex_equation = tk.StringVar(value="(z**2 - 1)*(z - 2 - I)**2/(z**2 + 2 + 2*I)")
+        self.complex_resolution = tk.StringVar(value="1920x1080")
+        
+        # Dashboard variables
+        self.dashboard_size = tk.StringVar(value="3x3")
+        
+        # 3D parametric variables
+        self.param3d_kind = tk.StringVar(value="surface")
+        self.param3d_x = tk.StringVar(value="(2 + cos(v))*cos(u)")
+        self.param3d_y = tk.StringVar(value="(2 + cos(v))*sin(u)")
+        self.param3d_z = tk.StringVar(value="sin(v)")
+        self.u_min = tk.DoubleVar(value=0)
+        self.u_max = tk.DoubleVar(value=round(2*np.pi, 4))
+        self.v_min = tk.DoubleVar(value=0)
+        self.v_max = tk.DoubleVar(value=round(2*np.pi, 4))
+        self.param3d_resolution = tk.IntVar(value=400)
+        
+        # Coordinate system variables
+        self.polar_r = tk.StringVar(value="cos(4*theta)")
+        self.cylinder_r = tk.StringVar(value="1 + 0.3*sin(4*theta + 2*z)")
+        self.sphere_r = tk.StringVar(value="abs(3*cos(phi)**2 - 1)")
+        self.theta_min = tk.DoubleVar(value=0)
+        self.theta_max = tk.DoubleVar(value=round(2*np.pi, 4))
+        self.coord_z_min = tk.DoubleVar(value=-2)
+        self.coord_z_max = tk.DoubleVar(value=2)
+        self.coord_resolution = tk.IntVar(value=200)
+        
+        # Differential equation variables
+        self.ode_dx = tk.StringVar(value="1")
+        self.ode_dy = tk.StringVar(value="sin(x) - y/2")
+        self.ode_grid = tk.IntVar(value=12)
+        self.ode_span = tk.DoubleVar(value=10)
+        
         self.plot_mode = tk.StringVar(value="2D")
         self.current_equation = tk.StringVar(value="sin(x) * cos(x/2)")
         
@@ -129,6 +1950,7 @@ class SuperMathGUI:
         self.z_equation = tk.StringVar(value="sin(sqrt(x**2 + y**2))")
         self.elevation = tk.DoubleVar(value=30)
         self.azimuth = tk.DoubleVar(value=45)
+        self.surface_resolution = tk.IntVar(value=100)
         
         # Parametric variables
         self.param_x = tk.StringVar(value="cos(t) * (1 + 0.5*cos(5*t))")
@@ -198,21 +2020,40 @@ class SuperMathGUI:
         notebook.add(anim_tab, text="🎬 Animation")
         self.create_animation_controls(anim_tab)
         
+        # Lab tab for the extra plot modes
+        lab_tab = ttk.Frame(notebook, style='Dark.TFrame')
+        notebook.add(lab_tab, text="🧪 Lab")
+        self.create_lab_controls(self.create_scrollable_frame(lab_tab))
+        
+        # Settings tab
+        settings_tab = ttk.Frame(notebook, style='Dark.TFrame')
+        notebook.add(settings_tab, text="⚙️ Settings")
+        self.create_settings_controls(settings_tab)
+        
     def create_function_controls(self, parent):
         """Create function input controls"""
         # Mode selection
         mode_frame = ttk.LabelFrame(parent, text="Plot Mode", style='Dark.TLabelframe')
         mode_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Radiobutton(mode_frame, text="2D Plot", variable=self.plot_mode,
-                       value="2D", style='Dark.TRadiobutton',
-                       command=self.switch_plot_mode).pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(mode_frame, text="3D Surface", variable=self.plot_mode,
-                       value="3D", style='Dark.TRadiobutton',
-                       command=self.switch_plot_mode).pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(mode_frame, text="Parametric", variable=self.plot_mode,
-                       value="Parametric", style='Dark.TRadiobutton',
-                       command=self.switch_plot_mode).pack(side=tk.LEFT, padx=5)
+        modes = [
+            ("2D Plot", "2D"),
+            ("3D Surface", "3D"),
+            ("Parametric", "Parametric"),
+            ("Stream", "Stream"),
+            ("Complex", "Complex"),
+            ("ODE", "ODE"),
+            ("Param 3D", "Param3D"),
+            ("Dashboard", "Dashboard"),
+            ("Polar", "Polar"),
+            ("Cylindrical", "Cylindrical"),
+            ("Spherical", "Spherical")
+        ]
+        
+        for i, (label, value) in enumerate(modes):
+            ttk.Radiobutton(mode_frame, text=label, variable=self.plot_mode,
+                           value=value, style='Dark.TRadiobutton',
+                           command=self.switch_plot_mode).grid(row=i//3, column=i%3, sticky='w', padx=5)
         
         # Equation input
         eq_frame = ttk.LabelFrame(parent, text="Function Equation", style='Dark.TLabelframe')
@@ -223,6 +2064,10 @@ class SuperMathGUI:
                                     font=('Courier', 11))
         self.equation_text.pack(padx=5, pady=5)
         self.equation_text.insert('1.0', self.current_equation.get())
+        self.equation_text.bind('<KeyRelease>', self.schedule_preview)
+        
+        ttk.Checkbutton(eq_frame, text="⚡ Live preview while typing", variable=self.live_preview,
+                       style='Dark.TCheckbutton').pack(anchor='w', padx=5)
         
         # Quick functions
         quick_frame = ttk.LabelFrame(parent, text="Quick Functions", style='Dark.TLabelframe')
@@ -270,7 +2115,32 @@ class SuperMathGUI:
         ttk.Label(range_frame, text="Points:", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
         points_scale = ttk.Scale(range_frame, from_=100, to=5000, variable=self.num_points,
                                 orient='horizontal', style='Dark.Horizontal.TScale')
-        points_scale.grid(row=2, column=1, columnspan=3, sticky='ew', padx=5)
+        points_scale.grid(row=2, column=1, columnspan=2, sticky='ew', padx=5)
+        ttk.Spinbox(range_frame, from_=100, to=10**12, textvariable=self.num_points,
+                   width=10, increment=1000).grid(row=2, column=3, padx=2)
+        
+        # Data import
+        data_frame = ttk.LabelFrame(parent, text="Data Import", style='Dark.TLabelframe')
+        data_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(data_frame, text="X column:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Spinbox(data_frame, from_=-1, to=63, textvariable=self.data_x_column,
+                   width=5, increment=1).grid(row=0, column=1, padx=2)
+        ttk.Label(data_frame, text="Y column:", style='Dark.TLabel').grid(row=0, column=2, sticky='w', padx=5)
+        ttk.Spinbox(data_frame, from_=0, to=63, textvariable=self.data_y_column,
+                   width=5, increment=1).grid(row=0, column=3, padx=2)
+        
+        ttk.Label(data_frame, text="Binary:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Combobox(data_frame, textvariable=self.data_dtype, values=list(DATA_DTYPES),
+                    state='readonly', width=8, style='Dark.TCombobox').grid(row=1, column=1, padx=2, pady=2)
+        ttk.Label(data_frame, text="Columns:", style='Dark.TLabel').grid(row=1, column=2, sticky='w', padx=5)
+        ttk.Spinbox(data_frame, from_=1, to=64, textvariable=self.data_columns,
+                   width=5, increment=1).grid(row=1, column=3, padx=2)
+        
+        ttk.Button(data_frame, text="📂 Import Data", command=self.import_data,
+                  style='Dark.TButton').grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        ttk.Button(data_frame, text="🗑️ Remove Data", command=self.remove_data,
+                  style='Dark.TButton').grid(row=2, column=2, columnspan=2, padx=5, pady=5, sticky='ew')
         
         # Action buttons
         btn_frame = ttk.Frame(parent, style='Dark.TFrame')
@@ -289,11 +2159,11 @@ class SuperMathGUI:
         color_frame = ttk.LabelFrame(parent, text="Color Schemes", style='Dark.TLabelframe')
         color_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        scheme_combo = ttk.Combobox(color_frame, values=list(self.color_schemes.keys()),
-                                   state='readonly', style='Dark.TCombobox')
-        scheme_combo.set(self.current_scheme)
-        scheme_combo.pack(padx=5, pady=5, fill=tk.X)
-        scheme_combo.bind('<<ComboboxSelected>>', self.change_color_scheme)
+        self.scheme_combo = ttk.Combobox(color_frame, values=list(self.color_schemes.keys()),
+                                        state='readonly', style='Dark.TCombobox')
+        self.scheme_combo.set(self.current_scheme)
+        self.scheme_combo.pack(padx=5, pady=5, fill=tk.X)
+        self.scheme_combo.bind('<<ComboboxSelected>>', self.change_color_scheme)
         
         # Line style
         line_frame = ttk.LabelFrame(parent, text="Line Style", style='Dark.TLabelframe')
@@ -365,6 +2235,18 @@ class SuperMathGUI:
                                  orient='horizontal', style='Dark.Horizontal.TScale')
         tangent_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
+        # Taylor polynomials about the tangent point
+        taylor_frame = ttk.LabelFrame(parent, text="Taylor Polynomials", style='Dark.TLabelframe')
+        taylor_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Checkbutton(taylor_frame, text="Show Taylor polynomials at tangent point", variable=self.show_taylor,
+                       style='Dark.TCheckbutton').grid(row=0, column=0, columnspan=2, sticky='w', padx=5)
+        ttk.Label(taylor_frame, text="Max order:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Spinbox(taylor_frame, from_=1, to=100, textvariable=self.taylor_order,
+                   width=8).grid(row=1, column=1, sticky='w', padx=5, pady=2)
+        ttk.Button(taylor_frame, text="🎞️ Animate Orders", command=self.start_taylor_animation,
+                  style='Dark.TButton').grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
         # Integration bounds
         int_frame = ttk.LabelFrame(parent, text="Integration Bounds", style='Dark.TLabelframe')
         int_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -386,6 +2268,66 @@ class SuperMathGUI:
         ttk.Button(int_frame, text="Calculate Area", command=self.calculate_area,
                   style='Dark.TButton').grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
         
+        # Riemann sums over the integration bounds
+        riemann_frame = ttk.LabelFrame(parent, text="Riemann Sums", style='Dark.TLabelframe')
+        riemann_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(riemann_frame, text="Rule:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        rule_combo = ttk.Combobox(riemann_frame, textvariable=self.riemann_rule, values=RIEMANN_RULES,
+                                  state='readonly', style='Dark.TCombobox', width=12)
+        rule_combo.grid(row=0, column=1, sticky='w', padx=5, pady=2)
+        rule_combo.bind('<<ComboboxSelected>>', self.schedule_riemann_update)
+        
+        self.riemann_n_label = ttk.Label(riemann_frame, text="n = 10", style='Dark.TLabel')
+        self.riemann_n_label.grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Scale(riemann_frame, from_=0, to=5, variable=self.riemann_log_n, orient='horizontal',
+                 style='Dark.Horizontal.TScale',
+                 command=self.schedule_riemann_update).grid(row=1, column=1, sticky='ew', padx=5)
+        
+        ttk.Button(riemann_frame, text="📐 Show Riemann Sum", command=self.plot_riemann,
+                  style='Dark.TButton').grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+        # Curve analysis
+        analysis_frame = ttk.LabelFrame(parent, text="Curve Analysis", style='Dark.TLabelframe')
+        analysis_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Checkbutton(analysis_frame, text="Roots", variable=self.mark_roots,
+                       style='Dark.TCheckbutton').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Checkbutton(analysis_frame, text="Extrema", variable=self.mark_extrema,
+                       style='Dark.TCheckbutton').grid(row=0, column=1, sticky='w', padx=5)
+        ttk.Checkbutton(analysis_frame, text="Inflections", variable=self.mark_inflections,
+                       style='Dark.TCheckbutton').grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Checkbutton(analysis_frame, text="Intersections", variable=self.mark_intersections,
+                       style='Dark.TCheckbutton').grid(row=1, column=1, sticky='w', padx=5)
+        ttk.Button(analysis_frame, text="🔍 Find Points", command=self.find_curve_features,
+                  style='Dark.TButton').grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        ttk.Button(analysis_frame, text="📶 Spectrum (FFT)", command=self.show_spectrum,
+                  style='Dark.TButton').grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+        # Curve fitting
+        fit_frame = ttk.LabelFrame(parent, text="Curve Fitting", style='Dark.TLabelframe')
+        fit_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(fit_frame, text="Model:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        tk.Entry(fit_frame, textvariable=self.fit_model, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=24).grid(row=0, column=1, columnspan=3, padx=5, pady=2)
+        
+        ttk.Label(fit_frame, text="Start:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        tk.Entry(fit_frame, textvariable=self.fit_start, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=24).grid(row=1, column=1, columnspan=3, padx=5, pady=2)
+        
+        ttk.Label(fit_frame, text="Starts:", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Spinbox(fit_frame, from_=1, to=256, textvariable=self.fit_starts,
+                   width=5, increment=1).grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        ttk.Label(fit_frame, text="Loss:", style='Dark.TLabel').grid(row=2, column=2, sticky='w', padx=5)
+        ttk.Combobox(fit_frame, textvariable=self.fit_loss, values=FIT_LOSSES,
+                    state='readonly', width=8, style='Dark.TCombobox').grid(row=2, column=3, sticky='w', padx=5, pady=2)
+        
+        ttk.Button(fit_frame, text="📈 Fit", command=self.fit_curve,
+                  style='Dark.TButton').grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        ttk.Button(fit_frame, text="📉 Residuals", command=self.show_residuals,
+                  style='Dark.TButton').grid(row=3, column=2, columnspan=2, padx=5, pady=5, sticky='ew')
+        
         # Results display
         results_frame = ttk.LabelFrame(parent, text="Results", style='Dark.TLabelframe')
         results_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -405,6 +2347,10 @@ class SuperMathGUI:
                              font=('Courier', 11))
         self.z_text.pack(padx=5, pady=5)
         self.z_text.insert('1.0', self.z_equation.get())
+        self.z_text.bind('<KeyRelease>', self.schedule_preview)
+        
+        ttk.Checkbutton(eq_frame, text="⚡ Live preview while typing", variable=self.live_preview,
+                       style='Dark.TCheckbutton').pack(anchor='w', padx=5)
         
         # Quick 3D functions
         quick_3d = ttk.LabelFrame(parent, text="Quick 3D Functions", style='Dark.TLabelframe')
@@ -449,6 +2395,13 @@ class SuperMathGUI:
                        value="wireframe", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
         ttk.Radiobutton(style_3d, text="Contour", variable=self.surface_type,
                        value="contour", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
+                       
+        # Mesh size per axis; large meshes are evaluated in chunks across the thread pool
+        resolution_frame = ttk.Frame(style_3d, style='Dark.TFrame')
+        resolution_frame.pack(fill=tk.X, padx=5, pady=2)
+        ttk.Label(resolution_frame, text="Resolution:", style='Dark.TLabel').pack(side=tk.LEFT)
+        ttk.Spinbox(resolution_frame, from_=10, to=10000, textvariable=self.surface_resolution,
+                   width=10, increment=100).pack(side=tk.LEFT, padx=5)
         
     def create_parametric_controls(self, parent):
         """Create parametric plot controls"""
@@ -467,6 +2420,11 @@ class SuperMathGUI:
                                       bg='#16213e', fg='white', insertbackground='white',
                                       font=('Courier', 10), width=30)
         self.y_param_entry.grid(row=1, column=1, padx=5, pady=2)
+        self.x_param_entry.bind('<KeyRelease>', self.schedule_preview)
+        self.y_param_entry.bind('<KeyRelease>', self.schedule_preview)
+        
+        ttk.Checkbutton(param_frame, text="⚡ Live preview while typing", variable=self.live_preview,
+                       style='Dark.TCheckbutton').grid(row=2, column=0, columnspan=2, sticky='w', padx=5)
         
         # Parameter range
         t_frame = ttk.LabelFrame(parent, text="Parameter t Range", style='Dark.TLabelframe')
@@ -529,6 +2487,16 @@ class SuperMathGUI:
                        value="growing", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
         ttk.Radiobutton(type_frame, text="Rotating 3D", variable=self.anim_type,
                        value="rotate3d", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
+        ttk.Radiobutton(type_frame, text="Fourier Series", variable=self.anim_type,
+                       value="fourier", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
+        ttk.Radiobutton(type_frame, text="Taylor Series", variable=self.anim_type,
+                       value="taylor", style='Dark.TRadiobutton').pack(anchor='w', padx=5)
+        
+        fourier_row = ttk.Frame(type_frame, style='Dark.TFrame')
+        fourier_row.pack(anchor='w', padx=20, pady=2)
+        ttk.Label(fourier_row, text="Harmonics:", style='Dark.TLabel').pack(side=tk.LEFT)
+        ttk.Spinbox(fourier_row, from_=1, to=2000, textvariable=self.fourier_terms,
+                   width=8, increment=50).pack(side=tk.LEFT, padx=5)
         
         # Control buttons
         btn_frame = ttk.Frame(parent, style='Dark.TFrame')
@@ -548,10 +2516,319 @@ class SuperMathGUI:
         
         ttk.Button(export_frame, text="💾 Save Plot", command=self.save_plot,
                   style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(export_frame, text="🗂️ Export PNG+SVG+PDF", command=self.save_plot_formats,
+                  style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
         ttk.Button(export_frame, text="📊 Export Data", command=self.export_data,
                   style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(export_frame, text="🧊 Export Mesh", command=self.export_mesh,
+                  style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
         ttk.Button(export_frame, text="🎥 Save Animation", command=self.save_animation,
                   style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(export_frame, text="📁 Save Workspace", command=self.save_workspace,
+                  style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(export_frame, text="📂 Load Workspace", command=self.load_workspace,
+                  style='Dark.TButton').pack(fill=tk.X, padx=5, pady=2)
+        
+    def create_scrollable_frame(self, parent):
+        """Create a vertically scrolling frame inside a tab"""
+        canvas = tk.Canvas(parent, bg='#1a1a2e', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=canvas.yview)
+        inner = ttk.Frame(canvas, style='Dark.TFrame')
+        
+        inner.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
+        window = canvas.create_window((0, 0), window=inner, anchor='nw')
+        canvas.bind('<Configure>', lambda e: canvas.itemconfigure(window, width=e.width))
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        return inner
+        
+    def create_lab_controls(self, parent):
+        """Create controls for the extra plot modes"""
+        self.create_stream_controls(parent)
+        self.create_complex_controls(parent)
+        self.create_ode_controls(parent)
+        self.create_param3d_controls(parent)
+        self.create_coordinate_controls(parent)
+        self.create_dashboard_controls(parent)
+        
+    def create_stream_controls(self, parent):
+        """Create live data stream controls"""
+        stream_frame = ttk.LabelFrame(parent, text="Live Data Stream", style='Dark.TLabelframe')
+        stream_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(stream_frame, text="Source:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Combobox(stream_frame, textvariable=self.stream_source, values=['socket', 'pipe', 'file'],
+                    state='readonly', style='Dark.TCombobox', width=12).grid(row=0, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(stream_frame, text="Address:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        tk.Entry(stream_frame, textvariable=self.stream_target, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=24).grid(row=1, column=1, padx=5, pady=2)
+        
+        ttk.Label(stream_frame, text="Format:", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Combobox(stream_frame, textvariable=self.stream_format, values=['text', 'float32'],
+                    state='readonly', style='Dark.TCombobox', width=12).grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(stream_frame, text="Buffer:", style='Dark.TLabel').grid(row=3, column=0, sticky='w', padx=5)
+        ttk.Spinbox(stream_frame, from_=1000, to=10000000, textvariable=self.stream_capacity,
+                   width=10, increment=10000).grid(row=3, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(stream_frame, text="Redraw (ms):", style='Dark.TLabel').grid(row=4, column=0, sticky='w', padx=5)
+        ttk.Spinbox(stream_frame, from_=10, to=1000, textvariable=self.stream_interval,
+                   width=10, increment=5).grid(row=4, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Button(stream_frame, text="▶️ Start", command=self.start_stream,
+                  style='Accent.TButton').grid(row=5, column=0, padx=5, pady=5, sticky='ew')
+        ttk.Button(stream_frame, text="⏹️ Stop", command=self.stop_stream,
+                  style='Dark.TButton').grid(row=5, column=1, padx=5, pady=5, sticky='ew')
+        
+        self.stream_status = ttk.Label(stream_frame, text="Idle", style='Dark.TLabel')
+        self.stream_status.grid(row=6, column=0, columnspan=2, sticky='w', padx=5, pady=2)
+        
+    def create_complex_controls(self, parent):
+        """Create complex domain coloring controls"""
+        complex_frame = ttk.LabelFrame(parent, text="Complex Domain Coloring", style='Dark.TLabelframe')
+        complex_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(complex_frame, text="f(z) =", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        tk.Entry(complex_frame, textvariable=self.complex_equation, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=28).grid(row=0, column=1, padx=5, pady=2)
+        
+        ttk.Label(complex_frame, text="Resolution:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Combobox(complex_frame, textvariable=self.complex_resolution,
+                    values=['Window', '1280x720', '1920x1080', '3840x2160'],
+                    state='readonly', style='Dark.TCombobox', width=12).grid(row=1, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(complex_frame, text="Re(z) uses the X range, Im(z) the Y range",
+                 style='Dark.TLabel', font=('Arial', 9)).grid(row=2, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Button(complex_frame, text="🌈 Render", command=self.plot_complex,
+                  style='Accent.TButton').grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+    def create_ode_controls(self, parent):
+        """Create slope field and trajectory controls"""
+        ode_frame = ttk.LabelFrame(parent, text="Differential Equations", style='Dark.TLabelframe')
+        ode_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(ode_frame, text="dx/dt =", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        tk.Entry(ode_frame, textvariable=self.ode_dx, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=24).grid(row=0, column=1, padx=5, pady=2)
+        
+        ttk.Label(ode_frame, text="dy/dt =", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        tk.Entry(ode_frame, textvariable=self.ode_dy, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 10), width=24).grid(row=1, column=1, padx=5, pady=2)
+        
+        ttk.Label(ode_frame, text="Seeds per axis:", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Spinbox(ode_frame, from_=0, to=40, textvariable=self.ode_grid,
+                   width=10).grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(ode_frame, text="Time span:", style='Dark.TLabel').grid(row=3, column=0, sticky='w', padx=5)
+        ttk.Spinbox(ode_frame, from_=0.5, to=100, textvariable=self.ode_span,
+                   width=10, increment=0.5).grid(row=3, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(ode_frame, text="dx/dt = 1 gives dy/dx = f(x, y); click to add trajectories",
+                 style='Dark.TLabel', font=('Arial', 9)).grid(row=4, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Button(ode_frame, text="🌀 Integrate", command=self.plot_ode,
+                  style='Accent.TButton').grid(row=5, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+    def create_param3d_controls(self, parent):
+        """Create 3D parametric curve and surface controls"""
+        param_frame = ttk.LabelFrame(parent, text="3D Parametric", style='Dark.TLabelframe')
+        param_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Radiobutton(param_frame, text="Curve (t)", variable=self.param3d_kind, value="curve",
+                       style='Dark.TRadiobutton').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Radiobutton(param_frame, text="Surface (u, v)", variable=self.param3d_kind, value="surface",
+                       style='Dark.TRadiobutton').grid(row=0, column=1, sticky='w', padx=5)
+        
+        for row, (label, var) in enumerate([("x =", self.param3d_x), ("y =", self.param3d_y),
+                                            ("z =", self.param3d_z)], start=1):
+            ttk.Label(param_frame, text=label, style='Dark.TLabel').grid(row=row, column=0, sticky='w', padx=5)
+            tk.Entry(param_frame, textvariable=var, bg='#16213e', fg='white',
+                    insertbackground='white', font=('Courier', 10), width=24).grid(row=row, column=1, padx=5, pady=2)
+            
+        ttk.Label(param_frame, text="t or u min/max:", style='Dark.TLabel').grid(row=4, column=0, sticky='w', padx=5)
+        u_frame = ttk.Frame(param_frame, style='Dark.TFrame')
+        u_frame.grid(row=4, column=1, sticky='w', padx=5, pady=2)
+        ttk.Spinbox(u_frame, from_=-100, to=100, textvariable=self.u_min, width=8, increment=0.5).pack(side=tk.LEFT)
+        ttk.Spinbox(u_frame, from_=-100, to=100, textvariable=self.u_max, width=8, increment=0.5).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Label(param_frame, text="v min/max:", style='Dark.TLabel').grid(row=5, column=0, sticky='w', padx=5)
+        v_frame = ttk.Frame(param_frame, style='Dark.TFrame')
+        v_frame.grid(row=5, column=1, sticky='w', padx=5, pady=2)
+        ttk.Spinbox(v_frame, from_=-100, to=100, textvariable=self.v_min, width=8, increment=0.5).pack(side=tk.LEFT)
+        ttk.Spinbox(v_frame, from_=-100, to=100, textvariable=self.v_max, width=8, increment=0.5).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Label(param_frame, text="Resolution:", style='Dark.TLabel').grid(row=6, column=0, sticky='w', padx=5)
+        ttk.Spinbox(param_frame, from_=10, to=1000, textvariable=self.param3d_resolution,
+                   width=10, increment=50).grid(row=6, column=1, sticky='w', padx=5, pady=2)
+        
+        # Presets
+        shapes = [
+            ("Helix", "curve", "cos(t)", "sin(t)", "t/5", (0, 8*np.pi), (0, 1)),
+            ("Trefoil", "curve", "sin(t) + 2*sin(2*t)", "cos(t) - 2*cos(2*t)", "-sin(3*t)", (0, 2*np.pi), (0, 1)),
+            ("Torus", "surface", "(2 + cos(v))*cos(u)", "(2 + cos(v))*sin(u)", "sin(v)",
+             (0, 2*np.pi), (0, 2*np.pi)),
+            ("Möbius", "surface", "(1 + v/2*cos(u/2))*cos(u)", "(1 + v/2*cos(u/2))*sin(u)", "v/2*sin(u/2)",
+             (0, 2*np.pi), (-1, 1)),
+            ("Sphere", "surface", "cos(u)*sin(v)", "sin(u)*sin(v)", "cos(v)", (0, 2*np.pi), (0, np.pi)),
+            ("Seashell", "surface", "(1 - v/(2*pi))*(1 + cos(u))*cos(2*v)", "(1 - v/(2*pi))*(1 + cos(u))*sin(2*v)",
+             "v/pi + (1 - v/(2*pi))*sin(u)", (0, 2*np.pi), (0, 2*np.pi))
+        ]
+        
+        shapes_frame = ttk.Frame(param_frame, style='Dark.TFrame')
+        shapes_frame.grid(row=7, column=0, columnspan=2, sticky='ew', padx=5, pady=2)
+        for i, shape in enumerate(shapes):
+            ttk.Button(shapes_frame, text=shape[0], style='Dark.TButton',
+                      command=lambda s=shape: self.set_param3d_shape(s)).grid(row=i//3, column=i%3,
+                                                                              padx=2, pady=2, sticky='ew')
+            
+        ttk.Button(param_frame, text="🌀 Plot 3D", command=self.plot_param3d,
+                  style='Accent.TButton').grid(row=8, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+    def create_coordinate_controls(self, parent):
+        """Create polar, cylindrical and spherical coordinate controls"""
+        coord_frame = ttk.LabelFrame(parent, text="Coordinate Systems", style='Dark.TLabelframe')
+        coord_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        for row, (label, var) in enumerate([("r(θ) =", self.polar_r), ("r(θ, z) =", self.cylinder_r),
+                                            ("r(θ, φ) =", self.sphere_r)]):
+            ttk.Label(coord_frame, text=label, style='Dark.TLabel').grid(row=row, column=0, sticky='w', padx=5)
+            tk.Entry(coord_frame, textvariable=var, bg='#16213e', fg='white',
+                    insertbackground='white', font=('Courier', 10), width=24).grid(row=row, column=1, padx=5, pady=2)
+            
+        for row, (label, low, high) in enumerate([("θ min/max:", self.theta_min, self.theta_max),
+                                                  ("z min/max:", self.coord_z_min, self.coord_z_max)], start=3):
+            ttk.Label(coord_frame, text=label, style='Dark.TLabel').grid(row=row, column=0, sticky='w', padx=5)
+            range_frame = ttk.Frame(coord_frame, style='Dark.TFrame')
+            range_frame.grid(row=row, column=1, sticky='w', padx=5, pady=2)
+            ttk.Spinbox(range_frame, from_=-100, to=100, textvariable=low, width=8, increment=0.5).pack(side=tk.LEFT)
+            ttk.Spinbox(range_frame, from_=-100, to=100, textvariable=high, width=8, increment=0.5).pack(side=tk.LEFT, padx=2)
+            
+        ttk.Label(coord_frame, text="Surface resolution:", style='Dark.TLabel').grid(row=5, column=0, sticky='w', padx=5)
+        ttk.Spinbox(coord_frame, from_=10, to=1000, textvariable=self.coord_resolution,
+                   width=10, increment=50).grid(row=5, column=1, sticky='w', padx=5, pady=2)
+        
+        # Presets: (name, system, r, theta range, z range)
+        presets = [
+            ("Rose", "Polar", "cos(4*theta)", (0, 2*np.pi), None),
+            ("Cardioid", "Polar", "1 + cos(theta)", (0, 2*np.pi), None),
+            ("Butterfly", "Polar", "exp(sin(theta)) - 2*cos(4*theta) + sin((2*theta - pi)/24)**5",
+             (0, 24*np.pi), None),
+            ("Vase", "Cylindrical", "1 + 0.4*sin(2*z)", (0, 2*np.pi), (-2, 2)),
+            ("Twist", "Cylindrical", "1 + 0.3*sin(4*theta + 2*z)", (0, 2*np.pi), (-2, 2)),
+            ("Y₂⁰", "Spherical", "abs(3*cos(phi)**2 - 1)", (0, 2*np.pi), None),
+            ("Y₃²", "Spherical", "abs(sin(phi)**2*cos(phi)*cos(2*theta))", (0, 2*np.pi), None),
+            ("Bumpy", "Spherical", "1 + 0.2*sin(6*theta)*sin(5*phi)", (0, 2*np.pi), None)
+        ]
+        
+        presets_frame = ttk.Frame(coord_frame, style='Dark.TFrame')
+        presets_frame.grid(row=6, column=0, columnspan=2, sticky='ew', padx=5, pady=2)
+        for i, preset in enumerate(presets):
+            ttk.Button(presets_frame, text=preset[0], style='Dark.TButton',
+                      command=lambda p=preset: self.set_coordinate_preset(p)).grid(row=i//3, column=i%3,
+                                                                                   padx=2, pady=2, sticky='ew')
+            
+        buttons_frame = ttk.Frame(coord_frame, style='Dark.TFrame')
+        buttons_frame.grid(row=7, column=0, columnspan=2, sticky='ew', padx=5, pady=5)
+        for i, system in enumerate(COORDINATE_SYSTEMS):
+            ttk.Button(buttons_frame, text=system, style='Accent.TButton',
+                      command=lambda s=system: self.plot_coordinates(s)).grid(row=0, column=i, padx=2, sticky='ew')
+            
+    def create_dashboard_controls(self, parent):
+        """Create multi-panel dashboard controls"""
+        dash_frame = ttk.LabelFrame(parent, text="Dashboard", style='Dark.TLabelframe')
+        dash_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(dash_frame, text="Layout:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Combobox(dash_frame, textvariable=self.dashboard_size, values=list(DASHBOARD_LAYOUTS),
+                    state='readonly', style='Dark.TCombobox', width=8).grid(row=0, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(dash_frame, text="Panels follow the 2D, 3D and Parametric equations",
+                 style='Dark.TLabel', font=('Arial', 9)).grid(row=1, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Button(dash_frame, text="🧩 Build", command=self.build_dashboard,
+                  style='Accent.TButton').grid(row=2, column=0, padx=5, pady=5, sticky='ew')
+        ttk.Button(dash_frame, text="🔄 Update", command=self.update_dashboard,
+                  style='Dark.TButton').grid(row=2, column=1, padx=5, pady=5, sticky='ew')
+        
+    def create_settings_controls(self, parent):
+        """Create performance and cache settings"""
+        # Disk cache
+        cache_frame = ttk.LabelFrame(parent, text="Disk Cache", style='Dark.TLabelframe')
+        cache_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Checkbutton(cache_frame, text="Cache evaluated results on disk", variable=self.use_disk_cache,
+                       style='Dark.TCheckbutton').grid(row=0, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Label(cache_frame, text="Folder:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        tk.Entry(cache_frame, textvariable=self.cache_dir, bg='#16213e', fg='white',
+                insertbackground='white', font=('Courier', 9), width=28).grid(row=1, column=1, padx=5, pady=2)
+        
+        ttk.Label(cache_frame, text="Limit (MB):", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Spinbox(cache_frame, from_=16, to=65536, textvariable=self.cache_size_mb,
+                   width=10, increment=64).grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Button(cache_frame, text="📋 Cache Report", command=self.show_cache_report,
+                  style='Dark.TButton').grid(row=3, column=0, padx=5, pady=5, sticky='ew')
+        ttk.Button(cache_frame, text="🧹 Clear Cache", command=self.clear_disk_cache,
+                  style='Dark.TButton').grid(row=3, column=1, padx=5, pady=5, sticky='ew')
+        
+        # Out-of-core evaluation
+        large_frame = ttk.LabelFrame(parent, text="Large Evaluations", style='Dark.TLabelframe')
+        large_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(large_frame, text="Out-of-core above:", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Spinbox(large_frame, from_=10000, to=10**9, textvariable=self.out_of_core_points,
+                   width=12, increment=1000000).grid(row=0, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Checkbutton(large_frame, text="Spill samples to a memory-mapped .npy file",
+                       variable=self.spill_samples,
+                       style='Dark.TCheckbutton').grid(row=1, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Label(large_frame, text="Precision:", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Combobox(large_frame, textvariable=self.precision, values=list(PRECISIONS),
+                    state='readonly', width=10, style='Dark.TCombobox').grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Button(large_frame, text="📋 Precision Report", command=self.show_precision_report,
+                  style='Dark.TButton').grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+        # Plot export
+        export_frame = ttk.LabelFrame(parent, text="Plot Export", style='Dark.TLabelframe')
+        export_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Checkbutton(export_frame, text="Rasterize surfaces, dense collections and fills",
+                       variable=self.rasterize_export,
+                       style='Dark.TCheckbutton').grid(row=0, column=0, columnspan=2, sticky='w', padx=5)
+        
+        ttk.Label(export_frame, text="Raster DPI:", style='Dark.TLabel').grid(row=1, column=0, sticky='w', padx=5)
+        ttk.Combobox(export_frame, textvariable=self.export_dpi, values=[100, 150, 200, 300, 600],
+                    width=8, style='Dark.TCombobox').grid(row=1, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Label(export_frame, text="Mesh detail (%):", style='Dark.TLabel').grid(row=2, column=0, sticky='w', padx=5)
+        ttk.Spinbox(export_frame, from_=1, to=100, textvariable=self.mesh_detail,
+                   width=8, increment=5).grid(row=2, column=1, sticky='w', padx=5, pady=2)
+        
+        # Render scheduling
+        render_frame = ttk.LabelFrame(parent, text="Rendering", style='Dark.TLabelframe')
+        render_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(render_frame, text="Frame budget (ms):", style='Dark.TLabel').grid(row=0, column=0, sticky='w', padx=5)
+        ttk.Spinbox(render_frame, from_=1, to=1000, textvariable=self.frame_budget_ms,
+                   width=8, increment=4).grid(row=0, column=1, sticky='w', padx=5, pady=2)
+        
+        ttk.Button(render_frame, text="📋 Render Report", command=self.show_render_report,
+                  style='Dark.TButton').grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky='ew')
+        
+        # Report display
+        report_frame = ttk.LabelFrame(parent, text="Report", style='Dark.TLabelframe')
+        report_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.settings_text = tk.Text(report_frame, height=8, bg='#16213e', fg='white',
+                                    font=('Courier', 10))
+        self.settings_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
     def create_plot_area(self, parent):
         """Create the plot area with toolbar"""
@@ -572,6 +2849,7 @@ class SuperMathGUI:
         # Create canvas
         self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
         self.canvas.draw()
+        self.render_scheduler = RenderScheduler(self.root, self.canvas)
         
         # Create toolbar frame
         toolbar_frame = ttk.Frame(parent, style='Dark.TFrame')
@@ -586,17 +2864,22 @@ class SuperMathGUI:
         
         # Bind events for interactivity
         self.canvas.mpl_connect('button_press_event', self.on_click)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
         self.canvas.mpl_connect('motion_notify_event', self.on_hover)
+        self.canvas.mpl_connect('axes_leave_event', self.on_hover)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         
     def set_equation(self, equation):
         """Set the equation in the text widget"""
         self.equation_text.delete('1.0', tk.END)
         self.equation_text.insert('1.0', equation)
+        self.schedule_preview()
         
     def set_3d_equation(self, equation):
         """Set the 3D equation"""
         self.z_text.delete('1.0', tk.END)
         self.z_text.insert('1.0', equation)
+        self.schedule_preview()
         
     def set_parametric_curve(self, curve):
         """Set parametric curve"""
@@ -605,19 +2888,66 @@ class SuperMathGUI:
         self.param_y.set(y_eq)
         self.t_min.set(t_min)
         self.t_max.set(t_max)
+        self.schedule_preview()
+        
+    def set_param3d_shape(self, shape):
+        """Set a preset 3D parametric curve or surface"""
+        _, kind, x_eq, y_eq, z_eq, (u_min, u_max), (v_min, v_max) = shape
+        self.param3d_kind.set(kind)
+        self.param3d_x.set(x_eq)
+        self.param3d_y.set(y_eq)
+        self.param3d_z.set(z_eq)
+        self.u_min.set(round(u_min, 4))
+        self.u_max.set(round(u_max, 4))
+        self.v_min.set(round(v_min, 4))
+        self.v_max.set(round(v_max, 4))
+        
+    def set_coordinate_preset(self, preset):
+        """Set a preset polar, cylindrical or spherical radius"""
+        _, system, r, (theta_min, theta_max), z_range = preset
+        {"Polar": self.polar_r, "Cylindrical": self.cylinder_r, "Spherical": self.sphere_r}[system].set(r)
+        self.theta_min.set(round(theta_min, 4))
+        self.theta_max.set(round(theta_max, 4))
+        if z_range is not None:
+            self.coord_z_min.set(z_range[0])
+            self.coord_z_max.set(z_range[1])
+            
+    def is_3d_mode(self):
+        """Whether the current plot mode draws on 3D axes"""
+        return self.plot_mode.get() in ("3D", "Param3D", "Cylindrical", "Spherical")
         
     def switch_plot_mode(self):
         """Switch between 2D, 3D, and parametric modes"""
         mode = self.plot_mode.get()
+        if mode != "Stream":
+            self.stop_stream()
+        self.cancel_complex_render()
+        self.cancel_param3d_refine()
         self.clear_plot()
         
-        if mode == "3D":
+        # Start from an empty figure so old axes and colorbars do not pile up
+        self.fig.clear()
+        self.surface_colorbar = None
+        self.dashboard_panels = []
+        if mode == "Dashboard":
+            self.build_dashboard()
+            return
+        if self.is_3d_mode():
             self.ax = self.fig.add_subplot(111, projection='3d')
         else:
             self.ax = self.fig.add_subplot(111)
         
-        self.ax.set_facecolor('#16213e' if self.dark_mode.get() else 'white')
-        self.canvas.draw()
+        self.ax.set_facecolor(self.theme_color("axes"))
+        self.request_render()
+        
+    def enter_plot_mode(self, mode):
+        """Switch to mode if needed, keeping the 2D curves and datasets that the switch would clear"""
+        if self.plot_mode.get() == mode:
+            return
+        functions, datasets = self.current_functions, self.datasets
+        self.plot_mode.set(mode)
+        self.switch_plot_mode()
+        self.current_functions, self.datasets = functions, datasets
         
     def plot_function(self):
         """Main plotting function"""
@@ -630,6 +2960,18 @@ class SuperMathGUI:
                 self.plot_3d()
             elif mode == "Parametric":
                 self.plot_parametric()
+            elif mode == "Stream":
+                self.start_stream()
+            elif mode == "Complex":
+                self.plot_complex()
+            elif mode == "ODE":
+                self.plot_ode()
+            elif mode == "Param3D":
+                self.plot_param3d()
+            elif mode == "Dashboard":
+                self.update_dashboard()
+            elif mode in COORDINATE_SYSTEMS:
+                self.plot_coordinates(mode)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Plotting error: {str(e)}")
@@ -641,39 +2983,50 @@ class SuperMathGUI:
         if not equation:
             return
             
-        # Generate data
-        x = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
-        
         try:
-            # Parse and evaluate equation
+            # Parse equation
             x_sym = sp.symbols('x')
             expr = sp.sympify(equation)
             func = sp.lambdify(x_sym, expr, modules=['numpy'])
-            y = func(x)
+            
+            # Too many samples to hold in memory: stream them into pixel statistics
+            self.cancel_envelope()
+            if self.num_points.get() > self.out_of_core_points.get():
+                self.start_envelope(equation, func)
+                return
+                
+            # Generate data and evaluate
+            x = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
+            y = self.cached_evaluate([equation], ['x'], [(x[0], x[-1])], len(x),
+                                     lambda: self.evaluate_precision(f"y = {equation}", func, [x], x.shape))
+            x = x.astype(y.dtype, copy=False)
             
             # Clear and setup axes
             self.ax.clear()
             
-            # Get color from scheme
+            # Get color from scheme; the cleared axes start a new list of plotted curves
             colors = self.color_schemes[self.current_scheme]
             color = colors[len(self.current_functions) % len(colors)]
+            self.current_functions = []
             
             # Plot based on style
             style = self.plot_style.get()
             if style == 'line':
-                self.ax.plot(x, y, color=color, linewidth=self.line_width.get(),
+                self.ax.plot(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get(),
                            label=f"y = {equation}")
             elif style == 'scatter':
-                self.ax.scatter(x[::10], y[::10], color=color, s=self.marker_size.get()**2,
+                self.ax.scatter(x[::10], y[::10], color=color, gid=SCHEME_GID, s=self.marker_size.get()**2,
                               label=f"y = {equation}", alpha=0.6)
             elif style == 'stem':
-                self.ax.stem(x[::20], y[::20], linefmt=color, markerfmt=f'{color}o',
-                           label=f"y = {equation}")
+                stem = self.ax.stem(x[::20], y[::20], linefmt=color, markerfmt=f'{color}o',
+                                    label=f"y = {equation}")
+                stem.markerline.set_gid(SCHEME_GID)
+                stem.stemlines.set_gid(SCHEME_GID)
             elif style == 'step':
-                self.ax.step(x, y, color=color, linewidth=self.line_width.get(),
+                self.ax.step(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get(),
                            label=f"y = {equation}")
             elif style == 'bar':
-                self.ax.bar(x[::50], y[::50], color=color, alpha=0.6,
+                self.ax.bar(x[::50], y[::50], color=color, gid=SCHEME_GID, alpha=0.6,
                           label=f"y = {equation}")
             
             # Add calculus features if enabled
@@ -681,112 +3034,349 @@ class SuperMathGUI:
                 self.plot_derivative(x, func, color)
                 
             if self.show_tangent.get():
-                self.plot_tangent_line(x, func, expr, x_sym, color)
+                self.plot_tangent_line(x, expr, x_sym, color)
                 
             if self.show_area.get():
                 self.plot_area_under_curve(x, y, color)
                 
+            if self.show_taylor.get():
+                self.plot_taylor(x, equation, expr, x_sym)
+                
+            self.draw_datasets()
+            
             # Styling
             self.apply_plot_styling()
             
             # Store function for history
             self.current_functions.append((equation, x, y))
+            self.hover_index = None
             
-            self.canvas.draw()
+            self.request_render()
             
         except Exception as e:
             messagebox.showerror("Error", f"Invalid equation: {str(e)}")
             
-    def plot_3d(self):
-        """Plot 3D surface"""
-        equation = self.z_text.get('1.0', tk.END).strip()
-        if not equation:
-            return
+    def display_points(self):
+        """Sample count for in-memory evaluations, capped at the out-of-core threshold"""
+        return min(self.num_points.get(), self.out_of_core_points.get())
+        
+    def start_envelope(self, equation, func):
+        """Stream a huge 2D evaluation on a background thread into per-pixel-column statistics"""
+        self.ax.clear()
+        self.envelope_artists = []
+        self.current_functions = []
+        self.hover_index = None
+        
+        n = self.num_points.get()
+        columns = max(int(self.ax.bbox.width), 100)
+        self.envelope = PixelEnvelope(self.x_min.get(), self.x_max.get(), n, columns)
+        self.envelope_error = None
+        self.envelope_cancel = threading.Event()
+        self.envelope_started = time.perf_counter()
+        
+        spill = None
+        if self.spill_samples.get():
+            # Kept out of the cache folder itself, whose eviction would delete files still being written
+            folder = os.path.join(self.cache_dir.get(), "spill")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"samples_{expression_hash(equation)}_{n}.npy")
+            spill = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(n,))
             
-        try:
-            # Generate mesh
-            x = np.linspace(self.x_min.get(), self.x_max.get(), 100)
-            y = np.linspace(self.y_min.get(), self.y_max.get(), 100)
-            X, Y = np.meshgrid(x, y)
+        # The thread keeps its own envelope and cancel event, so once cancelled it can
+        # neither stream into nor report an error for a newer evaluation
+        envelope, cancel = self.envelope, self.envelope_cancel
+        
+        def run():
+            try:
+                stream_envelope(func, envelope, executor=self.evaluation_pool(),
+                                spill=spill, cancel=cancel)
+                if spill is not None:
+                    spill.flush()
+            except Exception as e:
+                if not cancel.is_set():
+                    self.envelope_error = e
+                
+        self.envelope_thread = threading.Thread(target=run, daemon=True)
+        self.envelope_thread.start()
+        self.envelope_job = self.root.after(200, self.update_envelope, equation)
+        
+    def update_envelope(self, equation):
+        """Redraw the partial envelope and report progress until streaming finishes"""
+        self.envelope_job = None
+        envelope = self.envelope
+        if envelope is None:
+            return
+        finished = not self.envelope_thread.is_alive()
+        
+        if self.envelope_error is not None:
+            self.envelope = None
+            messagebox.showerror("Error", f"Out-of-core evaluation error: {str(self.envelope_error)}")
+            return
             
-            # Evaluate equation
-            x_sym, y_sym = sp.symbols('x y')
-            expr = sp.sympify(equation)
-            func = sp.lambdify((x_sym, y_sym), expr, modules=['numpy'])
-            Z = func(X, Y)
+        for artist in self.envelope_artists:
+            artist.remove()
+        x, lo, hi, mean = envelope.envelope()
+        colors = self.color_schemes[self.current_scheme]
+        color = colors[0]
+        self.envelope_artists = [
+            self.ax.fill_between(x, lo, hi, color=color, gid=SCHEME_GID, alpha=0.35, linewidth=0,
+                                 label="min/max per pixel"),
+            self.ax.plot(x, mean, color=color, gid=SCHEME_GID, linewidth=self.line_width.get(),
+                         label=f"y = {equation} (mean)")[0]
+        ]
+        self.ax.relim()
+        self.ax.autoscale_view()
+        
+        elapsed = time.perf_counter() - self.envelope_started
+        progress = f"{envelope.done:,} / {envelope.n:,} samples in {elapsed:.1f}s"
+        self.toolbar.set_message(progress)
+        
+        if not finished:
+            self.request_render()
+            self.envelope_job = self.root.after(250, self.update_envelope, equation)
+            return
             
-            # Clear axes
-            self.ax.clear()
+        self.envelope = None
+        self.current_functions.append((equation, x, mean))
+        self.apply_plot_styling()
+        self.request_render()
+        
+        result_text = f"Out-of-core evaluation\n"
+        result_text += f"Samples: {envelope.done:,} of {envelope.n:,}\n"
+        result_text += f"Columns: {envelope.columns}\n"
+        result_text += f"Time: {elapsed:.2f}s ({envelope.done / max(elapsed, 1e-9) / 1e6:.1f} M samples/s)\n"
+        result_text += f"─" * 30 + "\n"
+        result_text += f"Min: {np.nanmin(lo) if np.isfinite(lo).any() else float('nan'):.6g}\n"
+        result_text += f"Max: {np.nanmax(hi) if np.isfinite(hi).any() else float('nan'):.6g}\n"
+        result_text += f"Non-finite samples: {envelope.done - int(envelope.count.sum()):,}\n"
+        self.results_text.delete('1.0', tk.END)
+        self.results_text.insert('1.0', result_text)
+        
+    def cancel_envelope(self):
+        """Stop any running out-of-core evaluation"""
+        if self.envelope_cancel is not None:
+            self.envelope_cancel.set()
+        if self.envelope_job is not None:
+            self.root.after_cancel(self.envelope_job)
+            self.envelope_job = None
+        self.envelope = None
+        
+    def evaluation_pool(self):
+        """Return the shared thread pool for chunked evaluation, or None on a single core"""
+        workers = os.cpu_count() or 1
+        if workers < 2:
+            return None
+        if self.eval_pool is None:
+            self.eval_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='evaluate')
+        return self.eval_pool
+        
+    def schedule_preview(self, event=None):
+        """Debounce editor keystrokes into a live preview of the current mode"""
+        if not self.live_preview.get() or self.plot_mode.get() not in ("2D", "3D", "Parametric"):
+            return
+        # Any newer keystroke makes pending work stale
+        self.preview_generation += 1
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(120, self.run_preview, self.preview_generation, True)
+        
+    def preview_sources(self):
+        """Return the expressions and variables edited for the current mode"""
+        mode = self.plot_mode.get()
+        if mode == "2D":
+            return [self.equation_text.get('1.0', tk.END).strip()], ('x',)
+        if mode == "3D":
+            return [self.z_text.get('1.0', tk.END).strip()], ('x', 'y')
+        return [self.param_x.get(), self.param_y.get()], ('t',)
+        
+    def run_preview(self, generation, coarse):
+        """Evaluate and draw a coarse or refined preview, dropping stale requests"""
+        self.preview_job = None
+        if generation != self.preview_generation or self.is_animating:
+            return
             
-            # Plot based on surface type
-            surface_type = self.surface_type.get()
-            if surface_type == "surface":
-                surf = self.ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8,
-                                           edgecolor='none', antialiased=True)
-                self.fig.colorbar(surf, ax=self.ax, shrink=0.5)
-            elif surface_type == "wireframe":
-                self.ax.plot_wireframe(X, Y, Z, color='cyan', alpha=0.5)
-            elif surface_type == "contour":
-                contour = self.ax.contour3D(X, Y, Z, 20, cmap='rainbow')
-                self.fig.colorbar(contour, ax=self.ax, shrink=0.5)
-                
-            # Set labels and viewing angle
-            self.ax.set_xlabel('X', fontsize=12)
-            self.ax.set_ylabel('Y', fontsize=12)
-            self.ax.set_zlabel('Z', fontsize=12)
-            self.ax.view_init(elev=self.elevation.get(), azim=self.azimuth.get())
-            
-            self.ax.set_title(f"z = {equation}", fontsize=14, color='white')
+        exprs, variables = self.preview_sources()
+        if not all(expression_syntax_ok(expr) for expr in exprs):
+            return
             
-            self.canvas.draw()
+        try:
+            symbols = sp.symbols(variables)
+            funcs = [sp.lambdify(symbols, sp.sympify(expr), modules=['numpy']) for expr in exprs]
+        except Exception:
+            # Half-typed input is expected while typing; wait for the next keystroke
+            return
+            
+        mode = self.plot_mode.get()
+        with np.errstate(all='ignore'):
+            try:
+                if mode == "3D":
+                    n = 25 if coarse else 100
+                    X, Y = np.meshgrid(np.linspace(self.x_min.get(), self.x_max.get(), n),
+                                       np.linspace(self.y_min.get(), self.y_max.get(), n))
+                    Z = broadcast_result(funcs[0](X, Y), X.shape)
+                    self.draw_preview_surface(X, Y, Z)
+                else:
+                    n = min(self.display_points(), 200) if coarse else self.display_points()
+                    if mode == "2D":
+                        u = np.linspace(self.x_min.get(), self.x_max.get(), n)
+                        x, y = u, broadcast_result(funcs[0](u), u.shape)
+                    else:
+                        u = np.linspace(self.t_min.get(), self.t_max.get(), n)
+                        x = broadcast_result(funcs[0](u), u.shape)
+                        y = broadcast_result(funcs[1](u), u.shape)
+                    self.draw_preview_line(x, y)
+            except Exception:
+                return
+                
+        self.request_render()
+        
+        # Refine once the coarse frame is on screen, unless typing resumes first
+        if coarse:
+            self.preview_job = self.root.after(30, self.run_preview, generation, False)
+            
+    def draw_preview_line(self, x, y):
+        """Show the preview curve with one reusable line"""
+        if self.preview_artist is None or self.preview_artist not in self.ax.lines:
+            self.preview_artist, = self.ax.plot([], [], '--', color=self.theme_color("foreground"), gid=THEME_GID,
+                                                linewidth=1.5, alpha=0.8, zorder=4)
+        self.preview_artist.set_data(x, y)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        
+    def draw_preview_surface(self, X, Y, Z):
+        """Draw the previewed surface without adding a colorbar"""
+        self.ax.clear()
+        self.current_surface = None
+        self.current_mesh = None
+        n = X.shape[0]
+        self.preview_artist = self.ax.plot_surface(X, Y, Z, rcount=n, ccount=n, cmap='viridis',
+                                                   alpha=0.8, edgecolor='none')
+        
+    def plot_3d(self):
+        """Plot 3D surface"""
+        equation = self.z_text.get('1.0', tk.END).strip()
+        if not equation:
+            return
+            
+        try:
+            # Generate mesh
+            n = max(self.surface_resolution.get(), 2)
+            x = np.linspace(self.x_min.get(), self.x_max.get(), n)
+            y = np.linspace(self.y_min.get(), self.y_max.get(), n)
+            
+            # Evaluate equation over an open grid, a block of rows at a time
+            def evaluate():
+                x_sym, y_sym = sp.symbols('x y')
+                expr = sp.sympify(equation)
+                func = sp.lambdify((x_sym, y_sym), expr, modules=['numpy'])
+                return self.evaluate_precision(f"z = {equation}", func, [x[np.newaxis, :], y[:, np.newaxis]],
+                                               (len(y), len(x)))
+                
+            Z = self.cached_evaluate([equation], ['x', 'y'], [(x[0], x[-1]), (y[0], y[-1])],
+                                     [len(y), len(x)], evaluate)
+            x, y = x.astype(Z.dtype, copy=False), y.astype(Z.dtype, copy=False)
+            X, Y = np.meshgrid(x, y)
+            
+            # Keep the mesh for workspaces
+            self.current_surface = (equation, x, y, Z)
+            
+            self.draw_surface(equation, X, Y, Z)
             
         except Exception as e:
             messagebox.showerror("Error", f"3D plotting error: {str(e)}")
             
+    def draw_surface(self, equation, X, Y, Z):
+        """Draw an already evaluated surface mesh"""
+        self.current_mesh = (X, Y, Z)
+        
+        # Clear axes and the previous colorbar
+        self.ax.clear()
+        if self.surface_colorbar is not None:
+            try:
+                self.surface_colorbar.remove()
+            except (ValueError, AttributeError, KeyError):
+                pass
+            self.surface_colorbar = None
+            
+        # Plot based on surface type
+        surface_type = self.surface_type.get()
+        if surface_type == "surface":
+            surf = self.ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8,
+                                       edgecolor='none', antialiased=True)
+            self.surface_colorbar = self.fig.colorbar(surf, ax=self.ax, shrink=0.5)
+        elif surface_type == "wireframe":
+            self.ax.plot_wireframe(X, Y, Z, color='cyan', alpha=0.5)
+        elif surface_type == "contour":
+            contour = self.ax.contour3D(X, Y, Z, 20, cmap='rainbow')
+            self.surface_colorbar = self.fig.colorbar(contour, ax=self.ax, shrink=0.5)
+            
+        # Set labels and viewing angle
+        self.ax.set_xlabel('X', fontsize=12)
+        self.ax.set_ylabel('Y', fontsize=12)
+        self.ax.set_zlabel('Z', fontsize=12)
+        self.ax.view_init(elev=self.elevation.get(), azim=self.azimuth.get())
+        
+        self.ax.set_title(f"z = {equation}", fontsize=14, color=self.theme_color("foreground"))
+        
+        self.request_render()
+            
     def plot_parametric(self):
         """Plot parametric curve"""
         try:
             # Generate parameter values
-            t = np.linspace(self.t_min.get(), self.t_max.get(), self.num_points.get())
-            
-            # Parse equations
-            t_sym = sp.symbols('t')
-            x_expr = sp.sympify(self.param_x.get())
-            y_expr = sp.sympify(self.param_y.get())
+            t = np.linspace(self.t_min.get(), self.t_max.get(), self.display_points())
             
-            x_func = sp.lambdify(t_sym, x_expr, modules=['numpy'])
-            y_func = sp.lambdify(t_sym, y_expr, modules=['numpy'])
+            # Parse, then evaluate x and y together so shared terms run once
+            func = self.compile_components([self.param_x.get(), self.param_y.get()], ['t'])
             
-            x = x_func(t)
-            y = y_func(t)
-            
-            # Clear and plot
-            self.ax.clear()
-            
-            # Create gradient color effect
-            colors = plt.cm.rainbow(np.linspace(0, 1, len(t)))
-            for i in range(len(t)-1):
-                self.ax.plot(x[i:i+2], y[i:i+2], color=colors[i], linewidth=2)
-                
-            # Add direction arrows
-            arrow_indices = np.linspace(0, len(t)-1, 10, dtype=int)
-            for idx in arrow_indices[:-1]:
-                dx = x[idx+5] - x[idx]
-                dy = y[idx+5] - y[idx]
-                self.ax.arrow(x[idx], y[idx], dx*0.1, dy*0.1,
-                            head_width=0.05, head_length=0.05,
-                            fc='yellow', ec='yellow', alpha=0.7)
-                            
-            self.ax.set_title(f"Parametric: x(t), y(t)", fontsize=14, color='white')
-            self.ax.set_xlabel("x(t)", fontsize=12)
-            self.ax.set_ylabel("y(t)", fontsize=12)
+            def evaluate():
+                return self.evaluate_precision("x(t), y(t)", func, [t], t.shape, outputs=2)
+                
+            x, y = self.cached_evaluate([self.param_x.get(), self.param_y.get()], ['t'],
+                                        [(t[0], t[-1])], len(t), evaluate)
+                                        
+            self.draw_parametric(t.astype(x.dtype, copy=False), x, y)
             
-            self.apply_plot_styling()
-            self.canvas.draw()
+            self.results_text.delete('1.0', tk.END)
+            self.results_text.insert('1.0', f"x(t) = {self.param_x.get()}\ny(t) = {self.param_y.get()}\n"
+                                     + f"─" * 30 + "\n" + fused_report(self.fused_stats))
             
         except Exception as e:
             messagebox.showerror("Error", f"Parametric plotting error: {str(e)}")
             
+    def draw_parametric(self, t, x, y):
+        """Draw an already evaluated parametric curve"""
+        # Keep the samples for hover snapping and workspaces
+        self.parametric_data = (t, x, y)
+        self.hover_tree = None
+        
+        # Clear and plot
+        self.ax.clear()
+        
+        # Create gradient color effect as a single collection of segments
+        points = np.column_stack([x, y])
+        segments = np.stack([points[:-1], points[1:]], axis=1)
+        gradient = LineCollection(segments, colors=plt.cm.rainbow(np.linspace(0, 1, len(t)))[:-1],
+                                  linewidths=2)
+        self.ax.add_collection(gradient)
+        self.ax.autoscale_view()
+            
+        # Add direction arrows
+        arrow_indices = np.linspace(0, len(t)-1, 10, dtype=int)
+        for idx in arrow_indices[:-1]:
+            dx = x[idx+5] - x[idx]
+            dy = y[idx+5] - y[idx]
+            self.ax.arrow(x[idx], y[idx], dx*0.1, dy*0.1,
+                        head_width=0.05, head_length=0.05,
+                        fc='yellow', ec='yellow', alpha=0.7)
+                        
+        self.ax.set_title(f"Parametric: x(t), y(t)", fontsize=14, color=self.theme_color("foreground"))
+        self.ax.set_xlabel("x(t)", fontsize=12)
+        self.ax.set_ylabel("y(t)", fontsize=12)
+        
+        self.apply_plot_styling()
+        self.request_render()
+            
     def plot_derivative(self, x, func, color):
         """Plot the derivative of the function"""
         try:
@@ -796,28 +3386,20 @@ class SuperMathGUI:
             dy = np.gradient(y, dx)
             
             # Plot with modified color
-            r, g, b = plt.colors.to_rgb(color)
-            deriv_color = (min(1, r*1.3), min(1, g*0.7), min(1, b*0.7))
-            
-            self.ax.plot(x, dy, '--', color=deriv_color, linewidth=self.line_width.get()*0.7,
-                        label="f'(x)", alpha=0.7)
+            self.ax.plot(x, dy, '--', color=derivative_color(color), gid=DERIVATIVE_GID,
+                        linewidth=self.line_width.get()*0.7, label="f'(x)", alpha=0.7)
                         
         except Exception:
             pass
             
-    def plot_tangent_line(self, x, func, expr, x_sym, color):
+    def plot_tangent_line(self, x, expr, x_sym, color):
         """Plot tangent line at specified point"""
         try:
             # Get tangent point
             x_t = self.tangent_x.get()
             
-            # Calculate derivative symbolically
-            deriv = sp.diff(expr, x_sym)
-            deriv_func = sp.lambdify(x_sym, deriv, modules=['numpy'])
-            
-            # Calculate slope and point
-            y_t = func(x_t)
-            slope = deriv_func(x_t)
+            # Value and symbolic derivative from one fused callable
+            y_t, slope = self.compile_components([expr, sp.diff(expr, x_sym)], ['x'])(x_t)
             
             # Generate tangent line
             x_range = np.array([self.x_min.get(), self.x_max.get()])
@@ -837,6 +3419,33 @@ class SuperMathGUI:
         except Exception:
             pass
             
+    def taylor_coefficients(self, equation, expr, x_sym, center, order):
+        """Return Taylor coefficients about center, computing them once per equation and center"""
+        key = (equation, center)
+        coeffs = self.taylor_cache.get(key)
+        if coeffs is None or len(coeffs) <= order:
+            coeffs = taylor_series_coefficients(expr, x_sym, center, order)
+            self.taylor_cache[key] = coeffs
+        return coeffs[:order + 1]
+        
+    def plot_taylor(self, x, equation, expr, x_sym):
+        """Overlay Taylor polynomials of every order up to the maximum about the tangent point"""
+        try:
+            center = self.tangent_x.get()
+            order = max(self.taylor_order.get(), 1)
+            partial = taylor_partial_sums(self.taylor_coefficients(equation, expr, x_sym, center, order),
+                                          x - center)
+                                          
+            # All orders as one collection, without widening the curve's own limits
+            segments = np.stack([np.broadcast_to(x, partial[1:].shape), partial[1:]], axis=-1)
+            polys = LineCollection(segments, colors=plt.cm.plasma(np.linspace(0.2, 1, order)),
+                                   linewidths=1, alpha=0.7, label=f"Taylor orders 1-{order} at x={center:.2f}")
+            self.ax.add_collection(polys, autolim=False)
+            self.ax.plot(center, partial[0, 0], 'o', color=self.theme_color("foreground"), gid=THEME_GID, markersize=6)
+            
+        except Exception:
+            pass
+            
     def plot_area_under_curve(self, x, y, color):
         """Shade area under curve"""
         try:
@@ -850,12 +3459,117 @@ class SuperMathGUI:
             y_fill = y[mask]
             
             # Fill area
-            self.ax.fill_between(x_fill, y_fill, alpha=0.3, color=color,
+            self.ax.fill_between(x_fill, y_fill, alpha=0.3, color=color, gid=SCHEME_GID,
                                label=f"Area [{lower:.1f}, {upper:.1f}]")
                                
         except Exception:
             pass
             
+    def riemann_n(self):
+        """Number of subintervals chosen on the logarithmic slider"""
+        return max(int(round(10 ** self.riemann_log_n.get())), 1)
+        
+    def riemann_convergence(self, equation, func, a, b):
+        """Return the reference integral and every rule's error over n = 1 .. 100000, cached"""
+        key = (equation, a, b)
+        if key not in self.riemann_cache:
+            reference, _ = integrate.quad(func, a, b, limit=200)
+            ns = np.unique(np.round(np.logspace(0, 5, 26)).astype(int))
+            errors = {rule: np.empty(len(ns)) for rule in RIEMANN_RULES}
+            for i, n in enumerate(ns):
+                _, ends, mids = riemann_samples(func, a, b, n)
+                for rule, value in riemann_rules(ends, mids, a, b).items():
+                    errors[rule][i] = abs(value - reference)
+            self.riemann_cache[key] = (reference, ns, errors)
+        return self.riemann_cache[key]
+        
+    def plot_riemann(self):
+        """Draw the chosen rule's shapes over the integration bounds with a convergence inset"""
+        try:
+            equation = self.equation_text.get('1.0', tk.END).strip()
+            if not equation:
+                return
+            if self.plot_mode.get() != "2D":
+                self.plot_mode.set("2D")
+                self.switch_plot_mode()
+                
+            _, func = self.compile_equation(equation)
+            a, b = self.int_lower.get(), self.int_upper.get()
+            reference, ns, errors = self.riemann_convergence(equation, func, a, b)
+            
+            self.ax.clear()
+            colors = self.color_schemes[self.current_scheme]
+            x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+            with np.errstate(all='ignore'):
+                y = broadcast_result(func(x), x.shape)
+            self.ax.plot(x, y, color=colors[0], gid=SCHEME_GID, linewidth=self.line_width.get(),
+                         label=f"y = {equation}")
+            self.current_functions = [(equation, x, y)]
+            self.hover_index = None
+                             
+            shapes = PolyCollection([], facecolors=colors[1], gid=SCHEME_GID, edgecolors='white',
+                                    linewidths=0.5, alpha=0.45)
+            self.ax.add_collection(shapes, autolim=False)
+            label = self.ax.text(0.02, 0.97, "", transform=self.ax.transAxes, va='top', fontsize=10,
+                                 color='white', bbox=dict(boxstyle='round,pad=0.3', fc='black', alpha=0.7))
+                                 
+            # Convergence of every rule on a log-log inset
+            inset = self.ax.inset_axes([0.6, 0.6, 0.38, 0.36])
+            inset.set_facecolor(self.theme_color("axes"))
+            for i, rule in enumerate(RIEMANN_RULES):
+                inset.loglog(ns, np.maximum(errors[rule], 1e-17), color=colors[(i + 1) % len(colors)],
+                             gid=SCHEME_GID, linewidth=1, label=rule)
+            marker = inset.axvline(self.riemann_n(), color=self.theme_color("foreground"), gid=THEME_GID,
+                                   linestyle=':', linewidth=1)
+            inset.set_xlabel("n", fontsize=8)
+            inset.set_ylabel("|error|", fontsize=8)
+            inset.tick_params(labelsize=7)
+            inset.legend(fontsize=6, loc='lower left', framealpha=0.6)
+            
+            self.apply_plot_styling()
+            self.riemann = {"equation": equation, "func": func, "a": a, "b": b, "reference": reference,
+                            "shapes": shapes, "label": label, "marker": marker}
+            self.update_riemann()
+            self.request_render()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Riemann sum error: {str(e)}")
+            
+    def schedule_riemann_update(self, *args):
+        """Coalesce slider and rule changes into one update per frame"""
+        self.riemann_n_label.config(text=f"n = {self.riemann_n()}")
+        if self.riemann is None or self.riemann_job is not None:
+            return
+        self.riemann_job = self.root.after(16, self.update_riemann, True)
+        
+    def update_riemann(self, redraw=False):
+        """Recompute every rule at the current n and reshape the collection in place"""
+        self.riemann_job = None
+        view = self.riemann
+        if view is None or view["shapes"] not in self.ax.collections:
+            return
+            
+        n, rule = self.riemann_n(), self.riemann_rule.get()
+        a, b = view["a"], view["b"]
+        x, ends, mids = riemann_samples(view["func"], a, b, n)
+        values = riemann_rules(ends, mids, a, b)
+        
+        view["shapes"].set_verts(riemann_shapes(rule, x, ends, mids))
+        view["marker"].set_xdata([n, n])
+        view["label"].set_text(f"{rule.title()} rule, n={n}: {values[rule]:.8g}\n"
+                               f"∫ = {view['reference']:.8g}, error {abs(values[rule] - view['reference']):.2e}")
+                               
+        result_text = f"Function: {view['equation']}\n"
+        result_text += f"Bounds: [{a:.2f}, {b:.2f}], n = {n}\n"
+        result_text += f"─" * 30 + "\n"
+        for name, value in values.items():
+            result_text += f"{name:<10} {value:.10f}  err {abs(value - view['reference']):.2e}\n"
+        self.results_text.delete('1.0', tk.END)
+        self.results_text.insert('1.0', result_text)
+        
+        if redraw:
+            self.request_render()
+            
     def calculate_area(self):
         """Calculate definite integral"""
         try:
@@ -885,13 +3599,14 @@ class SuperMathGUI:
             result_text += f"Symbolic integral: {integral:.6f}\n"
             result_text += f"Numerical integral: {numerical:.6f}\n"
             
-            # Calculate derivative at bounds
-            deriv = sp.diff(expr, x_sym)
-            deriv_func = sp.lambdify(x_sym, deriv, modules=['numpy'])
+            # Calculate f and f' at both bounds in one fused call
+            values, slopes = self.compile_components([expr, sp.diff(expr, x_sym)], ['x'])(np.array([lower, upper]))
+            values, slopes = broadcast_result(values, (2,)), broadcast_result(slopes, (2,))
             
             result_text += f"─" * 30 + "\n"
-            result_text += f"f'({lower:.2f}) = {deriv_func(lower):.4f}\n"
-            result_text += f"f'({upper:.2f}) = {deriv_func(upper):.4f}\n"
+            result_text += f"f({lower:.2f}) = {values[0]:.4f},  f'({lower:.2f}) = {slopes[0]:.4f}\n"
+            result_text += f"f({upper:.2f}) = {values[1]:.4f},  f'({upper:.2f}) = {slopes[1]:.4f}\n"
+            result_text += fused_report(self.fused_stats)
             
             self.results_text.delete('1.0', tk.END)
             self.results_text.insert('1.0', result_text)
@@ -903,26 +3618,289 @@ class SuperMathGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Calculation error: {str(e)}")
             
+    def result_cache(self):
+        """Return the disk cache for the configured folder and size limit"""
+        directory = self.cache_dir.get()
+        if self.disk_cache is None or self.disk_cache.directory != directory:
+            self.disk_cache = ResultCache(directory)
+        self.disk_cache.max_bytes = self.cache_size_mb.get() * 1024**2
+        return self.disk_cache
+        
+    def cached_evaluate(self, exprs, variables, ranges, resolution, evaluate):
+        """Return evaluate(), served from the disk cache when it is enabled"""
+        if not self.use_disk_cache.get():
+            return evaluate()
+            
+        try:
+            cache = self.result_cache()
+            precision = self.precision.get()
+            key = cache.key(exprs, variables, ranges, resolution,
+                            None if precision == "float64" else f"numpy {np.__version__} {precision}")
+        except Exception:
+            return evaluate()
+            
+        result = cache.load(key)
+        if result is None:
+            result = evaluate()
+            try:
+                cache.store(key, result)
+            except OSError:
+                pass
+        return result
+        
+    def show_cache_report(self):
+        """Show disk cache statistics"""
+        try:
+            self.settings_text.delete('1.0', tk.END)
+            self.settings_text.insert('1.0', self.result_cache().report())
+        except Exception as e:
+            messagebox.showerror("Error", f"Cache error: {str(e)}")
+            
+    def evaluate_precision(self, label, func, args, shape, outputs=None):
+        """Evaluate at the selected precision, recording memory and time for the precision report"""
+        requested = self.precision.get()
+        start = time.perf_counter()
+        values, fell_back = precision_evaluate(func, args, shape, PRECISIONS[requested],
+                                               self.evaluation_pool(), outputs)
+        elapsed = time.perf_counter() - start
+        
+        self.precision_fallbacks += fell_back
+        self.precision_rates[values.dtype.name] = elapsed / max(values.size, 1)
+        self.precision_stats = {"label": label, "requested": requested, "dtype": values.dtype.name,
+                                "samples": values.size, "bytes": values.nbytes, "time": elapsed,
+                                "fell_back": fell_back}
+        return values
+        
+    def show_precision_report(self):
+        """Show the precision, memory and timing of the last evaluation"""
+        stats = self.precision_stats
+        text = f"Precision: {self.precision.get()}\n"
+        if stats is not None:
+            full = stats["samples"] * 8
+            text += f"Last evaluation: {stats['label']}\n"
+            text += f"Evaluated as: {stats['dtype']}"
+            text += " (fell back: float32 was not accurate enough)\n" if stats["fell_back"] else "\n"
+            text += f"─" * 30 + "\n"
+            text += f"Samples: {stats['samples']:,}\n"
+            text += f"Memory: {stats['bytes'] / 1024**2:.1f} MB (float64 {full / 1024**2:.1f} MB, "
+            text += f"saved {(full - stats['bytes']) / 1024**2:.1f} MB)\n"
+            text += f"Time: {stats['time']*1000:.1f} ms\n"
+        for name, rate in sorted(self.precision_rates.items()):
+            text += f"{name}: {rate*1e9:.1f} ns/sample\n"
+        text += f"Fallbacks to float64: {self.precision_fallbacks}\n"
+        self.settings_text.delete('1.0', tk.END)
+        self.settings_text.insert('1.0', text)
+        
+    def show_render_report(self):
+        """Show render scheduler statistics"""
+        self.settings_text.delete('1.0', tk.END)
+        self.settings_text.insert('1.0', self.render_scheduler.report())
+        
+    def request_render(self, blit=None, key=None, overlay=False):
+        """Queue a redraw of the main canvas with the render scheduler"""
+        self.render_scheduler.budget = max(self.frame_budget_ms.get(), 1) / 1000
+        self.render_scheduler.request(blit, key, overlay)
+        
+    def clear_disk_cache(self):
+        """Delete every entry in the disk cache"""
+        try:
+            self.result_cache().clear()
+            self.show_cache_report()
+        except Exception as e:
+            messagebox.showerror("Error", f"Cache error: {str(e)}")
+            
+    def compile_components(self, exprs, names):
+        """Compile every component of a plot into one fused callable, reusing earlier compilations"""
+        key = ('fused', tuple(names), tuple(str(expr) for expr in exprs))
+        if key not in self.compiled_cache:
+            self.compiled_cache[key] = compile_fused(exprs, sp.symbols(names))
+        func, self.fused_stats = self.compiled_cache[key]
+        return func
+        
+    def compile_equation(self, equation):
+        """Parse and lambdify an equation of x, reusing earlier compilations"""
+        if equation not in self.compiled_cache:
+            x_sym = sp.symbols('x')
+            expr = sp.sympify(equation)
+            func = sp.lambdify(x_sym, expr, modules=['numpy'])
+            self.compiled_cache[equation] = (expr, func)
+        return self.compiled_cache[equation]
+        
+    def find_curve_features(self):
+        """Find roots, extrema, inflection points and intersections of all plotted curves"""
+        if self.plot_mode.get() != "2D":
+            messagebox.showinfo("Info", "Switch to 2D mode first!")
+            return
+            
+        try:
+            start = time.perf_counter()
+            
+            # Collect the distinct curves currently on the plot
+            curves = {}
+            for eq, x, y in self.current_functions:
+                curves[eq] = (x, y)
+            if not curves:
+                equation = self.equation_text.get('1.0', tk.END).strip()
+                if not equation:
+                    return
+                curves[equation] = (None, None)
+            equations = list(curves)
+            m = len(equations)
+            
+            # Sample everything on one common grid, reusing stored samples where they match
+            x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+            funcs = [None] * (3 * m)
+            Y = np.empty((m, len(x)))
+            for i, eq in enumerate(equations):
+                _, f = self.compile_equation(eq)
+                funcs[i] = f
+                funcs[m + i] = central_difference(f, 1)
+                funcs[2*m + i] = central_difference(f, 2)
+                x_old, y_old = curves[eq]
+                if x_old is not None and len(x_old) == len(x) and np.allclose(x_old[[0, -1]], x[[0, -1]]):
+                    Y[i] = y_old
+                else:
+                    with np.errstate(all='ignore'):
+                        Y[i] = broadcast_result(f(x), x.shape)
+                        
+            # Bracket every feature by sign changes on the sampled arrays
+            left, right, kinds, cols = [], [], [], []
+            
+            def add_brackets(rows, columns, offset, other, kind):
+                left.append(rows + offset)
+                right.append(other)
+                kinds.append(np.full(len(rows), kind))
+                cols.append(columns)
+                
+            if self.mark_roots.get():
+                rows, columns = sign_change_brackets(Y)
+                add_brackets(rows, columns, 0, np.full(len(rows), -1), 'root')
+                
+            if self.mark_extrema.get() or self.mark_inflections.get():
+                with np.errstate(all='ignore'):
+                    dY = np.gradient(Y, x, axis=1)
+                if self.mark_extrema.get():
+                    rows, columns = sign_change_brackets(dY)
+                    kind = np.where(dY[rows, columns] > 0, 'maximum', 'minimum')
+                    left.append(rows + m)
+                    right.append(np.full(len(rows), -1))
+                    kinds.append(kind)
+                    cols.append(columns)
+                if self.mark_inflections.get():
+                    with np.errstate(all='ignore'):
+                        d2Y = np.gradient(dY, x, axis=1)
+                    rows, columns = sign_change_brackets(d2Y)
+                    add_brackets(rows, columns, 2*m, np.full(len(rows), -1), 'inflection')
+                    
+            if self.mark_intersections.get():
+                for i in range(m - 1):
+                    rows, columns = sign_change_brackets(Y[i+1:] - Y[i])
+                    add_brackets(np.full(len(rows), i), columns, 0, rows + i + 1, 'intersection')
+                    
+            if not left:
+                return
+            left = np.concatenate(left)
+            right = np.concatenate(right)
+            kinds = np.concatenate(kinds)
+            cols = np.concatenate(cols)
+            
+            # Widen derivative brackets by one sample, since finite differences lag the true sign change
+            widen = left >= m
+            lo = np.where(widen, np.maximum(cols - 1, 0), cols)
+            hi = np.where(widen, np.minimum(cols + 2, len(x) - 1), cols + 1)
+            
+            # Polish all brackets in a single batch
+            idx, roots = polish_brackets(funcs, left, right, x[lo], x[hi])
+            kinds = kinds[idx]
+            curve_idx = left[idx] % m
+            values = evaluate_grouped(funcs, curve_idx, roots)
+            
+            # Drop duplicates produced by overlapping widened brackets
+            order = np.lexsort((roots, curve_idx, kinds))
+            roots, values, kinds, curve_idx = roots[order], values[order], kinds[order], curve_idx[order]
+            tol = 1e-9 * (1 + np.abs(roots))
+            keep = np.ones(len(roots), dtype=bool)
+            keep[1:] = ~((kinds[1:] == kinds[:-1]) & (curve_idx[1:] == curve_idx[:-1]) &
+                         (np.abs(np.diff(roots)) <= tol[1:]))
+            roots, values, kinds, curve_idx = roots[keep], values[keep], kinds[keep], curve_idx[keep]
+            
+            elapsed = time.perf_counter() - start
+            
+            # Mark the points on the plot
+            for artist in self.feature_artists:
+                try:
+                    artist.remove()
+                except (ValueError, NotImplementedError):
+                    pass
+            self.feature_artists = []
+            
+            markers = {
+                'root': ('o', self.theme_color("foreground"), "Roots"),
+                'maximum': ('^', '#FF006E', "Maxima"),
+                'minimum': ('v', '#3A86FF', "Minima"),
+                'inflection': ('D', '#FFBE0B', "Inflections"),
+                'intersection': ('X', '#00FF00', "Intersections")
+            }
+            for kind, (marker, color, label) in markers.items():
+                sel = kinds == kind
+                if sel.any():
+                    artist = self.ax.scatter(roots[sel], values[sel], marker=marker, s=60,
+                                             color=color, edgecolors='black', zorder=5,
+                                             label=f"{label} ({int(sel.sum())})")
+                    if kind == 'root':
+                        artist.set_gid(THEME_GID)
+                    self.feature_artists.append(artist)
+                    
+            if self.show_legend.get():
+                self.ax.legend(loc='best', framealpha=0.8)
+                
+            # Display results
+            result_text = f"Curves analysed: {m}\n"
+            result_text += f"Time: {elapsed*1000:.1f} ms\n"
+            result_text += f"─" * 30 + "\n"
+            for kind, (_, _, label) in markers.items():
+                result_text += f"{label}: {int((kinds == kind).sum())}\n"
+            result_text += f"─" * 30 + "\n"
+            for j in range(min(len(roots), 200)):
+                result_text += (f"{kinds[j]:<12} x={roots[j]:.6f}  y={values[j]:.6f}  "
+                                f"[{equations[curve_idx[j]]}]\n")
+                
+            self.results_text.delete('1.0', tk.END)
+            self.results_text.insert('1.0', result_text)
+            
+            self.request_render()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Analysis error: {str(e)}")
+            
     def add_function(self):
         """Add function to existing plot"""
         try:
+            # Streaming keeps its background curves and adds the equation box to them itself
+            if self.plot_mode.get() == "Stream":
+                self.start_stream()
+                return
+                
             # Store current state
             current_funcs = self.current_functions.copy()
             
             # Plot new function
             self.plot_function()
             
-            # Restore previous functions
+            # Restore previous functions ahead of whatever the new plot stored
+            added = [entry for entry in self.current_functions if not any(entry is old for old in current_funcs)]
+            self.current_functions = current_funcs + added
+            self.hover_index = None
             colors = self.color_schemes[self.current_scheme]
             for i, (eq, x, y) in enumerate(current_funcs):
                 color = colors[i % len(colors)]
-                self.ax.plot(x, y, color=color, linewidth=self.line_width.get(),
+                self.ax.plot(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get(),
                            label=f"y = {eq}")
                            
             if self.show_legend.get():
                 self.ax.legend(loc='best', framealpha=0.8)
                 
-            self.canvas.draw()
+            self.request_render()
             
         except Exception as e:
             messagebox.showerror("Error", f"Error adding function: {str(e)}")
@@ -940,8 +3918,8 @@ class SuperMathGUI:
             
         # Axes
         if self.show_axes.get():
-            self.ax.axhline(y=0, color='white', linewidth=0.5, alpha=0.5)
-            self.ax.axvline(x=0, color='white', linewidth=0.5, alpha=0.5)
+            self.ax.axhline(y=0, color=self.theme_color("foreground"), gid=THEME_GID, linewidth=0.5, alpha=0.5)
+            self.ax.axvline(x=0, color=self.theme_color("foreground"), gid=THEME_GID, linewidth=0.5, alpha=0.5)
             
         # Legend
         if self.show_legend.get() and len(self.ax.lines) > 0:
@@ -958,21 +3936,40 @@ class SuperMathGUI:
     def change_color_scheme(self, event=None):
         """Change the color scheme"""
         combo = event.widget
+        old = self.color_schemes[self.current_scheme]
         self.current_scheme = combo.get()
-        self.plot_function()
+        new = self.color_schemes[self.current_scheme]
+        self.restyle_plot(dict(zip(old, new)), SCHEME_GID)
+        self.restyle_plot(dict(zip(map(derivative_color, old), map(derivative_color, new))), DERIVATIVE_GID)
         
     def toggle_theme(self):
         """Toggle between dark and light theme"""
-        if self.dark_mode.get():
-            plt.style.use('dark_background')
-            self.fig.patch.set_facecolor('#1a1a2e')
-            self.ax.set_facecolor('#16213e')
-        else:
-            plt.style.use('default')
-            self.fig.patch.set_facecolor('white')
-            self.ax.set_facecolor('white')
+        dark = self.dark_mode.get()
+        plt.style.use('dark_background' if dark else 'default')
+        self.restyle_plot(THEME_SWAPS[dark], THEME_GID)
+        
+    def theme_color(self, role):
+        """Current theme's figure, axes or foreground color"""
+        return THEME_COLORS[self.dark_mode.get()][role]
+        
+    def restyle_plot(self, mapping, gid=None):
+        """Recolor the plot and spectrum window in place without re-evaluating anything"""
+        figures = [(self.fig, self.canvas)]
+        if self.spectrum_window is not None and self.spectrum_window.winfo_exists():
+            self.spectrum_window.configure(bg=self.theme_color("figure"))
+            figures.append((self.spectrum_fig, self.spectrum_canvas))
             
-        self.canvas.draw()
+        for figure, canvas in figures:
+            if gid == THEME_GID:
+                tag_theme_artists(figure)
+            restyle_figure(figure, mapping, gid)
+            figure.patch.set_facecolor(self.theme_color("figure"))
+            for ax in figure.axes:
+                ax.set_facecolor(self.theme_color("axes"))
+            if canvas is self.canvas:
+                self.request_render()
+            else:
+                canvas.draw_idle()
         
     def start_animation(self):
         """Start animation"""
@@ -995,6 +3992,15 @@ class SuperMathGUI:
             self.animate_growing()
         elif anim_type == "rotate3d":
             self.animate_3d_rotation()
+        elif anim_type == "fourier":
+            self.animate_fourier()
+        elif anim_type == "taylor":
+            self.animate_taylor()
+            
+        # The 2D animations redraw the axes, so the stored curves are no longer on the plot
+        if anim_type != "rotate3d" and self.animation_obj is not None:
+            self.current_functions = []
+            self.hover_index = None
             
     def stop_animation(self):
         """Stop animation"""
@@ -1012,7 +4018,7 @@ class SuperMathGUI:
         if not equation:
             return
             
-        x = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
+        x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
         
         def update(frame):
             if not self.is_animating:
@@ -1031,7 +4037,7 @@ class SuperMathGUI:
                 y = func(x)
                 
                 color = self.color_schemes[self.current_scheme][0]
-                self.ax.plot(x, y, color=color, linewidth=self.line_width.get())
+                self.ax.plot(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get())
                 self.ax.set_title(f"Phase Animation: {equation}", fontsize=14)
                 self.apply_plot_styling()
                 
@@ -1041,7 +4047,7 @@ class SuperMathGUI:
         self.animation_obj = animation.FuncAnimation(
             self.fig, update, interval=self.anim_speed.get(), repeat=True
         )
-        self.canvas.draw()
+        self.request_render()
         
     def animate_amplitude(self):
         """Animate amplitude modulation"""
@@ -1049,7 +4055,7 @@ class SuperMathGUI:
         if not equation:
             return
             
-        x = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
+        x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
         
         def update(frame):
             if not self.is_animating:
@@ -1067,7 +4073,7 @@ class SuperMathGUI:
                 y = func(x) * amp
                 
                 color = self.color_schemes[self.current_scheme][1]
-                self.ax.plot(x, y, color=color, linewidth=self.line_width.get())
+                self.ax.plot(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get())
                 self.ax.set_title(f"Amplitude: {amp:.2f}", fontsize=14)
                 self.apply_plot_styling()
                 
@@ -1077,33 +4083,46 @@ class SuperMathGUI:
         self.animation_obj = animation.FuncAnimation(
             self.fig, update, interval=self.anim_speed.get(), repeat=True
         )
-        self.canvas.draw()
+        self.request_render()
         
     def animate_frequency(self):
-        """Animate frequency modulation"""
-        base_equation = "sin(f * x)"
-        x = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
+        """Animate frequency modulation of the current equation"""
+        equation = self.equation_text.get('1.0', tk.END).strip()
+        if not equation:
+            return
+            
+        x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+        
+        try:
+            _, func = self.compile_equation(equation)
+        except Exception as e:
+            messagebox.showerror("Error", f"Invalid equation: {str(e)}")
+            self.stop_animation()
+            return
+            
+        # One line whose data is replaced each frame: y = f(freq * x)
+        self.ax.clear()
+        color = self.color_schemes[self.current_scheme][2]
+        line, = self.ax.plot(x, np.zeros_like(x), color=color, gid=SCHEME_GID, linewidth=self.line_width.get())
+        self.apply_plot_styling()
         
         def update(frame):
             if not self.is_animating:
                 return
                 
-            self.ax.clear()
-            
             # Vary frequency
             freq = 1 + 2 * np.sin(frame * 0.05)
             
-            y = np.sin(freq * x)
-            
-            color = self.color_schemes[self.current_scheme][2]
-            self.ax.plot(x, y, color=color, linewidth=self.line_width.get())
-            self.ax.set_title(f"Frequency: {freq:.2f}", fontsize=14)
-            self.apply_plot_styling()
+            with np.errstate(all='ignore'):
+                line.set_ydata(broadcast_result(func(freq * x), x.shape))
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.ax.set_title(f"Frequency: {freq:.2f} × x in {equation}", fontsize=14)
             
         self.animation_obj = animation.FuncAnimation(
             self.fig, update, interval=self.anim_speed.get(), repeat=True
         )
-        self.canvas.draw()
+        self.request_render()
         
     def animate_growing(self):
         """Animate growing function"""
@@ -1111,7 +4130,7 @@ class SuperMathGUI:
         if not equation:
             return
             
-        x_full = np.linspace(self.x_min.get(), self.x_max.get(), self.num_points.get())
+        x_full = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
         
         try:
             x_sym = sp.symbols('x')
@@ -1146,11 +4165,153 @@ class SuperMathGUI:
         self.animation_obj = animation.FuncAnimation(
             self.fig, update, interval=self.anim_speed.get(), repeat=True
         )
-        self.canvas.draw()
+        self.request_render()
         
+    def animate_fourier(self):
+        """Animate Fourier partial sums of the current equation from precomputed rows"""
+        equation = self.equation_text.get('1.0', tk.END).strip()
+        if not equation:
+            return
+            
+        x0, x1 = self.x_min.get(), self.x_max.get()
+        x = np.linspace(x0, x1, min(self.display_points(), 2000))
+        terms = max(self.fourier_terms.get(), 1)
+        
+        try:
+            _, func = self.compile_equation(equation)
+            partial = fourier_partial_sums(func, x0, x1, x, terms).astype(PRECISIONS[self.precision.get()], copy=False)
+            with np.errstate(all='ignore'):
+                y = broadcast_result(func(x), x.shape)
+        except Exception as e:
+            messagebox.showerror("Error", f"Fourier series error: {str(e)}")
+            self.stop_animation()
+            return
+            
+        self.ax.clear()
+        colors = self.color_schemes[self.current_scheme]
+        self.ax.plot(x, y, color=colors[0], gid=SCHEME_GID, linewidth=1, alpha=0.4, label=f"y = {equation}")
+        line, = self.ax.plot(x, partial[0], color=colors[1], gid=SCHEME_GID, linewidth=self.line_width.get(),
+                             label="Partial sum")
+        finite = partial[np.isfinite(partial)]
+        if finite.size:
+            low, high = np.percentile(finite, [0.5, 99.5])
+            pad = 0.1 * (high - low or 1)
+            self.ax.set_ylim(low - pad, high + pad)
+        self.apply_plot_styling()
+        
+        def update(frame):
+            if not self.is_animating:
+                return
+                
+            k = frame % (terms + 1)
+            line.set_ydata(partial[k])
+            self.ax.set_title(f"Fourier series: {k} harmonic{'s' if k != 1 else ''}", fontsize=14)
+            
+        self.animation_obj = animation.FuncAnimation(
+            self.fig, update, interval=self.anim_speed.get(), repeat=True
+        )
+        self.request_render()
+        
+    def start_taylor_animation(self):
+        """Animate Taylor polynomials by order from the Calculus tab"""
+        self.stop_animation()
+        self.anim_type.set("taylor")
+        self.start_animation()
+        
+    def animate_taylor(self):
+        """Step through Taylor polynomials of increasing order from precomputed partial sums"""
+        equation = self.equation_text.get('1.0', tk.END).strip()
+        if not equation:
+            return
+            
+        x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+        center = self.tangent_x.get()
+        order = max(self.taylor_order.get(), 1)
+        
+        try:
+            expr, func = self.compile_equation(equation)
+            partial = taylor_partial_sums(
+                self.taylor_coefficients(equation, expr, sp.symbols('x'), center, order),
+                x - center).astype(PRECISIONS[self.precision.get()], copy=False)
+            with np.errstate(all='ignore'):
+                y = broadcast_result(func(x), x.shape)
+        except Exception as e:
+            messagebox.showerror("Error", f"Taylor series error: {str(e)}")
+            self.stop_animation()
+            return
+            
+        self.ax.clear()
+        colors = self.color_schemes[self.current_scheme]
+        self.ax.plot(x, y, color=colors[0], gid=SCHEME_GID, linewidth=self.line_width.get(), label=f"y = {equation}")
+        line, = self.ax.plot(x, partial[0], color=colors[1], gid=SCHEME_GID, linewidth=self.line_width.get(),
+                             linestyle='--', label="Taylor polynomial")
+        self.ax.plot(center, partial[0, 0], 'o', color=self.theme_color("foreground"), gid=THEME_GID, markersize=6)
+        self.apply_plot_styling()
+        
+        def update(frame):
+            if not self.is_animating:
+                return
+                
+            k = frame % (order + 1)
+            line.set_ydata(partial[k])
+            self.ax.set_title(f"Taylor polynomial of order {k} about x={center:.2f}", fontsize=14)
+            
+        self.animation_obj = animation.FuncAnimation(
+            self.fig, update, interval=self.anim_speed.get(), repeat=True
+        )
+        self.request_render()
+        
+    def show_spectrum(self):
+        """Show the FFT amplitude spectrum of every plotted curve in a separate window"""
+        curves = {}
+        for eq, x, y in self.current_functions:
+            curves[eq] = (x, y)
+        if not curves:
+            messagebox.showwarning("Warning", "Plot a 2D function first!")
+            return
+            
+        try:
+            if self.spectrum_window is None or not self.spectrum_window.winfo_exists():
+                self.spectrum_window = tk.Toplevel(self.root)
+                self.spectrum_window.title("Spectrum")
+                self.spectrum_window.configure(bg=self.theme_color("figure"))
+                self.spectrum_fig = Figure(figsize=(8, 4), facecolor=self.theme_color("figure"))
+                self.spectrum_canvas = FigureCanvasTkAgg(self.spectrum_fig, master=self.spectrum_window)
+                self.spectrum_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                NavigationToolbar2Tk(self.spectrum_canvas, self.spectrum_window).update()
+                
+            self.spectrum_fig.clear()
+            ax = self.spectrum_fig.add_subplot(111)
+            ax.set_facecolor(self.theme_color("axes"))
+            
+            colors = self.color_schemes[self.current_scheme]
+            result_text = "Dominant frequencies (cycles per unit x)\n"
+            result_text += f"─" * 30 + "\n"
+            for i, (eq, (x, y)) in enumerate(curves.items()):
+                freqs, amplitude = curve_spectrum(x, y)
+                ax.semilogy(freqs[1:], np.maximum(amplitude[1:], 1e-16),
+                            color=colors[i % len(colors)], gid=SCHEME_GID, linewidth=1.2, label=eq)
+                top = np.argsort(amplitude[1:])[::-1][:3] + 1
+                result_text += f"{eq}\n"
+                for j in top:
+                    result_text += f"  f={freqs[j]:.4f}  |A|={amplitude[j]:.4g}\n"
+                    
+            ax.set_xlabel("Frequency (cycles per unit x)")
+            ax.set_ylabel("Amplitude")
+            ax.set_title("FFT Amplitude Spectrum", color=self.theme_color("foreground"))
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='best', framealpha=0.8)
+            self.spectrum_canvas.draw()
+            
+            self.results_text.delete('1.0', tk.END)
+            self.results_text.insert('1.0', result_text)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Spectrum error: {str(e)}")
+            
     def animate_3d_rotation(self):
         """Animate 3D plot rotation"""
-        if self.plot_mode.get() != "3D":
+        if not self.is_3d_mode():
             messagebox.showinfo("Info", "Switch to 3D mode first!")
             self.stop_animation()
             return
@@ -1164,42 +4325,1171 @@ class SuperMathGUI:
         self.animation_obj = animation.FuncAnimation(
             self.fig, update, interval=self.anim_speed.get(), repeat=True
         )
-        self.canvas.draw()
+        self.request_render()
         
     def on_click(self, event):
         """Handle mouse clicks on plot"""
-        if event.inaxes != self.ax:
+        if event.inaxes != self.ax or event.xdata is None or event.ydata is None:
             return
             
-        # Add point marker
-        self.ax.plot(event.xdata, event.ydata, 'yo', markersize=10, 
-                    markeredgecolor='red', markeredgewidth=2)
+        # Rotate a dense parametric surface using its coarse preview
+        if self.plot_mode.get() in ("Param3D", "Cylindrical", "Spherical"):
+            self.show_param3d_detail(False)
+            
+        # In ODE mode a click seeds a new trajectory
+        if self.plot_mode.get() == "ODE" and self.ode_lines is not None:
+            self.add_ode_trajectory(event.xdata, event.ydata)
+            return
+            
+        # Mark the snapped curve point when the click lands on a curve
+        x, y = event.xdata, event.ydata
+        if not self.is_3d_mode():
+            snap = self.snap_to_curves(x, y)
+            if snap is not None:
+                x, y = snap[0], snap[1]
+            
+        # Add point marker to one shared line instead of a new artist per click
+        if self.click_marker_line is None or self.click_marker_line not in self.ax.lines:
+            self.click_marker_line, = self.ax.plot([], [], 'yo', markersize=10,
+                                                   markeredgecolor='red', markeredgewidth=2,
+                                                   zorder=6)
+        xs, ys = self.click_marker_line.get_data()
+        self.click_marker_line.set_data(np.append(xs, x), np.append(ys, y))
         
         # Show coordinates
-        self.ax.annotate(f"({event.xdata:.2f}, {event.ydata:.2f})",
-                        xy=(event.xdata, event.ydata),
-                        xytext=(event.xdata+0.5, event.ydata+0.5),
-                        arrowprops=dict(arrowstyle='->', color='yellow'),
-                        fontsize=10, color='yellow',
-                        bbox=dict(boxstyle='round,pad=0.3', fc='black', alpha=0.7))
-                        
-        self.canvas.draw()
+        note = self.ax.annotate(f"({x:.2f}, {y:.2f})",
+                                xy=(x, y), xytext=(x+0.5, y+0.5),
+                                arrowprops=dict(arrowstyle='->', color='yellow'),
+                                fontsize=10, color='yellow',
+                                bbox=dict(boxstyle='round,pad=0.3', fc='black', alpha=0.7))
+                                
+        # Paint only the new artists over the cached background
+        if self.hover_background is not None and not self.is_3d_mode() and not self.is_animating:
+            self.pending_click_artists.append(note)
+            self.request_render(self.paint_click_artists)
+        else:
+            self.request_render()
+            
+    def paint_click_artists(self):
+        """Blit the click markers and notes added since the last frame into the cached background"""
+        notes, self.pending_click_artists = self.pending_click_artists, []
+        if self.hover_background is None:
+            return
+        self.canvas.restore_region(self.hover_background)
+        for artist in [self.click_marker_line] + notes:
+            if artist.axes is not None:
+                artist.axes.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+        self.hover_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.paint_overlays()
+            
+    def on_release(self, event):
+        """Restore full detail once a 3D rotation ends"""
+        if self.plot_mode.get() in ("Param3D", "Cylindrical", "Spherical") and self.show_param3d_detail(True):
+            self.request_render()
+            
+    def on_draw(self, event):
+        """Cache the freshly drawn canvas for blitting the hover overlay"""
+        self.hover_background = self.canvas.copy_from_bbox(self.fig.bbox)
         
     def on_hover(self, event):
         """Handle mouse hover over plot"""
-        if event.inaxes != self.ax:
+        if event.inaxes != self.ax or event.xdata is None or event.ydata is None:
+            self.hide_hover()
+            return
+            
+        # Complex mode reports f(z) under the cursor
+        if self.plot_mode.get() == "Complex" and self.complex_func is not None:
+            z = complex(event.xdata, event.ydata)
+            with np.errstate(all='ignore'):
+                w = complex(self.complex_func(z))
+            self.toolbar.set_message(f"z={z.real:.3f}{z.imag:+.3f}i, f(z)={w.real:.4f}{w.imag:+.4f}i, "
+                                     f"|f|={abs(w):.4f}, arg={np.angle(w):.3f}")
+            return
+            
+        # Plain coordinates where snapping does not apply
+        if self.is_3d_mode() or self.is_animating or self.hover_background is None:
+            self.toolbar.set_message(f"x={event.xdata:.3f}, y={event.ydata:.3f}")
             return
             
-        # Update toolbar with coordinates
-        if event.xdata is not None and event.ydata is not None:
+        self.hover_snap = self.snap_to_curves(event.xdata, event.ydata)
+        if self.hover_snap is None:
             self.toolbar.set_message(f"x={event.xdata:.3f}, y={event.ydata:.3f}")
+            self.hide_hover()
+            return
+            
+        x, y, slope, label = self.hover_snap
+        self.toolbar.set_message(f"{label}: x={x:.4f}, f(x)={y:.4f}, f'(x)={slope:.4f}")
+        
+        # Move the crosshair and tooltip
+        self.ensure_hover_artists()
+        vline, hline, point, tip = self.hover_artists
+        vline.set_xdata([x, x])
+        hline.set_ydata([y, y])
+        point.set_data([x], [y])
+        tip.xy = (x, y)
+        tip.set_text(f"{label}\nx = {x:.4f}\nf(x) = {y:.4f}\nf'(x) = {slope:.4f}")
+        for artist in self.hover_artists:
+            artist.set_visible(True)
+        self.blit_overlays()
+        
+    def ensure_hover_artists(self):
+        """Create the animated crosshair artists if the axes have been cleared"""
+        if self.hover_artists and self.hover_artists[0] in self.ax.lines:
+            return
+            
+        color = self.theme_color("foreground")
+        vline = self.ax.axvline(0, color=color, gid=THEME_GID, linewidth=0.8, alpha=0.6,
+                                animated=True, visible=False)
+        hline = self.ax.axhline(0, color=color, gid=THEME_GID, linewidth=0.8, alpha=0.6,
+                                animated=True, visible=False)
+        point, = self.ax.plot([], [], 'o', markersize=9, markerfacecolor='none',
+                              markeredgecolor='yellow', markeredgewidth=2,
+                              animated=True, visible=False)
+        tip = self.ax.annotate("", xy=(0, 0), xytext=(15, 15), textcoords='offset points',
+                               fontsize=9, color='yellow', annotation_clip=False,
+                               bbox=dict(boxstyle='round,pad=0.3', fc='black', alpha=0.7),
+                               animated=True, visible=False)
+        self.hover_artists = [vline, hline, point, tip]
+        
+    def blit_overlays(self):
+        """Queue a blit of the animated overlays for the next frame"""
+        self.request_render(self.paint_overlays, overlay=True)
+        
+    def paint_overlays(self):
+        """Blit the animated overlays (stream trace, hover crosshair) over the cached background"""
+        if self.hover_background is None:
+            return
+            
+        artists = []
+        if self.stream_line is not None and self.stream_line in self.ax.lines:
+            artists.append(self.stream_line)
+        if self.hover_artists and self.hover_artists[0] in self.ax.lines:
+            artists.extend(a for a in self.hover_artists if a.get_visible())
+            
+        self.canvas.restore_region(self.hover_background)
+        for artist in artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+        
+    def hide_hover(self):
+        """Remove the hover overlay from the screen"""
+        self.hover_snap = None
+        if not any(artist.get_visible() for artist in self.hover_artists):
+            return
+        for artist in self.hover_artists:
+            artist.set_visible(False)
+        self.blit_overlays()
+        
+    def build_hover_index(self):
+        """Group the plotted curves by sample grid so one binary search serves each group"""
+        latest = {}
+        for eq, x, y in self.current_functions:
+            latest[eq] = (x, y)
+            
+        groups = {}
+        for eq, (x, y) in latest.items():
+            x = np.asarray(x, dtype=float)
+            y = broadcast_result(y, x.shape)
+            if len(x) < 2:
+                continue
+            if x[0] > x[-1]:
+                x, y = x[::-1], y[::-1]
+            key = (len(x), float(x[0]), float(x[-1]))
+            groups.setdefault(key, (x, [], []))
+            groups[key][1].append(y)
+            groups[key][2].append(f"y = {eq}")
+            
+        self.hover_index = []
+        for x, ys, labels in groups.values():
+            Y = np.vstack(ys)
+            with np.errstate(all='ignore'):
+                dY = np.gradient(Y, x, axis=1)
+            self.hover_index.append((x, Y, dY, labels))
+            
+    def snap_to_curves(self, xdata, ydata, radius=40):
+        """Return (x, y, slope, label) of the nearest curve point within radius pixels"""
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        sx = self.ax.bbox.width / (x1 - x0)
+        sy = self.ax.bbox.height / (y1 - y0)
+        best_dist = radius ** 2
+        best = None
+        
+        # 2-D functions: binary search on each shared x grid
+        if self.plot_mode.get() in ("2D", "Stream"):
+            if self.hover_index is None:
+                self.build_hover_index()
+            for x, Y, dY, labels in self.hover_index:
+                i = np.searchsorted(x, xdata)
+                cand = np.clip([i - 1, i], 0, len(x) - 1)
+                dist = ((x[cand] - xdata) * sx) ** 2 + ((Y[:, cand] - ydata) * sy) ** 2
+                dist = np.where(np.isfinite(dist), dist, np.inf)
+                r, c = np.unravel_index(np.argmin(dist), dist.shape)
+                if dist[r, c] < best_dist:
+                    j = cand[c]
+                    best_dist = dist[r, c]
+                    best = (x[j], Y[r, j], dY[r, j], labels[r])
+                    
+        # Parametric and polar curves: KD-tree in screen-scaled coordinates
+        elif (self.plot_mode.get() == "Parametric" and self.parametric_data is not None
+              or self.plot_mode.get() == "Polar" and self.polar_data is not None):
+            t, px, py = self.parametric_data if self.plot_mode.get() == "Parametric" else self.polar_data
+            key = (sx, sy)
+            if self.hover_tree is None or self.hover_tree[0] != key:
+                finite = np.isfinite(px) & np.isfinite(py)
+                idx = np.nonzero(finite)[0]
+                tree = cKDTree(np.column_stack((px[idx] * sx, py[idx] * sy)))
+                with np.errstate(all='ignore'):
+                    slopes = np.gradient(py, t) / np.gradient(px, t)
+                self.hover_tree = (key, tree, idx, slopes)
+            _, tree, idx, slopes = self.hover_tree
+            if len(idx):
+                dist, k = tree.query((xdata * sx, ydata * sy))
+                if dist ** 2 < best_dist:
+                    j = idx[k]
+                    name = "t" if self.plot_mode.get() == "Parametric" else "θ"
+                    best = (px[j], py[j], slopes[j], f"{name} = {t[j]:.4f}")
+                    
+        return best
+        
+    def start_stream(self):
+        """Start ingesting live samples and plotting them over the analytic curves"""
+        self.stop_stream()
+        self.enter_plot_mode("Stream")
+        
+        # Analytic functions form the static background, with the equation box added to them
+        equation = self.equation_text.get('1.0', tk.END).strip()
+        if equation and all(eq != equation for eq, _, _ in self.current_functions):
+            try:
+                _, func = self.compile_equation(equation)
+                x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+                with np.errstate(all='ignore'):
+                    self.current_functions.append((equation, x, broadcast_result(func(x), x.shape)))
+            except Exception as e:
+                messagebox.showerror("Error", f"Invalid equation: {str(e)}")
+                
+        if self.current_functions:
+            self.draw_overlays()
+        else:
+            self.ax.clear()
+            self.apply_plot_styling()
+            
+        color = self.color_schemes[self.current_scheme][-1]
+        self.stream_line, = self.ax.plot([], [], color=color, gid=SCHEME_GID, linewidth=1, animated=True)
+        self.request_render()
+        
+        self.stream_buffer = RingBuffer(self.stream_capacity.get())
+        self.stream_reader = StreamReader(self.stream_buffer, self.stream_source.get(),
+                                          self.stream_target.get(), self.stream_format.get())
+        self.stream_reader.start()
+        self.stream_rate = (0, time.perf_counter(), 0.0)
+        self.stream_job = self.root.after(self.stream_interval.get(), self.update_stream)
+        
+    def stop_stream(self):
+        """Stop the live data stream"""
+        if self.stream_job is not None:
+            self.root.after_cancel(self.stream_job)
+            self.stream_job = None
+        if self.stream_reader is not None:
+            self.stream_reader.stop()
+            self.stream_reader = None
+            self.stream_status.config(text="Stopped")
+            
+    def update_stream(self):
+        """Redraw the stream trace from the ring buffer on a timer"""
+        reader = self.stream_reader
+        if reader is None:
+            return
+            
+        values, count = self.stream_buffer.snapshot()
+        
+        # Map the buffer window onto the current x range, like a scope sweep
+        buckets = max(int(self.ax.bbox.width), 100)
+        positions, shown = minmax_decimate(values, buckets)
+        x0, x1 = self.x_min.get(), self.x_max.get()
+        xs = x0 + (x1 - x0) * positions / max(len(values) - 1, 1)
+        
+        if self.stream_line not in self.ax.lines:
+            color = self.color_schemes[self.current_scheme][-1]
+            self.stream_line, = self.ax.plot([], [], color=color, gid=SCHEME_GID, linewidth=1, animated=True)
+        self.stream_line.set_data(xs, shown)
+        self.blit_overlays()
+        
+        # Ingest rate, smoothed over timer ticks
+        last_count, last_time, rate = self.stream_rate
+        now = time.perf_counter()
+        if now > last_time:
+            rate = 0.8 * rate + 0.2 * (count - last_count) / (now - last_time)
+        self.stream_rate = (count, now, rate)
+        
+        if reader.error:
+            self.stop_stream()
+            self.stream_status.config(text=f"Error: {reader.error}")
+            return
+        self.stream_status.config(text=f"{count:,} samples • {rate:,.0f}/s • buffer {len(values):,}")
+        
+        self.stream_job = self.root.after(self.stream_interval.get(), self.update_stream)
+        
+    def complex_image_size(self):
+        """Return the (width, height) in pixels for the domain coloring image"""
+        choice = self.complex_resolution.get()
+        if choice == 'Window':
+            return max(int(self.ax.bbox.width), 64), max(int(self.ax.bbox.height), 64)
+        width, height = choice.split('x')
+        return int(width), int(height)
+        
+    def plot_complex(self):
+        """Render f(z) over the X/Y rectangle as a domain-colored image"""
+        try:
+            if self.plot_mode.get() != "Complex":
+                self.plot_mode.set("Complex")
+                self.switch_plot_mode()
+                
+            z_sym = sp.symbols('z')
+            expr = sp.sympify(self.complex_equation.get())
+            self.complex_func = sp.lambdify(z_sym, expr, modules=['numpy'])
+            
+            self.ax.clear()
+            self.complex_artist = None
+            self.ax.set_xlabel('Re(z)', fontsize=12)
+            self.ax.set_ylabel('Im(z)', fontsize=12)
+            self.ax.set_title(f"f(z) = {self.complex_equation.get()}", fontsize=14)
+            
+            extent = (self.x_min.get(), self.x_max.get(), self.y_min.get(), self.y_max.get())
+            self.render_complex(extent)
+            
+            # Re-render at full detail whenever the view is zoomed or panned
+            self.ax.callbacks.connect('xlim_changed', self.on_complex_zoom)
+            self.ax.callbacks.connect('ylim_changed', self.on_complex_zoom)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Complex plotting error: {str(e)}")
+            
+    def compile_ode(self, dx, dy):
+        """Lambdify a planar system into one fused, vectorized right-hand side"""
+        return self.compile_components([dx, dy], ['x', 'y'])
+        
+    def plot_ode(self):
+        """Draw the direction field and integrate a grid of trajectories"""
+        try:
+            if self.plot_mode.get() != "ODE":
+                self.plot_mode.set("ODE")
+                self.switch_plot_mode()
+                
+            start = time.perf_counter()
+            self.ode_rhs = self.compile_ode(self.ode_dx.get(), self.ode_dy.get())
+            bounds = (self.x_min.get(), self.x_max.get(), self.y_min.get(), self.y_max.get())
+            x0, x1, y0, y1 = bounds
+            
+            self.ax.clear()
+            
+            # Direction field from one vectorized evaluation, arrows of equal length
+            cells = 25
+            sx, sy = (x1 - x0) / cells, (y1 - y0) / cells
+            X, Y = np.meshgrid(np.linspace(x0, x1, cells), np.linspace(y0, y1, cells))
+            with np.errstate(all='ignore'):
+                U, V = self.ode_rhs(X, Y)
+                U = broadcast_result(U, X.shape) / sx
+                V = broadcast_result(V, X.shape) / sy
+                speed = np.hypot(U, V)
+                U = U / speed * sx * 0.7
+                V = V / speed * sy * 0.7
+            self.ax.quiver(X, Y, U, V, np.log1p(speed), cmap='cool', angles='xy',
+                           scale_units='xy', scale=1, pivot='mid', width=0.002,
+                           headwidth=4, alpha=0.6)
+            
+            # Trajectories from a grid of seeds plus any earlier clicks
+            n = self.ode_grid.get()
+            seeds = list(self.ode_seeds)
+            if n > 0:
+                gx, gy = np.meshgrid(np.linspace(x0, x1, n + 2)[1:-1], np.linspace(y0, y1, n + 2)[1:-1])
+                seeds = np.column_stack([gx.ravel(), gy.ravel()]).tolist() + seeds
+            paths = integrate_trajectories(self.ode_rhs, seeds, self.ode_span.get(), bounds)
+            
+            colors = plt.cm.rainbow(np.linspace(0, 1, max(len(paths), 1)))
+            self.ode_lines = LineCollection(list(paths), colors=colors, linewidths=1.2, alpha=0.9)
+            self.ax.add_collection(self.ode_lines)
+            self.ax.set_xlim(x0, x1)
+            self.ax.set_ylim(y0, y1)
+            
+            self.ax.set_title(f"dx/dt = {self.ode_dx.get()},  dy/dt = {self.ode_dy.get()}", fontsize=14)
+            self.ax.set_xlabel('x', fontsize=12)
+            self.ax.set_ylabel('y', fontsize=12)
+            self.apply_plot_styling()
+            self.request_render()
+            elapsed = time.perf_counter() - start
+            
+            result_text = f"Trajectories: {len(paths)}\n"
+            result_text += f"Time span: ±{self.ode_span.get():g}\n"
+            result_text += f"Time: {elapsed*1000:.1f} ms\n"
+            result_text += fused_report(self.fused_stats)
+            self.results_text.delete('1.0', tk.END)
+            self.results_text.insert('1.0', result_text)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"ODE plotting error: {str(e)}")
+            
+    def add_ode_trajectory(self, x, y):
+        """Integrate one extra trajectory from a clicked point"""
+        try:
+            bounds = self.ax.get_xlim() + self.ax.get_ylim()
+            path = integrate_trajectories(self.ode_rhs, [(x, y)], self.ode_span.get(), bounds)[0]
+            self.ode_seeds.append((x, y))
+            segments = list(self.ode_lines.get_segments()) + [path]
+            colors = list(self.ode_lines.get_colors()) + [(1.0, 1.0, 0.0, 1.0)]
+            self.ode_lines.set_segments(segments)
+            self.ode_lines.set_colors(colors)
+            self.ax.plot([x], [y], 'o', color='yellow', markersize=5)
+            self.request_render()
+        except Exception as e:
+            messagebox.showerror("Error", f"ODE integration error: {str(e)}")
+            
+    def evaluate_param3d(self, kind, n):
+        """Evaluate x, y and z with one broadcast call each on compact float32 grids"""
+        exprs = [self.param3d_x.get(), self.param3d_y.get(), self.param3d_z.get()]
+        u0, u1 = self.u_min.get(), self.u_max.get()
+        v0, v1 = self.v_min.get(), self.v_max.get()
+        
+        if kind == "curve":
+            names, ranges = ['t'], [(u0, u1)]
+            grids = [np.linspace(u0, u1, n, dtype=np.float32)]
+            shape = (n,)
+        else:
+            # Open grids: u down the rows, v across the columns, never meshgridded
+            names, ranges = ['u', 'v'], [(u0, u1), (v0, v1)]
+            grids = [np.linspace(u0, u1, n, dtype=np.float32)[:, np.newaxis],
+                     np.linspace(v0, v1, n, dtype=np.float32)[np.newaxis, :]]
+            shape = (n, n)
+            
+        func = self.compile_components(exprs, names)
+        
+        def evaluate():
+            result = np.empty((3,) + shape, dtype=np.float32)
+            with np.errstate(all='ignore'):
+                for out, values in zip(result, func(*grids)):
+                    out[...] = np.asarray(values, dtype=np.float32)
+            return result
+            
+        return self.cached_evaluate(exprs, names, ranges, list(shape), evaluate)
+        
+    def plot_param3d(self):
+        """Plot a 3D parametric curve or surface"""
+        try:
+            if self.plot_mode.get() != "Param3D":
+                self.plot_mode.set("Param3D")
+                self.switch_plot_mode()
+            self.cancel_param3d_refine()
+            
+            kind = self.param3d_kind.get()
+            n = self.param3d_resolution.get() if kind == "surface" else self.display_points()
+            X, Y, Z = self.evaluate_param3d(kind, n)
+            self.draw_param3d(kind, X, Y, Z, n,
+                              f"({self.param3d_x.get()}, {self.param3d_y.get()}, {self.param3d_z.get()})")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"3D parametric plotting error: {str(e)}")
+            
+    def draw_param3d(self, kind, X, Y, Z, n, title):
+        """Draw an evaluated 3D curve, or a surface as a coarse preview refined on idle"""
+        self.ax.clear()
+        self.param3d_artists = None
+        
+        if kind == "curve":
+            # One gradient collection for the whole curve
+            points = np.column_stack([X, Y, Z])
+            segments = np.stack([points[:-1], points[1:]], axis=1)
+            self.ax.add_collection(Line3DCollection(
+                segments, colors=plt.cm.rainbow(np.linspace(0, 1, n))[:-1], linewidths=2))
+            self.ax.auto_scale_xyz(X, Y, Z)
+        else:
+            self.current_mesh = (X, Y, Z)
+            
+            # Coarse preview now, full resolution once the event loop is idle
+            coarse = self.ax.plot_surface(X, Y, Z, rcount=min(n, 48), ccount=min(n, 48),
+                                          cmap='plasma', edgecolor='none', antialiased=False)
+            self.param3d_artists = [coarse, None]
+            if n > 48:
+                self.param3d_job = self.root.after(1, self.refine_param3d, X, Y, Z, n)
+                
+        # Keep shapes such as a torus round
+        spans = [np.nanmax(a) - np.nanmin(a) for a in (X, Y, Z)]
+        self.ax.set_box_aspect([max(span, 1e-3 * max(spans)) for span in spans])
+        
+        self.ax.set_xlabel('X', fontsize=12)
+        self.ax.set_ylabel('Y', fontsize=12)
+        self.ax.set_zlabel('Z', fontsize=12)
+        self.ax.view_init(elev=self.elevation.get(), azim=self.azimuth.get())
+        self.ax.set_title(title, fontsize=12, color=self.theme_color("foreground"))
+        self.request_render()
+        
+    def plot_coordinates(self, system):
+        """Plot r = f(θ) in polar, or r(θ, z) / r(θ, φ) as a cylindrical or spherical surface"""
+        try:
+            if self.plot_mode.get() != system:
+                self.plot_mode.set(system)
+                self.switch_plot_mode()
+            self.cancel_param3d_refine()
+            
+            equation = {"Polar": self.polar_r, "Cylindrical": self.cylinder_r,
+                        "Spherical": self.sphere_r}[system].get()
+            names = COORDINATE_SYSTEMS[system]
+            func = self.compile_components([equation], names)
+            
+            theta0, theta1 = self.theta_min.get(), self.theta_max.get()
+            if system == "Polar":
+                n = self.display_points()
+                grids = [np.linspace(theta0, theta1, n)]
+                ranges, shape = [(theta0, theta1)], (n,)
+            else:
+                # Open grids: theta down the rows, z or phi across the columns
+                n = self.coord_resolution.get()
+                other = (self.coord_z_min.get(), self.coord_z_max.get()) if system == "Cylindrical" else (0, np.pi)
+                grids = [np.linspace(theta0, theta1, n)[:, np.newaxis], np.linspace(*other, n)[np.newaxis, :]]
+                ranges, shape = [(theta0, theta1), other], (n, n)
+                
+            r = self.cached_evaluate([equation], names, ranges, list(shape),
+                                     lambda: self.evaluate_precision(f"r = {equation}", func, grids, shape,
+                                                                     outputs=1)[0])
+            r = np.asarray(r)
+            with np.errstate(all='ignore'):
+                coords = coordinate_transform(system, r, *grids)
+                
+            if system != "Polar":
+                self.draw_param3d("surface", *coords, n, f"r = {equation}")
+                return
+                
+            # One gradient collection for the whole polar curve
+            x, y = coords
+            self.polar_data = (grids[0].astype(r.dtype, copy=False), x, y)
+            self.hover_tree = None
+            self.ax.clear()
+            points = np.column_stack([x, y])
+            segments = np.stack([points[:-1], points[1:]], axis=1)
+            self.ax.add_collection(LineCollection(segments, colors=plt.cm.rainbow(np.linspace(0, 1, n))[:-1],
+                                                  linewidths=self.line_width.get()))
+            self.ax.set_title(f"r = {equation}", fontsize=14, color=self.theme_color("foreground"))
+            self.apply_plot_styling()
+            
+            # Square view around the largest radius instead of the x/y ranges
+            extent = np.nanmax(np.abs(r), initial=0.0) if np.isfinite(r).any() else 0.0
+            extent = 1.1 * extent if np.isfinite(extent) and extent > 0 else 1.0
+            self.ax.set_xlim(-extent, extent)
+            self.ax.set_ylim(-extent, extent)
+            self.ax.set_aspect('equal', adjustable='box')
+            self.request_render()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Coordinate plotting error: {str(e)}")
+            
+    def refine_param3d(self, X, Y, Z, n):
+        """Replace the coarse parametric surface with the full-resolution one"""
+        self.param3d_job = None
+        if self.param3d_artists is None:
+            return
+        fine = self.ax.plot_surface(X, Y, Z, rcount=n, ccount=n, cmap='plasma',
+                                    edgecolor='none', antialiased=False)
+        self.param3d_artists[1] = fine
+        self.show_param3d_detail(True)
+        self.request_render()
+        
+    def show_param3d_detail(self, detailed):
+        """Swap between the coarse and full-resolution surface; return whether anything changed"""
+        if not self.param3d_artists or self.param3d_artists[1] is None:
+            return False
+        coarse, fine = self.param3d_artists
+        changed = fine.get_visible() != detailed
+        coarse.set_visible(not detailed)
+        fine.set_visible(detailed)
+        return changed
+        
+    def cancel_param3d_refine(self):
+        """Stop a pending full-resolution surface refinement"""
+        if self.param3d_job is not None:
+            self.root.after_cancel(self.param3d_job)
+            self.param3d_job = None
+            
+    def build_dashboard(self):
+        """Lay out a grid of panels in one figure, with the x-based panels sharing one x-axis"""
+        if self.plot_mode.get() != "Dashboard":
+            self.plot_mode.set("Dashboard")
+            self.switch_plot_mode()
+            return
+            
+        self.fig.clear()
+        kinds = DASHBOARD_LAYOUTS[self.dashboard_size.get()]
+        side = int(np.sqrt(len(kinds)))
+        background = self.theme_color("axes")
+        
+        self.dashboard_panels = []
+        shared = None
+        for i, kind in enumerate(kinds):
+            if kind == "surface":
+                ax = self.fig.add_subplot(side, side, i + 1, projection='3d')
+            elif kind in ("f", "f'", "f''", "integral"):
+                ax = self.fig.add_subplot(side, side, i + 1, sharex=shared)
+                shared = shared or ax
+            else:
+                ax = self.fig.add_subplot(side, side, i + 1)
+            ax.set_facecolor(background)
+            ax.tick_params(labelsize=8)
+            self.dashboard_panels.append({"kind": kind, "ax": ax, "artists": None, "inputs": None})
+            
+        # Hover and clicks follow the main function panel
+        self.ax = self.dashboard_panels[0]["ax"]
+        self.fig.tight_layout()
+        self.update_dashboard(full=True)
+        
+    def dashboard_inputs(self, kind):
+        """Return everything a panel depends on, so unchanged panels can be skipped"""
+        if kind == "surface":
+            return (self.z_text.get('1.0', tk.END).strip(), self.x_min.get(), self.x_max.get(),
+                    self.y_min.get(), self.y_max.get())
+        if kind == "parametric":
+            return (self.param_x.get(), self.param_y.get(), self.t_min.get(), self.t_max.get())
+        return (self.equation_text.get('1.0', tk.END).strip(), self.x_min.get(), self.x_max.get(),
+                min(self.display_points(), 2000))
+                
+    def dashboard_data(self, kind, inputs):
+        """Evaluate the data one panel shows"""
+        if kind == "surface":
+            equation, x0, x1, y0, y1 = inputs
+            func = sp.lambdify(sp.symbols('x y'), sp.sympify(equation), modules=['numpy'])
+            x, y = np.linspace(x0, x1, 40), np.linspace(y0, y1, 40)
+            X, Y = np.meshgrid(x, y)
+            return X, Y, chunked_evaluate(func, [x[np.newaxis, :], y[:, np.newaxis]], X.shape)
+        if kind == "parametric":
+            x_eq, y_eq, t0, t1 = inputs
+            t = np.linspace(t0, t1, 1000)
+            return tuple(chunked_evaluate(self.compile_components([x_eq, y_eq], ['t']), [t], t.shape, outputs=2))
+                         
+        equation, x0, x1, n = inputs
+        _, func = self.compile_equation(equation)
+        x = np.linspace(x0, x1, n)
+        with np.errstate(all='ignore'):
+            y = broadcast_result(func(x), x.shape)
+            if kind == "f":
+                return x, y
+            dy = np.gradient(y, x)
+            if kind == "f'":
+                return x, dy
+            if kind == "f''":
+                return x, np.gradient(dy, x)
+            if kind == "integral":
+                finite = np.where(np.isfinite(y), y, 0.0)
+                return x, np.concatenate(([0.0], np.cumsum((finite[1:] + finite[:-1]) / 2 * np.diff(x))))
+            if kind == "phase":
+                return y, dy
+            if kind == "spectrum":
+                freqs, amplitude = curve_spectrum(x, y)
+                return freqs[1:], np.maximum(amplitude[1:], 1e-16)
+            counts, edges = np.histogram(y[np.isfinite(y)], bins=40)
+            return counts, edges
+            
+    def draw_dashboard_panel(self, panel, data):
+        """Update a panel's artists in place, creating them the first time"""
+        kind, ax = panel["kind"], panel["ax"]
+        if panel["artists"] is not None and panel["artists"].axes is None:
+            # The panel was cleared from elsewhere
+            panel["artists"] = None
+        colors = self.color_schemes[self.current_scheme]
+        color = colors[self.dashboard_panels.index(panel) % len(colors)]
+        titles = {"f": "f(x)", "f'": "f'(x)", "f''": "f''(x)", "integral": "∫ f dx",
+                  "phase": "Phase plane (f, f')", "spectrum": "Spectrum |F|",
+                  "histogram": "Histogram of f", "surface": "z = f(x, y)", "parametric": "(x(t), y(t))"}
+                  
+        if kind == "surface":
+            # 3D meshes cannot be updated in place
+            ax.clear()
+            ax.plot_surface(*data, cmap='viridis', edgecolor='none', rcount=40, ccount=40)
+            ax.tick_params(labelsize=7)
+        elif kind == "histogram":
+            counts, edges = data
+            if panel["artists"] is None:
+                panel["artists"] = ax.stairs(counts, edges, fill=True, color=color, gid=SCHEME_GID, alpha=0.7)
+            else:
+                panel["artists"].set_data(counts, edges)
+        else:
+            if panel["artists"] is None:
+                panel["artists"], = ax.plot(*data, color=color, gid=SCHEME_GID, linewidth=1.2)
+                ax.grid(True, alpha=self.grid_alpha.get())
+                if kind == "spectrum":
+                    ax.set_yscale('log')
+            else:
+                panel["artists"].set_data(*data)
+        ax.set_title(titles[kind], fontsize=10)
+        ax.relim()
+        ax.autoscale_view()
+        
+    def redraw_panel(self, ax):
+        """Repaint one panel's region of the canvas and blit just that region"""
+        renderer = self.canvas.get_renderer()
+        region = Bbox.union([ax.bbox, ax.get_tightbbox(renderer)]).padded(2)
+        
+        # Cover the old labels and ticks with the figure background first
+        backdrop = Rectangle((region.x0, region.y0), region.width, region.height,
+                             transform=IdentityTransform(), facecolor=self.fig.get_facecolor(),
+                             edgecolor='none')
+        backdrop.set_figure(self.fig)
+        backdrop.draw(renderer)
+        ax.draw(renderer)
+        self.canvas.blit(region)
+        
+    def redraw_dirty_panels(self):
+        """Repaint every panel changed since the last frame"""
+        panels, self.dirty_panels = self.dirty_panels, []
+        for ax in panels:
+            if ax in self.fig.axes:
+                self.redraw_panel(ax)
+                
+        # Keep the hover background in step with the partial redraws
+        self.hover_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        
+    def update_dashboard(self, full=False):
+        """Recompute and redraw only the panels whose inputs changed"""
+        if not self.dashboard_panels:
+            self.build_dashboard()
+            return
+            
+        try:
+            timings = []
+            for panel in self.dashboard_panels:
+                inputs = self.dashboard_inputs(panel["kind"])
+                if inputs == panel["inputs"] and not full:
+                    continue
+                start = time.perf_counter()
+                self.draw_dashboard_panel(panel, self.dashboard_data(panel["kind"], inputs))
+                panel["inputs"] = inputs
+                if not full and panel["ax"] not in self.dirty_panels:
+                    self.dirty_panels.append(panel["ax"])
+                timings.append((panel["kind"], time.perf_counter() - start))
+                
+            if full:
+                self.request_render()
+            elif self.dirty_panels:
+                self.request_render(self.redraw_dirty_panels)
+                
+            result_text = f"Dashboard {self.dashboard_size.get()}: {len(timings)} panel(s) updated\n"
+            result_text += f"─" * 30 + "\n"
+            for kind, elapsed in timings:
+                result_text += f"{kind:<12} {elapsed*1000:.1f} ms\n"
+            self.results_text.delete('1.0', tk.END)
+            self.results_text.insert('1.0', result_text)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Dashboard error: {str(e)}")
+            
+    def evaluate_complex(self, extent, width, height, rows=None):
+        """Evaluate f on a complex grid in one call and convert it to RGB"""
+        x0, x1, y0, y1 = extent
+        re = np.linspace(x0, x1, width)
+        im = np.linspace(y0, y1, height)
+        if rows is not None:
+            im = im[rows]
+        Z = re[np.newaxis, :] + 1j * im[:, np.newaxis]
+        with np.errstate(all='ignore'):
+            W = np.asarray(self.complex_func(Z), dtype=complex)
+        return domain_coloring_rgb(np.broadcast_to(W, Z.shape))
+        
+    def complex_rgba(self, rgb):
+        """Add an opaque alpha channel so imshow can skip its own conversion"""
+        rgba = np.empty(rgb.shape[:2] + (4,), dtype=np.uint8)
+        rgba[..., :3] = rgb
+        rgba[..., 3] = 255
+        return rgba
+        
+    def render_complex(self, extent):
+        """Show a coarse preview immediately, then refine it tile by tile"""
+        self.cancel_complex_render()
+        self.complex_generation += 1
+        width, height = self.complex_image_size()
+        
+        # Coarse pass at 1/8 resolution, upsampled into the full image buffer
+        step = 8
+        coarse = self.evaluate_complex(extent, max(width // step, 2), max(height // step, 2))
+        image = np.repeat(np.repeat(coarse, step, axis=0), step, axis=1)
+        pad_h, pad_w = max(height - image.shape[0], 0), max(width - image.shape[1], 0)
+        image = np.pad(image, ((0, pad_h), (0, pad_w), (0, 0)), mode='edge')[:height, :width]
+        self.complex_image = self.complex_rgba(image)
+        
+        if self.complex_artist is None or self.complex_artist not in self.ax.images:
+            self.complex_artist = self.ax.imshow(self.complex_image, extent=extent, origin='lower',
+                                                 interpolation='nearest', aspect='auto')
+            self.ax.set_autoscale_on(False)
+        else:
+            self.complex_artist.set_data(self.complex_image)
+            self.complex_artist.set_extent(extent)
+        self.request_render()
+        
+        # Full-resolution tiles follow on idle callbacks
+        tile = max(height // 4, 1)
+        self.complex_job = self.root.after(1, self.render_complex_tile,
+                                           self.complex_generation, extent, 0, tile)
+                                           
+    def render_complex_tile(self, generation, extent, start, tile):
+        """Replace one band of rows with its full-resolution evaluation"""
+        if generation != self.complex_generation or self.complex_image is None:
+            return
+            
+        height, width = self.complex_image.shape[:2]
+        rows = slice(start, min(start + tile, height))
+        self.complex_image[rows, :, :3] = self.evaluate_complex(extent, width, height, rows)
+        self.complex_artist.set_data(self.complex_image)
+        self.request_render()
+        
+        if rows.stop < height:
+            self.complex_job = self.root.after(1, self.render_complex_tile,
+                                               generation, extent, rows.stop, tile)
+        else:
+            self.complex_job = None
+            
+    def cancel_complex_render(self):
+        """Drop any pending domain coloring tiles"""
+        self.complex_generation += 1
+        if self.complex_job is not None:
+            self.root.after_cancel(self.complex_job)
+            self.complex_job = None
+            
+    def on_complex_zoom(self, ax):
+        """Re-render the visible rectangle after zooming or panning"""
+        if self.plot_mode.get() != "Complex" or self.complex_func is None:
+            return
+        self.cancel_complex_render()
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        self.complex_job = self.root.after(150, self.render_complex, (x0, x1, y0, y1))
+        
+    def import_data(self):
+        """Memory-map a CSV, .npy or raw binary file on a background thread and overlay it"""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Data files", "*.csv *.tsv *.txt *.dat *.npy *.bin *.raw"), ("CSV", "*.csv"),
+                       ("NumPy arrays", "*.npy"), ("Raw binary", "*.bin *.raw"), ("All files", "*.*")]
+        )
+        if not filepath or (self.data_thread is not None and self.data_thread.is_alive()):
+            return
+            
+        dtype, columns = self.data_dtype.get(), max(self.data_columns.get(), 1)
+        x_column, y_column = self.data_x_column.get(), self.data_y_column.get()
+        folder = self.result_cache().data_directory()
+        started = time.perf_counter()
+        
+        def run():
+            try:
+                table = open_dataset(filepath, dtype, columns, folder)
+                if y_column >= table.shape[1]:
+                    raise ValueError(f"file has {table.shape[1]} column(s), no column {y_column}")
+                y = table[:, y_column]
+                x = table[:, x_column] if 0 <= x_column < table.shape[1] and x_column != y_column else None
+                x_range = scan_column(x) if x is not None else (0, len(y) - 1, True)
+                y_range = scan_column(y)[:2]
+                self.data_result = dict(name=os.path.basename(filepath), path=filepath, x=x, y=y,
+                                        rows=len(y), columns=table.shape[1], x_range=x_range[:2],
+                                        y_range=y_range, ascending=x_range[2],
+                                        seconds=time.perf_counter() - started, artist=None)
+            except Exception as e:
+                self.data_result = e
+                
+        self.data_result = None
+        self.toolbar.set_message(f"Importing {os.path.basename(filepath)}...")
+        self.data_thread = threading.Thread(target=run, daemon=True)
+        self.data_thread.start()
+        self.data_job = self.root.after(100, self.finish_import)
+        
+    def finish_import(self):
+        """Overlay the imported dataset once its background scan has finished"""
+        self.data_job = None
+        if self.data_thread.is_alive():
+            self.data_job = self.root.after(100, self.finish_import)
+            return
+            
+        dataset = self.data_result
+        if isinstance(dataset, Exception) or dataset is None:
+            messagebox.showerror("Error", f"Data import error: {str(dataset)}")
+            return
+            
+        # Switch first: the switch clears the plot and with it the list of datasets
+        self.enter_plot_mode("2D")
+        self.datasets.append(dataset)
+        self.result_cache().evict()
+        x0, x1 = dataset['x_range']
+        y0, y1 = dataset['y_range']
+        if np.isfinite([x0, x1, y0, y1]).all():
+            pad = (y1 - y0) * 0.05 or 1.0
+            self.x_min.set(float(x0))
+            self.x_max.set(float(x1) if x1 > x0 else float(x0) + 1)
+            self.y_min.set(float(y0 - pad))
+            self.y_max.set(float(y1 + pad))
+            
+        self.draw_overlays()
+        
+        result_text = f"Imported {dataset['name']}\n"
+        result_text += f"Rows: {dataset['rows']:,} x {dataset['columns']} columns\n"
+        result_text += f"File: {os.path.getsize(dataset['path']) / 1024**2:.1f} MB (memory-mapped)\n"
+        result_text += f"Scan time: {dataset['seconds']:.2f}s\n"
+        result_text += f"─" * 30 + "\n"
+        result_text += f"X: {x0:.6g} to {x1:.6g}{'' if dataset['ascending'] else ' (unsorted)'}\n"
+        result_text += f"Y: {y0:.6g} to {y1:.6g}\n"
+        result_text += f"Displayed points: {len(dataset['artist'].get_xdata()):,}\n"
+        self.results_text.delete('1.0', tk.END)
+        self.results_text.insert('1.0', result_text)
+        self.toolbar.set_message("")
+        
+    def remove_data(self):
+        """Remove every imported dataset from the plot"""
+        self.datasets = []
+        self.draw_overlays()
+        
+    def dataset_rows(self, dataset, x0, x1):
+        """Return the (start, stop) rows of a dataset covering x0..x1, or every row if x is unsorted"""
+        x, n = dataset['x'], dataset['rows']
+        if not dataset['ascending']:
+            return 0, n
+        if x is None:
+            start, stop = int(np.clip(np.floor(x0), 0, n)), int(np.clip(np.ceil(x1) + 1, 0, n))
+        else:
+            start = max(int(np.searchsorted(x, x0)) - 1, 0)
+            stop = min(int(np.searchsorted(x, x1, side='right')) + 1, n)
+        return start, max(stop, start)
+        
+    def dataset_samples(self, dataset):
+        """Min/max decimate the rows of a dataset that fall in the visible x range"""
+        x, y = dataset['x'], dataset['y']
+        start, stop = self.dataset_rows(dataset, *self.ax.get_xlim())
+        rows = decimate_rows(y, start, stop, max(int(self.ax.bbox.width), 100))
+        xs = np.asarray(x[rows], dtype=float) if x is not None else rows.astype(float)
+        return xs, np.asarray(y[rows], dtype=float)
+        
+    def draw_datasets(self):
+        """Overlay every imported dataset, decimated to the visible range"""
+        if not self.datasets:
+            return
+        self.ax.set_xlim(self.x_min.get(), self.x_max.get())
+        colors = self.color_schemes[self.current_scheme]
+        for i, dataset in enumerate(self.datasets):
+            color = colors[(len(self.current_functions) + i) % len(colors)]
+            x, y = self.dataset_samples(dataset)
+            style = dict(linewidth=0.8) if dataset['ascending'] else dict(linestyle='none', marker='.', markersize=2)
+            dataset['artist'] = self.ax.plot(x, y, color=color, gid=SCHEME_GID, alpha=0.8,
+                                             label=f"{dataset['name']} ({dataset['rows']:,} rows)", **style)[0]
+                                             
+        if self.data_callbacks is not self.ax.callbacks:
+            self.data_callbacks = self.ax.callbacks
+            self.ax.callbacks.connect('xlim_changed', self.on_data_zoom)
+            
+    def on_data_zoom(self, ax):
+        """Re-decimate imported datasets for the new view after zooming or panning"""
+        if not self.datasets or ax is not self.ax:
+            return
+        if self.data_zoom_job is not None:
+            self.root.after_cancel(self.data_zoom_job)
+        self.data_zoom_job = self.root.after(150, self.refresh_datasets)
+        
+    def refresh_datasets(self):
+        """Swap in freshly decimated samples for the visible range"""
+        self.data_zoom_job = None
+        for dataset in self.datasets:
+            if dataset['artist'] is not None and dataset['artist'].axes is self.ax:
+                dataset['artist'].set_data(*self.dataset_samples(dataset))
+        self.request_render()
+        
+    def fit_data(self):
+        """Data to fit: the visible rows of the last imported dataset, else the last plotted curve
+        
+        Returns (label, x, y) as in-memory float arrays of finite samples,
+        strided down to the maximum fit size.
+        """
+        limit = max(self.fit_max_points.get(), 10)
+        if self.datasets:
+            dataset = self.datasets[-1]
+            start, stop = self.dataset_rows(dataset, self.x_min.get(), self.x_max.get())
+            step = max(-(-(stop - start) // limit), 1)
+            y = np.asarray(dataset['y'][start:stop:step], dtype=float)
+            if dataset['x'] is None:
+                x = np.arange(start, stop, step, dtype=float)
+            else:
+                x = np.asarray(dataset['x'][start:stop:step], dtype=float)
+            label = dataset['name']
+        elif self.current_functions:
+            label, x, y = self.current_functions[-1]
+            step = max(-(-len(x) // limit), 1)
+            x, y = np.asarray(x[::step], dtype=float), np.asarray(y[::step], dtype=float)
+        else:
+            raise ValueError("import data or plot a 2D function first")
+            
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+        return label, np.ascontiguousarray(x), np.ascontiguousarray(y)
+        
+    def fit_curve(self):
+        """Fit the model's parameters to the data by multi-start least squares on a background thread"""
+        if self.fit_thread is not None and self.fit_thread.is_alive():
+            return
+            
+        try:
+            model = self.fit_model.get().strip()
+            params, _, _ = compile_fit(model)
+            names = [p.name for p in params]
+            p0 = np.ones(len(params))
+            for item in filter(None, (part.strip() for part in self.fit_start.get().split(','))):
+                name, value = (side.strip() for side in item.split('='))
+                if name not in names:
+                    raise ValueError(f"'{name}' is not a parameter of the model ({', '.join(names)})")
+                p0[names.index(name)] = float(sp.sympify(value))
+            label, x, y = self.fit_data()
+            dataset = self.datasets[-1] if self.datasets else None
+            curve = None if dataset is not None else self.current_functions[-1]
+            if len(x) <= len(params):
+                raise ValueError(f"need more than {len(params)} finite samples, found {len(x)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Fit error: {str(e)}")
+            return
+            
+        starts = fit_starts(p0, max(self.fit_starts.get(), 1))
+        loss = self.fit_loss.get()
+        workers = max(min(os.cpu_count() or 1, len(starts) // FIT_STARTS_PER_WORKER), 1)
+        started = time.perf_counter()
+        
+        def run():
+            try:
+                (best, cost, nfev), reached, completed = multistart_fit(model, x, y, starts, loss, workers)
+                self.fit_result = dict(model=model, names=names, values=best, cost=cost, nfev=nfev,
+                                       label=label, x=x, y=y, dataset=dataset, curve=curve, starts=len(starts),
+                                       reached=reached, completed=completed, workers=workers, loss=loss,
+                                       seconds=time.perf_counter() - started)
+            except Exception as e:
+                self.fit_result = e
+                
+        self.fit_result = None
+        self.toolbar.set_message(f"Fitting {model} to {len(x):,} points from {len(starts)} starts...")
+        self.fit_thread = threading.Thread(target=run, daemon=True)
+        self.fit_thread.start()
+        self.fit_job = self.root.after(100, self.finish_fit)
+        
+    def finish_fit(self):
+        """Overlay the fitted curve and report parameters and residual statistics"""
+        self.fit_job = None
+        if self.fit_thread.is_alive():
+            self.fit_job = self.root.after(100, self.finish_fit)
+            return
+            
+        fit = self.fit_result
+        self.toolbar.set_message("")
+        if isinstance(fit, Exception) or fit is None:
+            self.fit_result = None
+            messagebox.showerror("Error", f"Fit error: {str(fit)}")
+            return
+            
+        try:
+            params, func, _ = compile_fit(fit['model'])
+            values = fit['values']
+            problem = FitProblem(func, fit['x'], fit['y'])
+            residuals = problem.residuals(values)
+            J = problem.jacobian(values)
+            n, m = len(residuals), len(values)
+            ss_res = float(residuals @ residuals)
+            ss_tot = float(np.sum((fit['y'] - fit['y'].mean()) ** 2))
+            with np.errstate(all='ignore'):
+                covariance = np.linalg.pinv(J.T @ J) * ss_res / max(n - m, 1)
+            errors = np.sqrt(np.abs(np.diag(covariance)))
+            fit.update(residuals=residuals, errors=errors, rmse=np.sqrt(ss_res / n),
+                       r2=1 - ss_res / ss_tot if ss_tot > 0 else float('nan'))
+            
+            expr = sp.sympify(fit['model']).xreplace({p: sp.Float(value, 8) for p, value in zip(params, values)})
+            fit['equation'] = str(expr)
+            
+            # Overlay the fitted model beside the data it was fitted to
+            x = np.linspace(self.x_min.get(), self.x_max.get(), self.display_points())
+            curve = chunked_evaluate(func, [x, *values], x.shape, outputs=m + 1)[0]
+            self.enter_plot_mode("2D")
+            
+            # Keep the fitted data on the plot even if a mode switch cleared it while the fit ran
+            if fit['dataset'] is not None and not any(d is fit['dataset'] for d in self.datasets):
+                self.datasets.append(fit['dataset'])
+            if fit['curve'] is not None and not any(c is fit['curve'] for c in self.current_functions):
+                self.current_functions.append(fit['curve'])
+            self.current_functions.append((fit['equation'], x, curve))
+            self.draw_overlays()
+            
+        except Exception as e:
+            self.fit_result = None
+            messagebox.showerror("Error", f"Fit error: {str(e)}")
+            return
+            
+        result_text = f"Fit: {fit['model']}\n"
+        result_text += f"Data: {fit['label']} ({n:,} points)\n"
+        result_text += f"─" * 30 + "\n"
+        for name, value, error in zip(fit['names'], values, errors):
+            result_text += f"{name} = {value:.8g} ± {error:.2g}\n"
+        result_text += f"─" * 30 + "\n"
+        result_text += f"RMSE: {fit['rmse']:.6g}\n"
+        result_text += f"R²: {fit['r2']:.8f}\n"
+        result_text += f"Loss: {fit['loss']}, cost {fit['cost']:.6g}\n"
+        result_text += f"Starts: {fit['reached']} of {fit['starts']} reached the best fit "
+        result_text += f"({fit['completed']} completed) on {fit['workers']} process(es)\n"
+        result_text += f"Evaluations (best start): {fit['nfev']}\n"
+        result_text += f"Time: {fit['seconds']:.2f}s\n"
+        self.results_text.delete('1.0', tk.END)
+        self.results_text.insert('1.0', result_text)
+        
+    def show_residuals(self):
+        """Plot the residuals of the last fit against x, with their distribution, in a separate window"""
+        fit = self.fit_result
+        if not isinstance(fit, dict) or 'residuals' not in fit:
+            messagebox.showwarning("Warning", "Fit a model first!")
+            return
+            
+        try:
+            if self.residual_window is None or not self.residual_window.winfo_exists():
+                self.residual_window = tk.Toplevel(self.root)
+                self.residual_window.title("Residuals")
+                self.residual_window.configure(bg=self.theme_color("figure"))
+                self.residual_fig = Figure(figsize=(9, 4), facecolor=self.theme_color("figure"))
+                self.residual_canvas = FigureCanvasTkAgg(self.residual_fig, master=self.residual_window)
+                self.residual_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                NavigationToolbar2Tk(self.residual_canvas, self.residual_window).update()
+                
+            self.residual_fig.clear()
+            ax, hist_ax = self.residual_fig.subplots(1, 2, gridspec_kw={'width_ratios': [3, 1]})
+            color = self.color_schemes[self.current_scheme][0]
+            x, residuals = fit['x'], fit['residuals']
+            
+            # Residuals in x order, min/max decimated so a million points stay quick to draw
+            order = np.argsort(x, kind='stable')
+            rows = order[decimate_rows(residuals[order], 0, len(order), 2000)]
+            for axes in (ax, hist_ax):
+                axes.set_facecolor(self.theme_color("axes"))
+                axes.grid(True, alpha=0.3)
+            ax.plot(x[rows], residuals[rows], color=color, linewidth=0.8)
+            ax.axhline(0, color=self.theme_color("foreground"), gid=THEME_GID, linewidth=0.5, alpha=0.5)
+            ax.set_xlabel("x")
+            ax.set_ylabel("Residual (model - data)")
+            ax.set_title(f"Residuals of y = {fit['equation']}", color=self.theme_color("foreground"))
+            hist_ax.hist(residuals, bins=60, orientation='horizontal', color=color, alpha=0.7)
+            hist_ax.set_xlabel("Count")
+            self.residual_fig.tight_layout()
+            self.residual_canvas.draw()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Residual plot error: {str(e)}")
             
     def clear_plot(self):
         """Clear the plot"""
+        self.cancel_envelope()
         self.ax.clear()
         self.current_functions = []
+        self.datasets = []
+        self.current_surface = None
+        self.current_mesh = None
+        self.parametric_data = None
+        self.polar_data = None
+        self.ode_lines = None
+        self.ode_seeds = []
+        self.param3d_artists = None
+        self.hover_index = None
+        self.hover_tree = None
         self.apply_plot_styling()
-        self.canvas.draw()
+        self.request_render()
         
     def save_plot(self):
         """Save plot to file"""
@@ -1214,12 +5504,103 @@ class SuperMathGUI:
         )
         
         if filepath:
-            self.fig.savefig(filepath, dpi=150, bbox_inches='tight',
-                           facecolor=self.fig.get_facecolor())
-            messagebox.showinfo("Success", f"Plot saved to {filepath}")
+            try:
+                report = self.export_figure([filepath])
+                messagebox.showinfo("Success", f"Plot saved:\n{report}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Export error: {str(e)}")
+                
+    def save_plot_formats(self):
+        """Save the plot as PNG, SVG and PDF side by side"""
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("All formats", "*.*")]
+        )
+        
+        if filepath:
+            base = os.path.splitext(filepath)[0]
+            try:
+                report = self.export_figure([f"{base}.{ext}" for ext in ("png", "svg", "pdf")])
+                messagebox.showinfo("Success", f"Plot saved:\n{report}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Export error: {str(e)}")
+                
+    def heavy_artists(self, min_vertices=1000):
+        """Return the surfaces, dense collections, fills and images worth rasterizing"""
+        heavy = []
+        for ax in self.fig.axes:
+            for artist in ax.get_children():
+                if isinstance(artist, AxesImage):
+                    heavy.append(artist)
+                elif isinstance(artist, Collection):
+                    # Scatter-style collections repeat one marker path at every offset
+                    count = max(len(artist.get_offsets()),
+                                sum(len(path.vertices) for path in artist.get_paths()))
+                    if count >= min_vertices:
+                        heavy.append(artist)
+        return heavy
+        
+    def export_figure(self, paths):
+        """Write the figure to each path with one shared layout and report size and time"""
+        dpi = self.export_dpi.get()
+        heavy = self.heavy_artists() if self.rasterize_export.get() else []
+        previous = [artist.get_rasterized() for artist in heavy]
+        
+        try:
+            # Heavy artists become embedded images; axes, text and legends stay vectors
+            for artist in heavy:
+                artist.set_rasterized(True)
+                
+            # Compute the tight bounding box once instead of once per file
+            renderer = self.fig.canvas.get_renderer()
+            bbox = self.fig.get_tightbbox(renderer).padded(0.1)
+            
+            lines = []
+            for path in paths:
+                start = time.perf_counter()
+                self.fig.savefig(path, dpi=dpi, bbox_inches=bbox,
+                                 facecolor=self.fig.get_facecolor())
+                elapsed = time.perf_counter() - start
+                size = os.path.getsize(path)
+                lines.append(f"{os.path.basename(path)}: {size / 1024:.1f} KB in {elapsed:.2f}s")
+        finally:
+            for artist, flag in zip(heavy, previous):
+                artist.set_rasterized(flag)
+                
+        if heavy:
+            lines.append(f"{len(heavy)} heavy artist(s) rasterized at {dpi} dpi")
+        return "\n".join(lines)
+            
+    def export_mesh(self):
+        """Export the current surface as an STL, OBJ, PLY or binary glTF mesh"""
+        if self.current_mesh is None:
+            messagebox.showwarning("Warning", "Plot a 3D surface first!")
+            return
             
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".stl",
+            filetypes=[("Binary STL", "*.stl"), ("Wavefront OBJ", "*.obj"), ("Binary PLY", "*.ply"),
+                       ("Binary glTF", "*.glb"), ("All files", "*.*")]
+        )
+        
+        if filepath:
+            try:
+                start = time.perf_counter()
+                vertices, triangles = write_mesh(filepath, *self.current_mesh,
+                                                 keep=min(max(self.mesh_detail.get(), 1), 100) / 100)
+                elapsed = time.perf_counter() - start
+                size = os.path.getsize(filepath)
+                messagebox.showinfo("Success", f"Mesh exported to {filepath}\n"
+                                               f"{vertices:,} vertices, {triangles:,} triangles\n"
+                                               f"{size / 1024**2:.1f} MB in {elapsed:.2f}s")
+            except Exception as e:
+                messagebox.showerror("Error", f"Mesh export error: {str(e)}")
+                
     def export_data(self):
         """Export plot data to CSV"""
+        if not self.current_functions and self.current_mesh is not None:
+            self.export_mesh()
+            return
         if not self.current_functions:
             messagebox.showwarning("Warning", "No data to export!")
             return
@@ -1260,6 +5641,231 @@ class SuperMathGUI:
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save animation: {str(e)}")
                 
+    def workspace_variables(self):
+        """Map manifest keys to the Tk variables a workspace restores"""
+        return {
+            'plot_mode': self.plot_mode,
+            'x_min': self.x_min, 'x_max': self.x_max,
+            'y_min': self.y_min, 'y_max': self.y_max,
+            't_min': self.t_min, 't_max': self.t_max,
+            'num_points': self.num_points,
+            'param_x': self.param_x, 'param_y': self.param_y,
+            'plot_style': self.plot_style, 'line_width': self.line_width,
+            'marker_size': self.marker_size, 'grid_alpha': self.grid_alpha,
+            'show_grid': self.show_grid, 'show_minor_grid': self.show_minor_grid,
+            'show_legend': self.show_legend, 'show_axes': self.show_axes,
+            'dark_mode': self.dark_mode,
+            'show_derivatives': self.show_derivatives, 'show_integrals': self.show_integrals,
+            'show_tangent': self.show_tangent, 'show_area': self.show_area,
+            'tangent_x': self.tangent_x, 'int_lower': self.int_lower, 'int_upper': self.int_upper,
+            'elevation': self.elevation, 'azimuth': self.azimuth,
+            'surface_type': self.surface_type, 'surface_resolution': self.surface_resolution
+        }
+        
+    def save_workspace(self):
+        """Save the session as a JSON manifest with .npy sidecar arrays"""
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Workspace files", "*.json"), ("All files", "*.*")]
+        )
+        if not filepath:
+            return
+            
+        try:
+            data_dir = os.path.splitext(filepath)[0] + "_arrays"
+            os.makedirs(data_dir, exist_ok=True)
+            
+            def store(name, array):
+                # The array may be memory-mapped from the very file being replaced (a reloaded
+                # workspace saved again), so write a temporary file and swap it in afterwards
+                path = os.path.join(data_dir, name + ".npy")
+                temp = os.path.join(data_dir, f".{name}.{uuid.uuid4().hex}.npy")
+                try:
+                    np.save(temp, np.asarray(array))
+                    os.replace(temp, path)
+                finally:
+                    if os.path.exists(temp):
+                        os.remove(temp)
+                return os.path.join(os.path.basename(data_dir), name + ".npy")
+                
+            manifest = {
+                'version': 1,
+                'saved': datetime.now().isoformat(timespec='seconds'),
+                'equation': self.equation_text.get('1.0', tk.END).strip(),
+                'z_equation': self.z_text.get('1.0', tk.END).strip(),
+                'color_scheme': self.current_scheme,
+                'variables': {name: var.get() for name, var in self.workspace_variables().items()},
+                'overlays': []
+            }
+            
+            # Overlays, one pair of sample arrays each
+            latest = {}
+            for eq, x, y in self.current_functions:
+                latest[eq] = (x, y)
+            for i, (eq, (x, y)) in enumerate(latest.items()):
+                manifest['overlays'].append({
+                    'equation': eq,
+                    'hash': expression_hash(eq),
+                    'range': [float(x[0]), float(x[-1]), len(x)],
+                    'x': store(f"overlay_{i}_x", x),
+                    'y': store(f"overlay_{i}_y", y)
+                })
+                
+            # 3-D mesh and parametric curve
+            if self.current_surface is not None:
+                eq, x, y, Z = self.current_surface
+                manifest['surface'] = {
+                    'equation': eq,
+                    'hash': expression_hash(eq),
+                    'range': [float(x[0]), float(x[-1]), float(y[0]), float(y[-1]), list(Z.shape)],
+                    'x': store("surface_x", x),
+                    'y': store("surface_y", y),
+                    'z': store("surface_z", Z)
+                }
+            if self.parametric_data is not None:
+                t, x, y = self.parametric_data
+                manifest['parametric'] = {
+                    'hash': expression_hash(f"({self.param_x.get()}, {self.param_y.get()})"),
+                    'range': [float(t[0]), float(t[-1]), len(t)],
+                    't': store("parametric_t", t),
+                    'x': store("parametric_x", x),
+                    'y': store("parametric_y", y)
+                }
+                
+            with open(filepath, 'w') as f:
+                json.dump(manifest, f, indent=2)
+                
+            messagebox.showinfo("Success", f"Workspace saved to {filepath}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save workspace: {str(e)}")
+            
+    def load_workspace(self):
+        """Restore a saved session without re-evaluating cached arrays"""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Workspace files", "*.json"), ("All files", "*.*")]
+        )
+        if not filepath:
+            return
+            
+        try:
+            with open(filepath) as f:
+                manifest = json.load(f)
+            base_dir = os.path.dirname(filepath)
+            
+            def load(entry, *keys):
+                # A missing, truncated or non-float array makes the entry stale rather than failing the load
+                try:
+                    arrays = [np.load(os.path.join(base_dir, entry[key]), mmap_mode='r') for key in keys]
+                except (OSError, ValueError, KeyError):
+                    return None
+                if not all(a.size and np.issubdtype(a.dtype, np.floating) for a in arrays):
+                    return None
+                return arrays
+                
+            def matches(entry, equation, actual, current):
+                # Cached arrays are trusted only if the expression is unchanged and the range recorded
+                # with them agrees with both the arrays actually on disk and the restored settings
+                if entry.get('hash') != expression_hash(equation):
+                    return False
+                stored = np.hstack(entry['range']).astype(float)
+                actual, current = np.array(actual, dtype=float), np.array(current, dtype=float)
+                return (stored.shape == actual.shape == current.shape
+                        and np.allclose(actual, stored) and np.allclose(stored, current))
+                
+            # Restore settings
+            variables = self.workspace_variables()
+            for name, value in manifest.get('variables', {}).items():
+                if name in variables:
+                    variables[name].set(value)
+            self.set_equation(manifest.get('equation', ''))
+            self.set_3d_equation(manifest.get('z_equation', ''))
+            self.current_scheme = manifest.get('color_scheme', self.current_scheme)
+            self.scheme_combo.set(self.current_scheme)
+            self.toggle_theme()
+            self.switch_plot_mode()
+            
+            # Overlays: reuse samples, re-evaluating only those that fail validation
+            stale = []
+            for entry in manifest.get('overlays', []):
+                eq = entry['equation']
+                arrays = load(entry, 'x', 'y')
+                current = [self.x_min.get(), self.x_max.get(), self.display_points()]
+                if (arrays is not None and arrays[0].shape == arrays[1].shape == (len(arrays[0]),)
+                        and matches(entry, eq, [arrays[0][0], arrays[0][-1], len(arrays[0])], current)):
+                    self.current_functions.append((eq, *arrays))
+                else:
+                    stale.append(eq)
+                    x = np.linspace(current[0], current[1], current[2])
+                    _, func = self.compile_equation(eq)
+                    self.current_functions.append((eq, x, broadcast_result(func(x), x.shape)))
+                    
+            # Surface mesh
+            entry = manifest.get('surface')
+            if entry is not None:
+                arrays = load(entry, 'x', 'y', 'z')
+                shape = [max(self.surface_resolution.get(), 2)] * 2
+                current = [self.x_min.get(), self.x_max.get(), self.y_min.get(), self.y_max.get()] + shape
+                if arrays is not None and arrays[2].shape == (len(arrays[1]), len(arrays[0])):
+                    x, y, Z = arrays
+                    fresh = matches(entry, entry['equation'], [x[0], x[-1], y[0], y[-1], *Z.shape], current)
+                else:
+                    fresh = False
+                if not fresh:
+                    stale.append(entry['equation'])
+                    x = np.linspace(current[0], current[1], shape[1])
+                    y = np.linspace(current[2], current[3], shape[0])
+                    func = sp.lambdify(sp.symbols('x y'), sp.sympify(entry['equation']), modules=['numpy'])
+                    Z = broadcast_result(func(*np.meshgrid(x, y)), tuple(shape))
+                self.current_surface = (entry['equation'], x, y, Z)
+                
+            # Parametric curve
+            entry = manifest.get('parametric')
+            if entry is not None:
+                arrays = load(entry, 't', 'x', 'y')
+                curve = f"({self.param_x.get()}, {self.param_y.get()})"
+                current = [self.t_min.get(), self.t_max.get(), self.display_points()]
+                if (arrays is not None and arrays[0].shape == arrays[1].shape == arrays[2].shape == (len(arrays[0]),)
+                        and matches(entry, curve, [arrays[0][0], arrays[0][-1], len(arrays[0])], current)):
+                    self.parametric_data = tuple(arrays)
+                else:
+                    stale.append(curve)
+                    
+            # Draw whatever the restored mode shows
+            mode = self.plot_mode.get()
+            if mode == "3D" and self.current_surface is not None:
+                eq, x, y, Z = self.current_surface
+                X, Y = np.meshgrid(x, y)
+                self.draw_surface(eq, X, Y, Z)
+            elif mode == "Parametric" and self.parametric_data is not None:
+                self.draw_parametric(*self.parametric_data)
+            elif mode == "Parametric":
+                self.plot_parametric()
+            else:
+                self.draw_overlays()
+                
+            if stale:
+                messagebox.showinfo("Workspace", "Re-evaluated outdated cache for:\n" + "\n".join(stale))
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load workspace: {str(e)}")
+            
+    def draw_overlays(self):
+        """Draw every stored 2D function from its cached samples"""
+        self.ax.clear()
+        colors = self.color_schemes[self.current_scheme]
+        for i, (eq, x, y) in enumerate(self.current_functions):
+            color = colors[i % len(colors)]
+            self.ax.plot(x, y, color=color, gid=SCHEME_GID, linewidth=self.line_width.get(),
+                        label=f"y = {eq}")
+            if self.show_area.get():
+                self.plot_area_under_curve(x, y, color)
+                
+        self.draw_datasets()
+        self.hover_index = None
+        self.apply_plot_styling()
+        self.request_render()
+        
     def reset_and_demo(self):
         """Reset and show demo"""
         self.clear_plot()
@@ -1282,10 +5888,395 @@ class SuperMathGUI:
                     transform=self.ax.transAxes, fontsize=16,
                     ha='center', color='cyan', weight='bold')
         
-        self.canvas.draw()
+        self.request_render()
+
+
+RENDER_DEFAULTS = {
+    "mode": "2d", "equation": "sin(x) * cos(x/2)", "x_t": "cos(t)", "y_t": "sin(t)",
+    "x_min": -10.0, "x_max": 10.0, "y_min": None, "y_max": None, "t_min": 0.0, "t_max": 2 * np.pi,
+    "points": 1000, "resolution": 100, "format": "png", "width": 800, "height": 600, "dpi": 100,
+    "color": "#FF006E", "line_width": 2.0, "cmap": "viridis", "dark": True,
+}
+
+RENDER_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "json": "application/json"}
+
+# The only names a remote expression may use; nothing else reaches the parser
+RENDER_NAMES = {name: getattr(sp, name) for name in (
+    "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "atan2",
+    "sinh", "cosh", "tanh", "asinh", "acosh", "atanh", "exp", "log", "sqrt",
+    "Abs", "sign", "floor", "ceiling", "Min", "Max", "pi", "E", "I", "oo")}
+RENDER_NAMES.update(abs=sp.Abs, e=sp.E, ln=sp.log)
+RENDER_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+                ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd)
+RENDER_OPERATORS = {ast.Add: float.__add__, ast.Sub: float.__sub__, ast.Mult: float.__mul__,
+                    ast.Div: float.__truediv__, ast.Pow: float.__pow__, ast.Mod: float.__mod__}
+
+
+def constant_value(node):
+    """Value of a numbers-only syntax tree in float arithmetic, or None if it involves a name or call"""
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.UnaryOp):
+        value = constant_value(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.BinOp):
+        left, right = constant_value(node.left), constant_value(node.right)
+        if left is None or right is None:
+            return None
+        try:
+            return RENDER_OPERATORS[type(node.op)](left, right)
+        except (OverflowError, ZeroDivisionError):
+            return float('inf')
+    return None
+    
+
+
+def parse_render_expression(text, variables):
+    """Parse an untrusted expression into SymPy, allowing only arithmetic, numbers, variables and RENDER_NAMES
+    
+    The syntax tree is checked against a whitelist before parsing, and the
+    parser runs without builtins, so attribute access, keywords and calls
+    to anything but the listed functions are rejected with ValueError.
+    """
+    if len(text) > 1000:
+        raise ValueError("expression is too long")
+    try:
+        tree = ast.parse(text.replace('^', '**'), mode='eval')
+    except SyntaxError:
+        raise ValueError(f"invalid expression: {text}")
+    allowed = set(RENDER_NAMES) | set(variables)
+    for node in ast.walk(tree):
+        if not isinstance(node, RENDER_NODES):
+            raise ValueError(f"{type(node).__name__} is not allowed in expressions")
+        if isinstance(node, ast.Name) and node.id not in allowed:
+            raise ValueError(f"unknown name '{node.id}'; use {', '.join(variables)} and standard functions")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("only numeric constants are allowed in expressions")
+        if isinstance(node, ast.Constant) and not abs(node.value) <= 1e15:
+            raise ValueError("numeric constants must be at most 1e15")
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords
+                                           or not callable(RENDER_NAMES.get(node.func.id))):
+            raise ValueError("only the standard functions can be called in expressions")
+        # SymPy evaluates constant powers exactly, so 2**10**10 would never finish
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            exponent = constant_value(node.right)
+            if exponent is not None and not abs(exponent) <= 1000:
+                raise ValueError("constant exponents must be at most 1000")
+            
+    names = dict(RENDER_NAMES, **{name: sp.Symbol(name) for name in variables})
+    globals_ = {"__builtins__": {}, "Integer": sp.Integer, "Float": sp.Float, "Rational": sp.Rational,
+                "Symbol": sp.Symbol}
+    return parse_expr(text, local_dict=names, global_dict=globals_,
+                      transformations=standard_transformations + (convert_xor,))
+    
+
+
+def normalize_render_request(params):
+    """Validate a render request and fill in defaults, raising ValueError for bad input"""
+    request = dict(RENDER_DEFAULTS)
+    unknown = set(params) - set(request)
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+        
+    for key, value in params.items():
+        default = RENDER_DEFAULTS[key]
+        if value is None or value == "":
+            continue
+        if isinstance(default, bool):
+            request[key] = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+        elif isinstance(default, int):
+            request[key] = int(value)
+        elif isinstance(default, float) or key in ("y_min", "y_max"):
+            request[key] = float(value)
+        else:
+            request[key] = str(value)
+            
+    request["mode"] = request["mode"].lower()
+    request["format"] = request["format"].lower()
+    if request["mode"] not in ("2d", "3d", "parametric"):
+        raise ValueError("mode must be 2d, 3d or parametric")
+    if request["format"] not in RENDER_FORMATS:
+        raise ValueError("format must be png, svg or json")
+    if not (2 <= request["points"] <= 1000000 and 2 <= request["resolution"] <= 1000):
+        raise ValueError("points must be 2-1000000 and resolution 2-1000")
+    if not (16 <= request["width"] <= 8000 and 16 <= request["height"] <= 8000 and 10 <= request["dpi"] <= 600):
+        raise ValueError("width/height must be 16-8000 px and dpi 10-600")
+        
+    # Only the expressions this mode uses are parsed, each against the whitelist
+    for name in render_expressions(request):
+        parse_render_expression(request[name], render_variables(request))
+    return request
+    
+
+def render_expressions(request):
+    """Names of the request fields holding expressions for its mode"""
+    return ["x_t", "y_t"] if request["mode"] == "parametric" else ["equation"]
+    
+
+def render_variables(request):
+    """Variables a request's expressions may use"""
+    return {"2d": ["x"], "3d": ["x", "y"], "parametric": ["t"]}[request["mode"]]
+    
+
+def evaluate_render_request(request):
+    """Sample the request's curve or surface with the same helpers as the GUI"""
+    mode = request["mode"]
+    if mode == "2d":
+        x = np.linspace(request["x_min"], request["x_max"], request["points"])
+        func = sp.lambdify(sp.symbols('x'), parse_render_expression(request["equation"], ["x"]), modules=['numpy'])
+        with np.errstate(all='ignore'):
+            return {"x": x, "y": chunked_evaluate(func, [x], x.shape)}
+    if mode == "3d":
+        n = request["resolution"]
+        y_min = request["y_min"] if request["y_min"] is not None else request["x_min"]
+        y_max = request["y_max"] if request["y_max"] is not None else request["x_max"]
+        x, y = np.linspace(request["x_min"], request["x_max"], n), np.linspace(y_min, y_max, n)
+        func = sp.lambdify(sp.symbols('x y'), parse_render_expression(request["equation"], ["x", "y"]),
+                           modules=['numpy'])
+        with np.errstate(all='ignore'):
+            return {"x": x, "y": y, "z": chunked_evaluate(func, [x[np.newaxis, :], y[:, np.newaxis]], (n, n))}
+    t = np.linspace(request["t_min"], request["t_max"], request["points"])
+    func, _ = compile_fused([parse_render_expression(request[name], ["t"]) for name in ("x_t", "y_t")],
+                            [sp.symbols('t')])
+    with np.errstate(all='ignore'):
+        x, y = chunked_evaluate(func, [t], t.shape, outputs=2)
+    return {"t": t, "x": x, "y": y}
+                
+
+_render_figure = None
+
 
+def warm_render_worker():
+    """Build this worker process's figure and render once so later requests start warm"""
+    global _render_figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    _render_figure = Figure()
+    FigureCanvasAgg(_render_figure)
+    render_request(normalize_render_request({"points": 50}))
+    
+
+def render_request(request):
+    """Render one normalized request, returning (content type, body bytes)"""
+    data = evaluate_render_request(request)
+    if request["format"] == "json":
+        payload = {}
+        for key, values in data.items():
+            values = np.asarray(values, dtype=float)
+            cleaned = values.astype(object)
+            cleaned[~np.isfinite(values)] = None
+            payload[key] = cleaned.tolist()
+        return RENDER_FORMATS["json"], json.dumps(payload).encode()
+        
+    fig = _render_figure
+    if fig is None:
+        warm_render_worker()
+        fig = _render_figure
+    fig.clear()
+    dpi = request["dpi"]
+    fig.set_size_inches(request["width"] / dpi, request["height"] / dpi)
+    dark = request["dark"]
+    text = 'white' if dark else 'black'
+    fig.set_facecolor('#1a1a2e' if dark else 'white')
+    
+    mode = request["mode"]
+    ax = fig.add_subplot(111, projection='3d' if mode == "3d" else None)
+    ax.set_facecolor('#16213e' if dark else 'white')
+    if mode == "2d":
+        ax.plot(data["x"], data["y"], color=request["color"], linewidth=request["line_width"])
+        ax.set_title(f"y = {request['equation']}", color=text)
+        ax.set_xlim(request["x_min"], request["x_max"])
+        if request["y_min"] is not None and request["y_max"] is not None:
+            ax.set_ylim(request["y_min"], request["y_max"])
+    elif mode == "3d":
+        X, Y = np.meshgrid(data["x"], data["y"])
+        n = request["resolution"]
+        surf = ax.plot_surface(X, Y, data["z"], cmap=request["cmap"], alpha=0.8, edgecolor='none',
+                               rcount=n, ccount=n)
+        fig.colorbar(surf, ax=ax, shrink=0.5)
+        ax.set_title(f"z = {request['equation']}", color=text)
+    else:
+        points = np.column_stack([data["x"], data["y"]])
+        segments = np.stack([points[:-1], points[1:]], axis=1)
+        ax.add_collection(LineCollection(segments, colors=plt.cm.rainbow(np.linspace(0, 1, len(points)))[:-1],
+                                         linewidths=request["line_width"]))
+        ax.autoscale_view()
+        ax.set_title("Parametric: x(t), y(t)", color=text)
+        
+    if mode != "3d":
+        ax.grid(True, alpha=0.3)
+    ax.tick_params(colors=text)
+    
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=request["format"], dpi=dpi, facecolor=fig.get_facecolor())
+    return RENDER_FORMATS[request["format"]], buffer.getvalue()
+    
+
+class RenderService:
+    """Render requests on a pre-warmed process pool with an LRU response cache and bounded queue"""
+    
+    def __init__(self, workers, queue_size, cache_size):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.latencies = deque(maxlen=1000)
+        self.counts = {"requests": 0, "hits": 0, "misses": 0, "rejected": 0, "errors": 0}
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_render_worker)
+        
+        # Start every worker now rather than on the first requests
+        warmup = normalize_render_request({"points": 10, "format": "json"})
+        for future in [self.pool.submit(render_request, warmup) for _ in range(workers)]:
+            future.result()
+            
+    def key(self, request):
+        """Hash a normalized request into a cache key"""
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+        
+    def handle(self, params):
+        """Serve one request, returning (status, content type, body)"""
+        start = time.perf_counter()
+        with self.lock:
+            self.counts["requests"] += 1
+            
+        try:
+            request = normalize_render_request(params)
+        except (ValueError, TypeError) as e:
+            with self.lock:
+                self.counts["errors"] += 1
+            return 400, "application/json", json.dumps({"error": str(e)}).encode()
+            
+        key = self.key(request)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.counts["hits"] += 1
+                self.latencies.append(time.perf_counter() - start)
+                return (200,) + cached
+            self.counts["misses"] += 1
+            
+        # Back-pressure: refuse instead of queueing without bound
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.counts["rejected"] += 1
+            return 503, "application/json", json.dumps({"error": "render queue full, retry later"}).encode()
+            
+        try:
+            with self.lock:
+                self.in_flight += 1
+            content_type, body = self.pool.submit(render_request, request).result()
+        except Exception as e:
+            with self.lock:
+                self.counts["errors"] += 1
+            return 500, "application/json", json.dumps({"error": str(e)}).encode()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+            self.slots.release()
+            
+        with self.lock:
+            self.cache[key] = (content_type, body)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            self.latencies.append(time.perf_counter() - start)
+        return 200, content_type, body
+        
+    def metrics(self):
+        """Return request counts, cache hit ratio, queue depth and latency percentiles"""
+        with self.lock:
+            counts = dict(self.counts)
+            latencies = np.array(self.latencies) * 1000
+            in_flight = self.in_flight
+            entries = len(self.cache)
+        lookups = counts["hits"] + counts["misses"]
+        report = dict(counts, cache_entries=entries, in_flight=in_flight, queue_size=self.queue_size,
+                      workers=self.workers, hit_ratio=counts["hits"] / lookups if lookups else 0.0)
+        for p in (50, 90, 99):
+            report[f"latency_p{p}_ms"] = float(np.percentile(latencies, p)) if latencies.size else None
+        return report
+        
+    def close(self):
+        """Stop the worker processes"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for RenderService: /render (POST JSON only), /metrics and /health"""
+    
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/render":
+            # Renders are POST-only so a cross-site GET (an <img> tag, say) cannot trigger one
+            self.send_body(405, "application/json", b'{"error": "use POST with a JSON body"}')
+        elif url.path == "/metrics":
+            self.send_body(200, "application/json", json.dumps(self.server.service.metrics()).encode())
+        elif url.path == "/health":
+            self.send_body(200, "text/plain", b"ok")
+        else:
+            self.send_body(404, "application/json", b'{"error": "not found"}')
+            
+    def do_POST(self):
+        if urlparse(self.path).path != "/render":
+            self.send_body(404, "application/json", b'{"error": "not found"}')
+            return
+        if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+            self.send_body(415, "application/json", b'{"error": "Content-Type must be application/json"}')
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("body must be a JSON object")
+        except ValueError as e:
+            self.send_body(400, "application/json", json.dumps({"error": str(e)}).encode())
+            return
+        self.send_body(*self.server.service.handle(params))
+        
+    def log_message(self, format, *args):
+        pass
+        
+
+def serve(argv):
+    """Run the local HTTP render service: maths.py serve [--host H] [--port P] [--workers N] ..."""
+    parser = argparse.ArgumentParser(prog="maths.py serve", description="Local HTTP render service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue", type=int, default=32, help="maximum renders in flight before 503")
+    parser.add_argument("--cache-size", type=int, default=256, help="responses kept in the LRU cache")
+    args = parser.parse_args(argv)
+    
+    service = RenderService(max(args.workers, 1), max(args.queue, 1), max(args.cache_size, 0))
+    server = ThreadingHTTPServer((args.host, args.port), RenderRequestHandler)
+    server.service = service
+    print(f"Serving on http://{args.host}:{args.port} with {service.workers} render worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        
 
 def main():
+    # Worker processes of a frozen (PyInstaller) build re-run the executable; this stops them at once
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(sys.argv[2:])
+        return
     root = tk.Tk()
     app = SuperMathGUI(root)
     root.mainloop()
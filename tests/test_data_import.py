@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import maths
+
+
+def import_csv(tmp_path, text):
+    path = tmp_path / "data.csv"
+    path.write_text(text)
+    return np.asarray(maths.open_dataset(str(path), folder=str(tmp_path / "cache")))
+
+
+def test_missing_values_become_nan_in_their_own_column(tmp_path):
+    table = import_csv(tmp_path, "t,v\n1,2\n3,\n5,6\n7,\n")
+    expected = np.array([[1, 2], [3, np.nan], [5, 6], [7, np.nan]])
+    np.testing.assert_array_equal(table, expected)
+
+
+def test_missing_leading_and_middle_fields(tmp_path):
+    table = import_csv(tmp_path, "a;b;c\r\n;2;3\r\n4;;6\r\n7;8;9\r\n")
+    expected = np.array([[np.nan, 2, 3], [4, np.nan, 6], [7, 8, 9]])
+    np.testing.assert_array_equal(table, expected)
+
+
+def test_missing_value_in_first_data_row_keeps_column_count(tmp_path):
+    table = import_csv(tmp_path, "x,y\n1,\n2,3\n")
+    assert table.shape == (2, 2)
+    assert np.isnan(table[0, 1])
+
+
+@pytest.mark.parametrize("text", ["1,2\n3\n5,6\n", "1,2\nx,3\n", "1,2\n3,4,5\n"])
+def test_malformed_rows_are_reported(tmp_path, text):
+    with pytest.raises(ValueError):
+        import_csv(tmp_path, text)
+
+
+def test_rows_split_across_chunks(tmp_path):
+    rows = np.column_stack([np.arange(5000), np.arange(5000) * 0.5])
+    path = tmp_path / "big.csv"
+    np.savetxt(path, rows, delimiter=",", fmt="%.6g")
+    target = tmp_path / "big.f64"
+    assert maths.convert_csv(str(path), str(target), chunk=4096) == (5000, 2)
+    np.testing.assert_array_equal(np.fromfile(target).reshape(-1, 2), rows)
@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import tkinter as tk
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import maths
+
+
+class FakeWidget:
+    """Stands in for the Tk root and the widgets create_ui would build"""
+    def __init__(self, text=''):
+        self.text = text
+        self.pending = []
+
+    def get(self, *args):
+        return self.text + '\n'
+
+    def delete(self, *args):
+        self.text = ''
+
+    def insert(self, index, text):
+        self.text = text
+
+    def after(self, ms, func=None, *args):
+        self.pending.append((func, args))
+        return len(self.pending)
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def run_pending(self, limit=100):
+        for _ in range(limit):
+            if not self.pending:
+                break
+            func, args = self.pending.pop(0)
+            func(*args)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def fake_ui(app):
+    app.equation_text = FakeWidget("sin(x)")
+    app.z_text = FakeWidget("sin(x)*cos(y)")
+    app.results_text = FakeWidget()
+    app.toolbar = FakeWidget()
+    app.start_btn = FakeWidget()
+    app.stop_btn = FakeWidget()
+    app.fig = Figure(figsize=(8, 6))
+    app.ax = app.fig.add_subplot(111)
+    app.canvas = FigureCanvasAgg(app.fig)
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(tk, '_default_root', tk.Tcl(), raising=False)
+    monkeypatch.setattr(maths.SuperMathGUI, 'setup_dark_theme', lambda self: None)
+    monkeypatch.setattr(maths.SuperMathGUI, 'create_ui', fake_ui)
+    monkeypatch.setattr(maths.SuperMathGUI, 'reset_and_demo', lambda self: None)
+    monkeypatch.setattr(maths.messagebox, 'showerror', lambda title, message: pytest.fail(message))
+    app = maths.SuperMathGUI(FakeWidget())
+    app.render_scheduler = maths.RenderScheduler(app.root, app.canvas)
+    app.cache_dir.set(str(tmp_path / "cache"))
+    return app
+
+
+def finished_thread():
+    thread = threading.Thread(target=lambda: None)
+    thread.start()
+    thread.join()
+    return thread
+
+
+@pytest.mark.parametrize("mode", ["3D", "Parametric"])
+def test_import_from_another_mode_switches_to_2d_and_draws_the_data(app, mode):
+    app.plot_mode.set(mode)
+    app.switch_plot_mode()
+
+    x = np.linspace(0, 10, 1000)
+    app.data_result = dict(name="data.csv", path=__file__, x=x, y=np.sin(x), rows=len(x), columns=2,
+                           x_range=(0.0, 10.0), y_range=(-1.0, 1.0), ascending=True, seconds=0.0, artist=None)
+    app.data_thread = finished_thread()
+    app.finish_import()
+
+    assert app.plot_mode.get() == "2D"
+    assert len(app.datasets) == 1
+    artist = app.datasets[0]['artist']
+    assert artist is not None and artist in app.ax.lines
+    assert "Displayed points" in app.results_text.text
+
+
+def test_fit_finished_in_another_mode_draws_the_fit_over_its_data(app):
+    x = np.linspace(0, 10, 1000)
+    app.data_result = dict(name="data.csv", path=__file__, x=x, y=2 * np.sin(x + 0.5), rows=len(x), columns=2,
+                           x_range=(0.0, 10.0), y_range=(-2.0, 2.0), ascending=True, seconds=0.0, artist=None)
+    app.data_thread = finished_thread()
+    app.finish_import()
+
+    app.fit_starts.set(4)
+    app.fit_curve()
+    app.plot_mode.set("Parametric")
+    app.switch_plot_mode()
+    app.fit_thread.join()
+    app.finish_fit()
+
+    assert app.plot_mode.get() == "2D"
+    assert app.datasets and app.datasets[0]['artist'] in app.ax.lines
+    equation = app.fit_result['equation']
+    assert [eq for eq, _, _ in app.current_functions] == [equation]
+    assert f"y = {equation}" in [line.get_label() for line in app.ax.lines]
+
+
+def test_stream_draws_the_plotted_and_typed_functions_behind_the_samples(app, tmp_path):
+    app.equation_text.text = "x**2"
+    app.plot_function()
+    app.stream_source.set("file")
+    app.stream_target.set(str(tmp_path / "samples.txt"))
+    (tmp_path / "samples.txt").write_text("")
+    app.stream_status = FakeWidget()
+
+    app.equation_text.text = "cos(x)"
+    try:
+        app.start_stream()
+        assert app.plot_mode.get() == "Stream"
+        assert [eq for eq, _, _ in app.current_functions] == ["x**2", "cos(x)"]
+        labels = [line.get_label() for line in app.ax.lines]
+        assert "y = x**2" in labels and "y = cos(x)" in labels
+    finally:
+        app.stop_stream()
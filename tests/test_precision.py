@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+import sympy as sp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import maths
+
+
+def evaluate_float32(equation, low, high, points):
+    func = sp.lambdify(sp.symbols('x'), sp.sympify(equation), modules=['numpy'])
+    grid = np.linspace(low, high, points)
+    with np.errstate(all='ignore'):
+        return maths.precision_evaluate(func, [grid], grid.shape, np.float32)
+
+
+def test_localized_cancellation_falls_back_to_float64():
+    values, fell_back = evaluate_float32("(1 - cos(x))/x**2", -50, 50, 100000)
+    assert fell_back
+    assert values.dtype == np.float64
+
+
+def test_smooth_curves_stay_in_float32():
+    for equation in ("sin(x)", "exp(x)", "x**3 - 3*x"):
+        values, fell_back = evaluate_float32(equation, -20, 20, 100001)
+        assert not fell_back, equation
+        assert values.dtype == np.float32
+
+
+def test_overflow_falls_back_to_float64():
+    _, fell_back = evaluate_float32("exp(x)", -100, 100, 1001)
+    assert fell_back
@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import maths
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = maths.RenderService(1, 4, 8)
+    httpd = maths.ThreadingHTTPServer(("127.0.0.1", 0), maths.RenderRequestHandler)
+    httpd.service = service
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url + "/render", data=json.dumps(body).encode(),
+                                     headers={"Content-Type": content_type}, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_builtin_call_is_rejected(server, tmp_path):
+    target = tmp_path / "pwned"
+    status, body = post(server, {"equation": f"x + open({str(target)!r}, 'w').write('owned')"})
+    assert status == 400
+    assert "error" in json.loads(body)
+    assert not target.exists()
+
+
+@pytest.mark.parametrize("equation", ["x.__class__", "().__class__.__base__", "sin(x=1)", "y", "x*2**10**10"])
+def test_unsafe_expressions_are_rejected(server, equation):
+    status, _ = post(server, {"equation": equation})
+    assert status == 400
+
+
+def test_plain_expression_renders(server):
+    status, body = post(server, {"equation": "sin(x)^2 + abs(x)", "format": "json", "points": 5})
+    assert status == 200
+    assert len(json.loads(body)["y"]) == 5
+
+
+def test_render_requires_post_with_json(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(server + "/render?equation=sin(x)")
+    assert error.value.code == 405
+    status, _ = post(server, {"equation": "sin(x)"}, content_type="text/plain")
+    assert status == 415